@@ -3,11 +3,16 @@ import os
 import ssl
 
 from tornado.ioloop import IOLoop
-from tornado.options import parse_command_line
+from tornado.netutil import bind_sockets
+from tornado.options import define, options, parse_command_line
 from tornado.web import Application, RequestHandler
 
+from tornado_http2.prefork import WorkerPool
 from tornado_http2.server import Server
 
+define('workers', default=1,
+       help="number of worker processes (0 for one per CPU)")
+
 
 class MainHandler(RequestHandler):
     def get(self):
@@ -20,9 +25,18 @@ def main():
     ssl_ctx.load_cert_chain(
         os.path.join(os.path.dirname(__file__), 'test.crt'),
         os.path.join(os.path.dirname(__file__), 'test.key'))
-    app = Application([('/', MainHandler)], debug=True)
-    server = Server(app, ssl_options=ssl_ctx)
-    server.listen(8443)
+    if options.workers == 1:
+        app = Application([('/', MainHandler)], debug=True)
+        server = Server(app, ssl_options=ssl_ctx)
+        server.listen(8443)
+    else:
+        # autoreload (implied by debug=True) doesn't work with multiple
+        # processes.
+        pool = WorkerPool(bind_sockets(8443), num_workers=options.workers)
+        pool.start(stats_callback=lambda stats: logging.info(
+            "workers: %r", stats))
+        app = Application([('/', MainHandler)])
+        pool.add_server(Server(app, ssl_options=ssl_ctx))
     logging.info("starting")
     IOLoop.instance().start()
 
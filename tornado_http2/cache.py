@@ -0,0 +1,371 @@
+"""An HTTP cache (RFC 9111) for `tornado_http2.client.Client`.
+
+Usage::
+
+    client = Client(force_instance=True, cache=HTTPCache(max_size=...))
+
+The cache follows the rules for a *shared* cache, since a client in a
+server process usually fetches on behalf of many users: responses
+marked ``private`` are not stored, ``s-maxage`` is honored and
+responses to requests with credentials are only stored when the
+response explicitly allows it.
+
+Only ``GET`` requests are cached. Requests using ``streaming_callback``,
+``header_callback`` or ``body_producer``, or carrying their own
+conditional headers, bypass the cache.
+"""
+import collections
+import copy
+import email.utils
+import functools
+import time
+
+from tornado.httpclient import HTTPResponse, _RequestProxy
+from tornado.httputil import HTTPHeaders
+
+try:
+    from io import BytesIO
+except ImportError:
+    from cStringIO import StringIO as BytesIO
+
+CacheStats = collections.namedtuple('CacheStats', [
+    'hits', 'misses', 'revalidations', 'collapsed', 'evictions',
+    'entries', 'size'])
+
+# Status codes that are cacheable by default (RFC 9110 section 15.1).
+_CACHEABLE_CODES = frozenset([200, 203, 204, 300, 301, 308, 404, 405, 410,
+                              414, 501])
+
+# Heuristic freshness (RFC 9111 section 4.2.2) is this fraction of the
+# time since Last-Modified, up to a day.
+_HEURISTIC_FRACTION = 0.1
+_MAX_HEURISTIC_LIFETIME = 86400
+
+# Headers from a 304 response that must not replace the stored ones.
+_NOT_UPDATED_HEADERS = frozenset(['Content-Length', 'Content-Encoding',
+                                  'Transfer-Encoding'])
+
+# Fixed per-entry overhead counted against max_size.
+_ENTRY_OVERHEAD = 256
+
+
+def _parse_cache_control(headers):
+    """Returns a dict of the Cache-Control directives in ``headers``.
+
+    Directives without an argument map to None.
+    """
+    directives = {}
+    for value in headers.get_list('Cache-Control'):
+        for directive in value.split(','):
+            name, sep, arg = directive.strip().partition('=')
+            if name:
+                directives[name.lower()] = arg.strip('"') if sep else None
+    return directives
+
+
+def _delta_seconds(directives, name):
+    """Returns the integer argument of a Cache-Control directive, or None."""
+    try:
+        return max(0, int(directives[name]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _parse_date(value):
+    if value is None:
+        return None
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return email.utils.mktime_tz(parsed)
+
+
+class _CacheEntry(object):
+    def __init__(self, response, vary, request_time, response_time):
+        self.code = response.code
+        self.reason = response.reason
+        self.effective_url = response.effective_url
+        self.body = response.body or b''
+        self.vary = vary
+        self._update(response.headers, request_time, response_time)
+
+    def _update(self, headers, request_time, response_time):
+        self.headers = headers
+        self.request_time = request_time
+        self.response_time = response_time
+        self.cache_control = _parse_cache_control(headers)
+        self.date = _parse_date(headers.get('Date'))
+        try:
+            self.age = max(0, int(headers.get('Age', 0)))
+        except ValueError:
+            self.age = 0
+        self.size = _ENTRY_OVERHEAD + len(self.body) + sum(
+            len(k) + len(v) for k, v in headers.get_all())
+
+    def freshness_lifetime(self):
+        """RFC 9111 section 4.2.1."""
+        lifetime = _delta_seconds(self.cache_control, 's-maxage')
+        if lifetime is None:
+            lifetime = _delta_seconds(self.cache_control, 'max-age')
+        if lifetime is not None:
+            return lifetime
+        date = self.date if self.date is not None else self.response_time
+        if 'Expires' in self.headers:
+            expires = _parse_date(self.headers['Expires'])
+            # An invalid Expires means the response is already stale.
+            return max(0, expires - date) if expires is not None else 0
+        last_modified = _parse_date(self.headers.get('Last-Modified'))
+        if last_modified is not None and self.code in _CACHEABLE_CODES:
+            return min(_MAX_HEURISTIC_LIFETIME,
+                       max(0, date - last_modified) * _HEURISTIC_FRACTION)
+        return 0
+
+    def current_age(self, now):
+        """RFC 9111 section 4.2.3."""
+        date = self.date if self.date is not None else self.response_time
+        apparent_age = max(0, self.response_time - date)
+        response_delay = self.response_time - self.request_time
+        corrected_initial_age = max(apparent_age, self.age + response_delay)
+        return corrected_initial_age + (now - self.response_time)
+
+    def is_fresh(self, request_cache_control, now):
+        if 'no-cache' in self.cache_control:
+            return False
+        age = self.current_age(now)
+        max_age = _delta_seconds(request_cache_control, 'max-age')
+        if max_age is not None and age > max_age:
+            return False
+        return self.freshness_lifetime() > age
+
+    def response(self, request, now):
+        headers = HTTPHeaders(self.headers)
+        headers['Age'] = str(int(self.current_age(now)))
+        return HTTPResponse(request, self.code, reason=self.reason,
+                            headers=headers, buffer=BytesIO(self.body),
+                            effective_url=self.effective_url,
+                            request_time=0)
+
+
+class HTTPCache(object):
+    """An in-memory HTTP cache holding at most ``max_size`` bytes.
+
+    Entries are evicted in least-recently-used order. Concurrent
+    requests for the same resource are collapsed into one upstream
+    request, whose response is shared when it can be cached.
+
+    ``hits`` counts responses served without contacting the server,
+    ``revalidations`` those served after a 304 Not Modified, and
+    ``misses`` full responses from the server. Requests that bypass
+    the cache are not counted.
+    """
+    def __init__(self, max_size=64 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.collapsed = 0
+        self.evictions = 0
+        # Maps (url, decompress, vary values) to _CacheEntry, in LRU order.
+        self._entries = collections.OrderedDict()
+        # Maps url to the header names listed in its Vary header.
+        self._vary = {}
+        # Maps keys with a request in flight to a list of waiting
+        # (request, callback) pairs.
+        self._pending = {}
+
+    def stats(self):
+        """Returns a `CacheStats` snapshot of the cache's counters."""
+        return CacheStats(self.hits, self.misses, self.revalidations,
+                          self.collapsed, self.evictions,
+                          len(self._entries), self.size)
+
+    def fetch(self, request, callback, fetch_impl):
+        """Runs ``request``, using ``fetch_impl(request, callback)`` for
+        any requests that cannot be answered from the cache.
+
+        This has the same interface as `.AsyncHTTPClient.fetch_impl`.
+        """
+        if request.method != 'GET':
+            if request.method not in ('HEAD', 'OPTIONS', 'TRACE'):
+                callback = functools.partial(self._on_unsafe_response,
+                                             request, callback)
+            fetch_impl(request, callback)
+            return
+        request_cache_control = _parse_cache_control(request.headers)
+        if (not self._is_cacheable_request(request) or
+                'no-store' in request_cache_control):
+            fetch_impl(request, callback)
+            return
+        key = self._key(request)
+        if key in self._pending:
+            self.collapsed += 1
+            self._pending[key].append((request, callback))
+            return
+        now = time.time()
+        entry = self._entries.get(key)
+        upstream_request = request
+        if entry is not None:
+            self._touch(key)
+            no_cache = ('no-cache' in request_cache_control or
+                        request.headers.get('Pragma') == 'no-cache')
+            if not no_cache and entry.is_fresh(request_cache_control, now):
+                self.hits += 1
+                callback(entry.response(request, now))
+                return
+            upstream_request = self._conditional_request(request, entry)
+            if upstream_request is None:
+                upstream_request = request
+                entry = None
+        self._pending[key] = []
+        try:
+            fetch_impl(upstream_request, functools.partial(
+                self._on_response, key, request, entry, now, callback,
+                fetch_impl))
+        except Exception:
+            self._dispatch(self._pending.pop(key, []), False, fetch_impl)
+            raise
+
+    def invalidate(self, url):
+        """Removes all stored responses for ``url``."""
+        for key in [k for k in self._entries if k[0] == url]:
+            self._remove(key)
+        self._vary.pop(url, None)
+
+    def _is_cacheable_request(self, request):
+        if (request.streaming_callback is not None or
+                request.header_callback is not None or
+                request.body_producer is not None):
+            return False
+        for name in ('If-None-Match', 'If-Modified-Since', 'If-Match',
+                     'If-Unmodified-Since', 'If-Range', 'Range'):
+            if name in request.headers:
+                return False
+        return True
+
+    def _key(self, request, vary=None):
+        if vary is None:
+            vary = self._vary.get(request.url, ())
+        return (request.url, bool(request.decompress_response),
+                tuple(request.headers.get(name) for name in vary))
+
+    def _conditional_request(self, request, entry):
+        """Returns a copy of ``request`` that revalidates ``entry``,
+        or None if the entry has no validators.
+        """
+        etag = entry.headers.get('Etag')
+        last_modified = entry.headers.get('Last-Modified')
+        if etag is None and last_modified is None:
+            return None
+        conditional = copy.copy(request.request)
+        conditional.headers = HTTPHeaders(request.headers)
+        if etag is not None:
+            conditional.headers['If-None-Match'] = etag
+        if last_modified is not None:
+            conditional.headers['If-Modified-Since'] = last_modified
+        # As for a redirect, so the client can find the request that
+        # was passed to fetch.
+        conditional.original_request = request
+        return _RequestProxy(conditional, request.defaults)
+
+    def _on_response(self, key, request, entry, request_time, callback,
+                     fetch_impl, response):
+        now = time.time()
+        waiters = self._pending.pop(key, [])
+        stored = False
+        try:
+            if entry is not None and response.code == 304:
+                self.revalidations += 1
+                self._revalidate(key, entry, response, request_time, now)
+                response = entry.response(request, now)
+                stored = True
+            else:
+                self.misses += 1
+                response.request = request
+                stored = self._store(request, response, request_time, now)
+            callback(response)
+        finally:
+            # Even if this response failed, the waiters get their own.
+            self._dispatch(waiters, stored, fetch_impl)
+
+    def _dispatch(self, waiters, stored, fetch_impl):
+        for waiter_request, waiter_callback in waiters:
+            if stored:
+                self.fetch(waiter_request, waiter_callback, fetch_impl)
+            else:
+                fetch_impl(waiter_request, waiter_callback)
+
+    def _on_unsafe_response(self, request, callback, response):
+        # RFC 9111 section 4.4.
+        if 200 <= response.code < 400:
+            self.invalidate(request.url)
+        callback(response)
+
+    def _store(self, request, response, request_time, now):
+        if (response.code not in _CACHEABLE_CODES or
+                response.effective_url != request.url):
+            return False
+        cache_control = _parse_cache_control(response.headers)
+        if 'no-store' in cache_control or 'private' in cache_control:
+            return False
+        if (('Authorization' in request.headers or
+             request.auth_username is not None) and
+                not ('public' in cache_control or
+                     's-maxage' in cache_control or
+                     'must-revalidate' in cache_control)):
+            return False
+        vary = sorted(set(
+            name.strip().lower()
+            for value in response.headers.get_list('Vary')
+            for name in value.split(',') if name.strip()))
+        if '*' in vary:
+            return False
+        entry = _CacheEntry(response, tuple(vary), request_time, now)
+        if entry.size > self.max_size:
+            return False
+        if (entry.freshness_lifetime() <= 0 and
+                'Etag' not in response.headers and
+                'Last-Modified' not in response.headers):
+            return False
+        if self._vary.get(request.url, ()) != entry.vary:
+            self.invalidate(request.url)
+            self._vary[request.url] = entry.vary
+        key = self._key(request, entry.vary)
+        self._remove(key)
+        self._entries[key] = entry
+        self.size += entry.size
+        self._evict()
+        return True
+
+    def _revalidate(self, key, entry, response, request_time, now):
+        headers = HTTPHeaders(entry.headers)
+        for name in set(k for k, v in response.headers.get_all()):
+            if name in _NOT_UPDATED_HEADERS:
+                continue
+            if name in headers:
+                del headers[name]
+            for value in response.headers.get_list(name):
+                headers.add(name, value)
+        if self._entries.get(key) is not entry:
+            # Evicted while the request was in flight.
+            entry._update(headers, request_time, now)
+            return
+        self.size -= entry.size
+        entry._update(headers, request_time, now)
+        self.size += entry.size
+        self._evict()
+
+    def _touch(self, key):
+        # OrderedDict.move_to_end is not available on python 2.
+        self._entries[key] = self._entries.pop(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+    def _evict(self):
+        while self.size > self.max_size:
+            key, entry = self._entries.popitem(last=False)
+            self.size -= entry.size
+            self.evictions += 1
@@ -1,10 +1,19 @@
-from tornado.httpclient import AsyncHTTPClient, main
-from tornado.ioloop import IOLoop
+import copy
+import functools
+import socket
+import sys
+
+from tornado.concurrent import Future
+from tornado import gen
+from tornado.httpclient import (AsyncHTTPClient, HTTPError, HTTPRequest,
+                                HTTPResponse, main)
 from tornado.iostream import SSLIOStream
-from tornado.netutil import ssl_options_to_context
+from tornado.netutil import (SSLCertificateError, ssl_match_hostname,
+                             ssl_options_to_context)
 from tornado.simple_httpclient import SimpleAsyncHTTPClient, _HTTPConnection
+from tornado import stack_context
 
-from tornado_http2.connection import Connection, Params
+from tornado_http2.connection import Connection
 from tornado_http2 import constants
 
 try:
@@ -19,6 +28,135 @@ except ImportError:
 
 
 class Client(SimpleAsyncHTTPClient):
+    """An HTTP client that uses HTTP/2 when the server supports it.
+
+    Accepts the arguments of `.SimpleAsyncHTTPClient`, plus ``cache``,
+    an optional `tornado_http2.cache.HTTPCache`.
+
+    HTTP/2 connections are kept open and shared by all requests to
+    the same origin. An https connection is also used for other hosts
+    that resolve to the same address and are covered by the server's
+    certificate (RFC 7540 section 9.1.1); if the server answers such a
+    request with 421 Misdirected Request, it is retried on a new
+    connection.
+    """
+    def initialize(self, *args, **kwargs):
+        self.cache = kwargs.pop('cache', None)
+        super(Client, self).initialize(*args, **kwargs)
+        self._pool = _ConnectionPool(self)
+        # Maps dict ssl_options to SSLContexts, so that requests using
+        # the same options can share connections.
+        self._ssl_contexts = {}
+        # Maps HTTPRequests being fetched to their connections, for
+        # cancel().
+        self._fetches = {}
+
+    def close(self):
+        self._pool.close()
+        super(Client, self).close()
+
+    def fetch_many(self, requests, timeout=None, **kwargs):
+        """Fetches ``requests`` concurrently.
+
+        ``requests`` is a list of URLs or `.HTTPRequest` objects; as in
+        `fetch`, ``kwargs`` are used to construct requests from URLs.
+        Requests to an HTTP/2 server are sent as concurrent streams on
+        a shared connection, without waiting for ``max_clients``.
+        ``timeout`` limits the whole batch, in seconds: requests still
+        running when it expires produce 599 responses.
+
+        Returns a `tornado.gen.WaitIterator` which yields the
+        responses as they complete; its ``current_index`` is the
+        position of the response's request in ``requests``::
+
+            responses = client.fetch_many(urls, request_timeout=5,
+                                          timeout=10)
+            while not responses.done():
+                response = yield responses.next()
+                handle(urls[responses.current_index], response)
+
+        or, on Python 3.5+::
+
+            async for response in client.fetch_many(urls):
+                ...
+
+        As with ``raise_error=False``, failed requests produce
+        responses with their ``error`` set instead of raising.
+        """
+        requests = list(requests)
+        if kwargs and any(isinstance(r, HTTPRequest) for r in requests):
+            raise ValueError(
+                "kwargs can't be used if request is an HTTPRequest object")
+        requests = [r if isinstance(r, HTTPRequest)
+                    else HTTPRequest(r, **kwargs) for r in requests]
+        results = [Future() for r in requests]
+        if timeout is not None:
+            deadline = self.io_loop.time() + timeout
+            timeout_handle = self.io_loop.add_timeout(
+                deadline, functools.partial(self._on_batch_timeout,
+                                            requests, results, timeout))
+        for request, result in zip(requests, results):
+            if timeout is not None:
+                request = copy.copy(request)
+                request.request_timeout = min(
+                    request.request_timeout or
+                    self.defaults['request_timeout'], timeout)
+            self.io_loop.add_future(self.fetch(request, raise_error=False),
+                                    functools.partial(_copy_result, result))
+        if timeout is not None:
+            self.io_loop.add_future(
+                gen.multi(results),
+                lambda f: self.io_loop.remove_timeout(timeout_handle))
+        return gen.WaitIterator(*results)
+
+    def cancel(self, request):
+        """Cancels a request started with `fetch`.
+
+        ``request`` is the `.HTTPRequest` that was passed to `fetch`,
+        which completes with a 599 error. A request on an HTTP/2
+        connection is reset with RST_STREAM(CANCEL), so the server can
+        stop working on it while the connection stays open for other
+        requests; an HTTP/1 request's connection is closed.
+
+        Returns False if the request is not in progress.
+        """
+        for key, (queued, callback, timeout_handle) in list(
+                self.waiting.items()):
+            if _caller_request(queued) is request:
+                # Still waiting for max_clients.
+                self._remove_timeout(key)
+                self.queue.remove((key, queued, callback))
+                self.io_loop.add_callback(callback, HTTPResponse(
+                    queued, 599, error=HTTPError(599, "Canceled"),
+                    request_time=self.io_loop.time() - queued.start_time))
+                return True
+        conn = self._fetches.get(request)
+        if conn is None:
+            return False
+        conn.cancel()
+        return True
+
+    def _on_batch_timeout(self, requests, results, timeout):
+        for request, result in zip(requests, results):
+            if not result.done():
+                result.set_result(HTTPResponse(
+                    request, 599, error=HTTPError(599, "Timeout"),
+                    request_time=timeout))
+
+    def fetch_impl(self, request, callback):
+        if self.cache is None:
+            super(Client, self).fetch_impl(request, callback)
+        else:
+            self.cache.fetch(request, callback,
+                             super(Client, self).fetch_impl)
+
+    def _handle_request(self, request, release_callback, final_callback):
+        # The pool stands in for the TCPClient.
+        self._connection_class()(
+            self.io_loop, self, request, release_callback,
+            final_callback, self.max_buffer_size, self._pool,
+            self.max_header_size, self.max_body_size)
+
     def _connection_class(self):
         return _HTTP2ClientConnection
 
@@ -26,32 +164,393 @@ class Client(SimpleAsyncHTTPClient):
         return False
 
 
+class _PooledConnection(object):
+    def __init__(self, conn, host, port, ssl_options, address, cert):
+        self.conn = conn
+        self.host = host
+        self.port = port
+        self.ssl_options = ssl_options
+        self.address = address
+        self.cert = cert
+        # Pool keys under which this connection is registered.
+        self.keys = set()
+        # Hosts the server has answered with 421 Misdirected Request.
+        self.misdirected = set()
+        # Requests handed this connection that have not opened their
+        # streams yet.
+        self.pending = 0
+
+    def available(self):
+        return self.conn.can_create_stream(self.pending + 1)
+
+    def can_coalesce(self, host, port, ssl_options, addresses):
+        if (not self.cert or port != self.port or
+                ssl_options is not self.ssl_options or
+                self.address not in addresses or host in self.misdirected):
+            return False
+        try:
+            ssl_match_hostname(self.cert, host)
+        except SSLCertificateError:
+            return False
+        return True
+
+
+def _copy_result(result, future):
+    # A batch timeout may have produced a response already.
+    if not result.done():
+        result.set_result(future.result())
+
+
+def _run_waiter(callback, future):
+    callback(future.result())
+
+
+def _caller_request(request):
+    # Redirects, retries and cache revalidations send copies of the
+    # request passed to fetch, which refer back to it.
+    return getattr(request, 'original_request', request).request
+
+
+class _ConnectionPool(object):
+    """Shares HTTP/2 connections between the requests of a `Client`.
+
+    This takes the place of the `.TCPClient` used by `_HTTPConnection`:
+    ``connect`` runs its callback with either a new `.IOStream` or
+    that of an existing HTTP/2 connection, which the request then
+    passes to ``claim``.
+
+    Connections are registered under ``(host, port, ssl_options)``
+    keys. Requests for an origin whose connection is still being
+    established wait for it rather than opening their own, unless it
+    turns out not to support HTTP/2.
+    """
+    # Origins known not to support HTTP/2 are remembered (up to this
+    # many) so their requests don't wait for each other's connections.
+    _MAX_HTTP1_ORIGINS = 1000
+
+    def __init__(self, client):
+        self.client = client
+        # Maps key to a list of _PooledConnections.
+        self._connections = {}
+        # Maps IOStream to _PooledConnection.
+        self._by_stream = {}
+        # Maps key to the waiters for a connection being established.
+        self._connecting = {}
+        self._http1_origins = set()
+
+    def connect(self, host, port, af=socket.AF_UNSPEC, ssl_options=None,
+                max_buffer_size=None, callback=None):
+        key = (host, port, ssl_options)
+        # Wrap callback so any connection error is raised in the
+        # stack context of the request it belongs to.
+        waiter = stack_context.wrap(functools.partial(_run_waiter, callback))
+        if ((ssl_options is None and not self.client._use_http2_cleartext())
+                or key in self._http1_origins):
+            self._open_unpooled(key, af, max_buffer_size, waiter)
+            return
+        pooled = self._find(key)
+        if pooled is not None:
+            self._deliver([waiter], pooled)
+        elif key in self._connecting:
+            self._connecting[key].append(waiter)
+        else:
+            self._connecting[key] = [waiter]
+            if ssl_options is not None and any(
+                    p.cert and p.port == port
+                    for p in self._by_stream.values()):
+                # Only pay for the extra lookup when there is a
+                # connection we might coalesce with.
+                self.client.io_loop.add_future(
+                    self.client.resolver.resolve(host, port, af),
+                    functools.partial(self._on_resolve, key, af,
+                                      max_buffer_size))
+            else:
+                self._open(key, af, max_buffer_size)
+
+    def claim(self, stream):
+        """Returns the `_PooledConnection` for ``stream``, if any.
+
+        Must be called once by each request ``connect`` was called for.
+        """
+        pooled = self._by_stream.get(stream)
+        if pooled is not None:
+            pooled.pending -= 1
+        return pooled
+
+    def mark_misdirected(self, pooled, host, port, ssl_options):
+        """Stops using ``pooled`` for requests to ``host``."""
+        pooled.misdirected.add(host)
+        key = (host, port, ssl_options)
+        if key in pooled.keys:
+            self._unregister(pooled, key)
+
+    def close(self):
+        for pooled in list(self._by_stream.values()):
+            pooled.conn.stream.close()
+
+    def _find(self, key):
+        for pooled in self._connections.get(key, ()):
+            if pooled.available():
+                return pooled
+        return None
+
+    def _on_resolve(self, key, af, max_buffer_size, future):
+        host, port, ssl_options = key
+        try:
+            addresses = set(addr[0] for family, addr in future.result())
+        except Exception:
+            # Let the connection attempt report the error.
+            addresses = set()
+        for pooled in list(self._by_stream.values()):
+            if (pooled.available() and
+                    pooled.can_coalesce(host, port, ssl_options, addresses)):
+                self._register(pooled, key)
+                self._deliver(self._connecting.pop(key), pooled)
+                return
+        self._open(key, af, max_buffer_size)
+
+    def _open(self, key, af, max_buffer_size):
+        host, port, ssl_options = key
+        future = self.client.tcp_client.connect(
+            host, port, af=af, ssl_options=ssl_options,
+            max_buffer_size=max_buffer_size)
+        self.client.io_loop.add_future(future, functools.partial(
+            self._on_open, key, af, max_buffer_size))
+
+    def _open_unpooled(self, key, af, max_buffer_size, waiter):
+        host, port, ssl_options = key
+        future = self.client.tcp_client.connect(
+            host, port, af=af, ssl_options=ssl_options,
+            max_buffer_size=max_buffer_size)
+        self.client.io_loop.add_future(future, waiter)
+
+    def _on_open(self, key, af, max_buffer_size, future):
+        waiters = self._connecting.pop(key)
+        if future.exception() is not None:
+            for waiter in waiters:
+                waiter(future)
+            return
+        stream = future.result()
+        if not self._can_http2(stream):
+            if len(self._http1_origins) >= self._MAX_HTTP1_ORIGINS:
+                self._http1_origins.clear()
+            self._http1_origins.add(key)
+            waiters[0](future)
+            for waiter in waiters[1:]:
+                self._open_unpooled(key, af, max_buffer_size, waiter)
+            return
+        self._deliver(waiters, self._add(key, stream))
+
+    def _can_http2(self, stream):
+        if isinstance(stream, SSLIOStream):
+            assert stream.socket.cipher() is not None, 'handshake incomplete'
+            return stream.socket.selected_alpn_protocol() == constants.HTTP2_TLS
+        return self.client._use_http2_cleartext()
+
+    def _add(self, key, stream):
+        host, port, ssl_options = key
+        cert = None
+        if isinstance(stream, SSLIOStream):
+            cert = stream.socket.getpeercert()
+        try:
+            address = stream.socket.getpeername()[0]
+        except socket.error:
+            address = None
+        # Frames are small and often written one at a time.
+        stream.set_nodelay(True)
+        conn = Connection(stream, True)
+        pooled = _PooledConnection(conn, host, port, ssl_options, address,
+                                   cert)
+        self._by_stream[stream] = pooled
+        self._register(pooled, key)
+        self.client.io_loop.add_future(
+            conn.start(None), lambda f: self._remove(pooled))
+        return pooled
+
+    def _register(self, pooled, key):
+        pooled.keys.add(key)
+        self._connections.setdefault(key, []).append(pooled)
+
+    def _unregister(self, pooled, key):
+        pooled.keys.discard(key)
+        connections = self._connections.get(key, [])
+        if pooled in connections:
+            connections.remove(pooled)
+        if not connections:
+            self._connections.pop(key, None)
+
+    def _remove(self, pooled):
+        for key in list(pooled.keys):
+            self._unregister(pooled, key)
+        self._by_stream.pop(pooled.conn.stream, None)
+
+    def _deliver(self, waiters, pooled):
+        pooled.pending += len(waiters)
+        future = Future()
+        future.set_result(pooled.conn.stream)
+        for waiter in waiters:
+            self.client.io_loop.add_callback(waiter, future)
+
+
 class _HTTP2ClientConnection(_HTTPConnection):
+    _pooled = None
+    _misdirected = False
+    # The last chunk given to a streaming_callback that returned a
+    # Future, chained with any chunks received while it was pending.
+    _streaming = None
+
+    def __init__(self, io_loop, client, request, *args):
+        # Registered first, since the base class starts connecting.
+        self._fetch_key = _caller_request(request)
+        client._fetches[self._fetch_key] = self
+        super(_HTTP2ClientConnection, self).__init__(io_loop, client,
+                                                     request, *args)
+
+    def cancel(self):
+        if self.final_callback is None:
+            return
+        self._remove_timeout()
+        self._run_callback(HTTPResponse(
+            self.request, 599, error=HTTPError(599, "Canceled"),
+            request_time=self.io_loop.time() - self.start_time))
+        connection = getattr(self, 'connection', None)
+        if self._pooled is not None:
+            if connection is not None:
+                connection.reset(constants.ErrorCode.CANCEL)
+            # Otherwise we are waiting for a shared connection, and
+            # _on_connect will see that we are done.
+        elif getattr(self, 'stream', None) is not None:
+            self.stream.close()
+
+    def _run_callback(self, response):
+        if self.client._fetches.get(self._fetch_key) is self:
+            del self.client._fetches[self._fetch_key]
+        super(_HTTP2ClientConnection, self)._run_callback(response)
+
     def _get_ssl_options(self, scheme):
         options = super(_HTTP2ClientConnection, self)._get_ssl_options(scheme)
+        if isinstance(options, dict):
+            try:
+                cache_key = frozenset(options.items())
+                context = self.client._ssl_contexts.get(cache_key)
+            except TypeError:
+                cache_key = context = None
+            if context is None:
+                context = ssl_options_to_context(options)
+                if cache_key is not None:
+                    self.client._ssl_contexts[cache_key] = context
+            options = context
         if options is not None:
-            if isinstance(options, dict):
-                options = ssl_options_to_context(options)
             options.set_alpn_protocols([constants.HTTP2_TLS])
         return options
 
+    def _on_connect(self, stream):
+        self._pooled = self.client._pool.claim(stream)
+        if self.final_callback is None and self._pooled is not None:
+            # Timed out while waiting for a shared connection, which
+            # the base class would close.
+            return
+        super(_HTTP2ClientConnection, self)._on_connect(stream)
+
     def _create_connection(self, stream):
-        can_http2 = False
-        if isinstance(stream, SSLIOStream):
-            assert stream.socket.cipher() is not None, 'handshake incomplete'
-            proto = stream.socket.selected_alpn_protocol()
-            if proto == constants.HTTP2_TLS:
-                can_http2 = True
-        elif self.client._use_http2_cleartext():
-            can_http2 = True
-        if can_http2:
-            conn = Connection(stream, True,
-                              Params(decompress=self.request.decompress_response))
-            IOLoop.current().add_future(conn.start(None),
-                                        lambda f: f.result())
-            h2_stream = conn.create_stream(self)
-            return h2_stream
-        return super(_HTTP2ClientConnection, self)._create_connection(stream)
+        if self._pooled is None:
+            return super(_HTTP2ClientConnection, self)._create_connection(
+                stream)
+        # The Connection reports closes to each of its streams.
+        stream.set_close_callback(None)
+        h2_stream = self._pooled.conn.create_stream(
+            self, decompress=self.request.decompress_response)
+        # Streams are limited by the server's MAX_CONCURRENT_STREAMS,
+        # so they need not count against max_clients.
+        self._release()
+        return h2_stream
+
+    def _is_coalesced(self):
+        return (self._pooled is not None and
+                self._pooled.host != self.parsed_hostname)
+
+    def headers_received(self, first_line, headers):
+        if first_line.code == 421 and self._is_coalesced():
+            self._misdirected = True
+            return
+        return super(_HTTP2ClientConnection, self).headers_received(
+            first_line, headers)
+
+    def data_received(self, chunk):
+        if self._misdirected:
+            return
+        if (self.request.streaming_callback is None or
+                self._should_follow_redirect()):
+            return super(_HTTP2ClientConnection, self).data_received(chunk)
+        # A streaming_callback may return a Future to apply
+        # backpressure: later chunks wait for it, and the returned
+        # Future holds back the stream's WINDOW_UPDATE (or, over
+        # HTTP/1, the next read) so the server can only send as much as
+        # the flow control window allows.
+        if self._streaming is not None and not self._streaming.done():
+            self._streaming = self._stream_chunk(self._streaming, chunk)
+            return self._streaming
+        result = self.request.streaming_callback(chunk)
+        if result is None:
+            return None
+        self._streaming = self._stream_chunk(gen.convert_yielded(result))
+        return self._streaming
+
+    @gen.coroutine
+    def _stream_chunk(self, previous, chunk=None):
+        try:
+            yield previous
+            if chunk is not None and self.final_callback is not None:
+                result = self.request.streaming_callback(chunk)
+                if result is not None:
+                    yield result
+        except Exception:
+            if self.final_callback is not None:
+                self._handle_exception(*sys.exc_info())
+
+    def finish(self):
+        if self._streaming is not None and not self._streaming.done():
+            # Complete the response once the streaming_callback is
+            # done with the body.
+            self.io_loop.add_future(self._streaming,
+                                    lambda f: self.finish())
+            return
+        if not self._misdirected:
+            return super(_HTTP2ClientConnection, self).finish()
+        # RFC 7540 section 9.1.2: retry on a connection of our own.
+        self._remove_timeout()
+        self.client._pool.mark_misdirected(
+            self._pooled, self.parsed_hostname, self._pooled.port,
+            self._pooled.ssl_options)
+        new_request = copy.copy(self.request.request)
+        new_request.original_request = getattr(self.request,
+                                               'original_request',
+                                               self.request)
+        final_callback = self.final_callback
+        self.final_callback = None
+        self.client._fetches.pop(self._fetch_key, None)
+        self._release()
+        self.client.fetch(new_request, final_callback)
+
+    def _handle_exception(self, typ, value, tb):
+        if self._pooled is None or self.final_callback is None:
+            return super(_HTTP2ClientConnection, self)._handle_exception(
+                typ, value, tb)
+        # Other requests may be using the connection, so keep the base
+        # class from closing it and reset only our stream.
+        stream = self.stream
+        del self.stream
+        try:
+            return super(_HTTP2ClientConnection, self)._handle_exception(
+                typ, value, tb)
+        finally:
+            self.stream = stream
+            if getattr(self, 'connection', None) is not None:
+                self.connection.reset(constants.ErrorCode.CANCEL)
+
+    def _on_end_request(self):
+        if self._pooled is None:
+            super(_HTTP2ClientConnection, self)._on_end_request()
 
 
 class ForceHTTP2Client(Client):
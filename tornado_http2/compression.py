@@ -0,0 +1,189 @@
+"""Gzip compression that runs off the IOLoop thread.
+
+`GzipMessageDelegate` inflates gzip-encoded request bodies on an
+executor; the server uses it when given ``decompress_request=True`` and
+a ``compression_executor``::
+
+    server = Server(app, decompress_request=True,
+                    compression_executor=ThreadPoolExecutor(4))
+
+`PrecompressedCache` keeps gzipped copies of static content, for
+`tornado_http2.web.StaticFileHandler`.
+
+zlib releases the GIL while it works, so compression on a thread pool
+runs in parallel with the IOLoop.
+"""
+import collections
+import functools
+import sys
+import zlib
+
+from tornado.concurrent import Future
+from tornado import gen
+from tornado.httputil import HTTPMessageDelegate
+from tornado.ioloop import IOLoop
+from tornado.log import gen_log
+from tornado.util import GzipDecompressor
+
+
+def gzip_compress(data, level=6):
+    """Returns ``data`` in gzip format."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class GzipMessageDelegate(HTTPMessageDelegate):
+    """Like tornado's ``_GzipMessageDelegate``, passes gzip-encoded
+    message bodies to ``delegate`` inflated, but inflates those of
+    ``threshold`` bytes or more (or of unknown length) on ``executor``.
+
+    Chunks are inflated and passed to ``delegate`` one at a time, in
+    order. The Future returned by ``data_received`` resolves once
+    ``delegate`` is done with the chunk, so a `.Stream` holds back its
+    WINDOW_UPDATE (and the peer its data) while the executor is busy.
+    """
+    def __init__(self, delegate, chunk_size, executor, threshold):
+        self._delegate = delegate
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._threshold = threshold
+        self._decompressor = None
+        self._offload = False
+        # The Future of the last chunk passed to the executor.
+        self._pending = None
+        self._closed = False
+
+    def headers_received(self, start_line, headers):
+        if headers.get("Content-Encoding") == "gzip":
+            self._decompressor = GzipDecompressor()
+            headers.add("X-Consumed-Content-Encoding",
+                        headers["Content-Encoding"])
+            del headers["Content-Encoding"]
+            content_length = headers.get("Content-Length")
+            self._offload = (not content_length or
+                             int(content_length) >= self._threshold)
+        return self._delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk):
+        if self._decompressor is None:
+            return self._delegate.data_received(chunk)
+        if self._offload:
+            self._pending = self._inflate(self._pending, chunk)
+            return self._pending
+        return self._inflate_inline(chunk)
+
+    @gen.coroutine
+    def _inflate_inline(self, chunk):
+        while chunk:
+            decompressed, chunk = self._decompress(chunk)
+            if decompressed:
+                ret = self._delegate.data_received(decompressed)
+                if ret is not None:
+                    yield ret
+
+    @gen.coroutine
+    def _inflate(self, previous, chunk):
+        if previous is not None:
+            yield previous
+        while chunk and not self._closed:
+            decompressed, chunk = yield self._executor.submit(
+                self._decompress, chunk)
+            if decompressed and not self._closed:
+                ret = self._delegate.data_received(decompressed)
+                if ret is not None:
+                    yield ret
+
+    def _decompress(self, chunk):
+        # Output is limited to chunk_size; the rest of the input is
+        # returned for the next call.
+        decompressed = self._decompressor.decompress(chunk, self._chunk_size)
+        return decompressed, self._decompressor.unconsumed_tail
+
+    def finish(self):
+        if self._pending is not None and not self._pending.done():
+            IOLoop.current().add_future(self._pending,
+                                        lambda f: self.finish())
+            return
+        if self._closed or (self._pending is not None and
+                            self._pending.exception() is not None):
+            # The stream has been reset.
+            return
+        if self._decompressor is not None:
+            tail = self._decompressor.flush()
+            if tail:
+                self._delegate.data_received(tail)
+        return self._delegate.finish()
+
+    def on_connection_close(self):
+        self._closed = True
+        return self._delegate.on_connection_close()
+
+
+class PrecompressedCache(object):
+    """Gzipped copies of static content, keyed by a hash of the
+    content (so a changed file gets a new entry).
+
+    Content is compressed once, at ``level``, on ``executor`` if one
+    is given. Up to ``max_size`` bytes of compressed data are kept;
+    the least recently used entries are dropped to make room.
+    """
+    def __init__(self, executor=None, max_size=64 * 1024 * 1024, level=9):
+        self.executor = executor
+        self.max_size = max_size
+        self.level = level
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        # Maps keys being compressed to their Futures.
+        self._compressing = {}
+
+    def get(self, key):
+        """Returns the compressed content for ``key``, or None."""
+        data = self._entries.pop(key, None)
+        if data is not None:
+            self._entries[key] = data
+        return data
+
+    def add(self, key, load):
+        """Compresses the bytes returned by ``load()`` for ``key``.
+
+        ``load`` is called on the executor along with the compression.
+        Returns a Future which resolves to the compressed content; if
+        there is no executor, it is done (and the content cached) on
+        return.
+        """
+        future = self._compressing.get(key)
+        if future is not None:
+            return future
+        compress = functools.partial(self._load_and_compress, load)
+        if self.executor is None:
+            future = Future()
+            try:
+                future.set_result(compress())
+            except Exception:
+                future.set_exc_info(sys.exc_info())
+            self._on_compressed(key, future)
+            return future
+        future = self._compressing[key] = self.executor.submit(compress)
+        IOLoop.current().add_future(future,
+                                    functools.partial(self._on_compressed, key))
+        return future
+
+    def _load_and_compress(self, load):
+        return gzip_compress(load(), self.level)
+
+    def _on_compressed(self, key, future):
+        self._compressing.pop(key, None)
+        if key in self._entries:
+            return
+        try:
+            data = future.result()
+        except Exception:
+            gen_log.warning("Failed to compress %r", key, exc_info=True)
+            return
+        if len(data) > self.max_size:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_size:
+            old_key, old_data = self._entries.popitem(last=False)
+            self._size -= len(old_data)
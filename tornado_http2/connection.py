@@ -1,5 +1,9 @@
+import collections
+import functools
 import logging
+import os
 import struct
+import time
 
 from tornado.concurrent import Future
 from tornado.escape import utf8
@@ -13,18 +17,74 @@ from . import constants
 from .errors import ConnectionError, StreamError
 from .flow_control import Window
 from .frames import Frame, parse_window_update_frame
-from .hpack import HpackDecoder, HpackEncoder
+from .hpack import HpackDecoder, HpackEncoder, HpackError
 from .stream import Stream
+from .trace import FrameTrace, RECEIVED, SENT
+
+
+# Default per-connection budgets for frames that make us do work
+# without making progress, as counts per second. A peer that exceeds
+# one is disconnected with ENHANCE_YOUR_CALM.
+DEFAULT_FLOOD_LIMITS = {
+    # RST_STREAM frames ("rapid reset": opening and immediately
+    # cancelling streams).
+    'rst_stream': 200,
+    'ping': 50,
+    'settings': 50,
+    # DATA frames with no payload and no END_STREAM.
+    'empty_data': 100,
+}
+
+# Number of times each flood limit (or "continuation", for
+# Params.max_continuation_frames) has been exceeded in this process.
+flood_limits_exceeded = collections.Counter()
 
 
 class Params(object):
-    def __init__(self, chunk_size=None, max_header_size=None, decompress=False):
+    def __init__(self, chunk_size=None, max_header_size=None, decompress=False,
+                 max_output_buffer_size=None, flood_limits=None,
+                 max_continuation_frames=None, header_timeout=None,
+                 body_timeout=None, max_body_size=None, stream_timeout=None,
+                 trace_frames=None, trace_dir=None,
+                 enable_connect_protocol=False, compression_executor=None,
+                 compression_threshold=None):
         self.chunk_size = chunk_size or 65536
         self.max_header_size = max_header_size or 65536
         self.decompress = decompress
+        # DATA frames wait while this many bytes are waiting to be
+        # written to the socket (other frames are never delayed).
+        self.max_output_buffer_size = max_output_buffer_size or 1024 * 1024
+        # Overrides for DEFAULT_FLOOD_LIMITS.
+        self.flood_limits = dict(DEFAULT_FLOOD_LIMITS)
+        self.flood_limits.update(flood_limits or {})
+        # CONTINUATION frames allowed in one header block.
+        self.max_continuation_frames = max_continuation_frames or 64
+        # Per-stream limits, in seconds and bytes. Streams exceeding
+        # them are reset. header_timeout applies while a header block
+        # awaits CONTINUATION frames, body_timeout to receiving the
+        # body and stream_timeout to the whole life of the stream.
+        self.header_timeout = header_timeout
+        self.body_timeout = body_timeout
+        self.max_body_size = max_body_size
+        self.stream_timeout = stream_timeout
+        # Keep the last trace_frames frames of each connection in a
+        # `.FrameTrace`, and write them to a file in trace_dir (if set)
+        # when the connection fails.
+        self.trace_frames = trace_frames
+        self.trace_dir = trace_dir
+        # Servers: accept extended CONNECT requests (RFC 8441), used
+        # for WebSockets over HTTP/2.
+        self.enable_connect_protocol = enable_connect_protocol
+        # With decompress, gzipped bodies of compression_threshold bytes
+        # or more (or of unknown length) are inflated on this executor
+        # instead of the IOLoop thread.
+        self.compression_executor = compression_executor
+        self.compression_threshold = compression_threshold or 65536
 
 
 class Connection(object):
+    _MAX_RESET_STREAM_IDS = 1000
+
     def __init__(self, stream, is_client, params=None, context=None):
         self.stream = stream
         self.is_client = is_client
@@ -44,6 +104,30 @@ class Connection(object):
             constants.Setting.HEADER_TABLE_SIZE.default)
         self.window = Window(None, None,
                              constants.Setting.INITIAL_WINDOW_SIZE.default)
+        self._discarded_header_block = bytearray()
+        # Ids of the streams we have reset, most recent last (see
+        # _record_reset).
+        self._reset_stream_ids = collections.OrderedDict()
+        # Bytes passed to the IOStream but not yet written to the socket.
+        self._buffered_output = 0
+        # Futures of DATA writers waiting for room in the output buffer,
+        # and the number of writers woken but not yet done with their
+        # turn (see _output_turn).
+        self._output_waiters = collections.deque()
+        self._output_turns = 0
+        # Frames counted against params.flood_limits in the current
+        # one-second interval.
+        self.flood_counts = collections.Counter()
+        self._flood_interval_start = None
+        self._continuation_frames = 0
+        # The flood limit that closed this connection, if any.
+        self.flood_limit_exceeded = None
+        self.trace = None
+        if params.trace_frames:
+            self.trace = FrameTrace(params.trace_frames, is_client)
+        # Logging every frame is expensive even when it is filtered
+        # out, so only check the level once.
+        self._log_frames = logging.getLogger().isEnabledFor(logging.DEBUG)
 
     @gen.coroutine
     def close(self):
@@ -60,32 +144,60 @@ class Connection(object):
         IOLoop.current().add_future(self._serving_future, lambda f: f.result())
         return self._serving_future
 
-    def create_stream(self, delegate):
+    def create_stream(self, delegate, decompress=None):
+        """Opens a new stream.
+
+        ``decompress`` overrides ``params.decompress`` for this stream,
+        since requests sharing a client connection may differ.
+        """
         stream = Stream(self, self.next_stream_id, delegate,
-                        context=self.context)
+                        context=self.context, decompress=decompress)
         self.next_stream_id += 2
         self.streams[stream.stream_id] = stream
         return stream
 
+    def can_create_stream(self, count=1):
+        """Returns True if `create_stream` may be called ``count`` times.
+
+        False if the connection is closed, its stream ids are used up
+        or the peer's MAX_CONCURRENT_STREAMS would be exceeded.
+        """
+        max_streams = self.setting(constants.Setting.MAX_CONCURRENT_STREAMS)
+        return (not self.stream.closed() and
+                self.next_stream_id + 2 * (count - 1) <=
+                constants.MAX_STREAM_ID and
+                (max_streams is None or
+                 len(self.streams) + count <= max_streams))
+
     @gen.coroutine
     def _conn_loop(self, delegate):
         try:
             if self.is_client:
                 self.stream.write(constants.CLIENT_PREFACE)
+                self.write_initial_settings()
             else:
+                # The server's SETTINGS need not wait for the client
+                # preface (and may already have been sent after an
+                # HTTP/1.1 upgrade).
+                self.write_initial_settings()
                 preface = yield self.stream.read_bytes(
                     len(constants.CLIENT_PREFACE))
                 if preface != constants.CLIENT_PREFACE:
                     raise Exception("expected client preface, got %s" %
                                     preface)
-            self._write_frame(self._settings_frame())
-            self._initial_settings_written.set_result(None)
-            max_remote_stream_id = 0
+            # Streams are removed from self.streams once closed, so
+            # track the highest remote id separately (starting from
+            # stream 1 after an HTTP/1.1 upgrade).
+            max_remote_stream_id = max(
+                [i for i in self.streams
+                 if (i & 1) != (self.next_stream_id & 1)] + [0])
             last_stream = None
             while True:
                 try:
                     frame = yield self._read_frame()
-                    logging.debug('got frame %r', frame)
+                    if self._log_frames:
+                        logging.debug('got frame %r', frame)
+                    self._check_flood(frame)
                     if last_stream is not None and last_stream.needs_continuation():
                         if (frame.type != constants.FrameType.CONTINUATION or
                                 frame.stream_id != last_stream.stream_id):
@@ -96,6 +208,10 @@ class Connection(object):
                     elif frame.stream_id in self.streams:
                         last_stream = self.streams[frame.stream_id]
                         last_stream.handle_frame(frame)
+                    elif frame.stream_id in self._reset_stream_ids:
+                        # RFC 7540 section 5.1: ignore what the peer sent
+                        # before it saw our RST_STREAM.
+                        self._discard_frame(frame)
                     elif (not self.is_client and
                           frame.type == constants.FrameType.HEADERS):
                         if (frame.stream_id & 1) == (self.next_stream_id & 1):
@@ -103,6 +219,10 @@ class Connection(object):
                             raise ConnectionError(
                                 constants.ErrorCode.PROTOCOL_ERROR,
                                 "invalid stream id")
+                        if frame.stream_id <= max_remote_stream_id:
+                            raise ConnectionError(
+                                constants.ErrorCode.STREAM_CLOSED,
+                                "HEADERS on closed stream")
                         if frame.stream_id > max_remote_stream_id:
                             max_remote_stream_id = frame.stream_id
                         stream = Stream(self, frame.stream_id, None,
@@ -122,9 +242,11 @@ class Connection(object):
                         else:
                             max_stream_id = max_remote_stream_id
                         if frame.stream_id <= max_stream_id:
+                            self._discard_frame(frame)
                             if frame.type not in (
                                 constants.FrameType.WINDOW_UPDATE,
-                                constants.FrameType.RST_STREAM):
+                                constants.FrameType.RST_STREAM,
+                                constants.FrameType.PRIORITY):
                                 raise StreamError(
                                     frame.stream_id,
                                     constants.ErrorCode.STREAM_CLOSED)
@@ -136,6 +258,7 @@ class Connection(object):
                     yield self._write_frame(self._rst_stream_frame(
                         e.stream_id, e.code))
         except ConnectionError as e:
+            self._dump_trace_on_error()
             # TODO: set last_stream_id
             yield self._write_frame(self._goaway_frame(
                 e.code, 0, e.message))
@@ -154,9 +277,20 @@ class Connection(object):
         except:
             gen_log.error("closing stream due to uncaught exception",
                           exc_info=True)
+            self._dump_trace_on_error()
             self.stream.close()
             raise
         finally:
+            # Let blocked writers fail with StreamClosedError.
+            self._wake_output_waiters(force=True)
+            self.window.close()
+            for stream in list(self.streams.values()):
+                if self.stream.closed():
+                    stream.on_connection_lost()
+                else:
+                    stream._cancel_timeouts()
+                    if stream._tunnel is not None:
+                        stream._tunnel._on_stream_closed()
             if delegate is not None:
                 delegate.on_close(self)
 
@@ -182,15 +316,180 @@ class Connection(object):
                                   frame.type)
         # Unknown frame types are silently discarded.
 
+    def _check_flood(self, frame):
+        if frame.type == constants.FrameType.RST_STREAM:
+            self._count_flood('rst_stream')
+        elif frame.type == constants.FrameType.PING:
+            if not frame.flags & constants.FrameFlag.ACK:
+                self._count_flood('ping')
+        elif frame.type == constants.FrameType.SETTINGS:
+            if not frame.flags & constants.FrameFlag.ACK:
+                self._count_flood('settings')
+        elif frame.type == constants.FrameType.DATA:
+            if (not frame.flags & constants.FrameFlag.END_STREAM and
+                    not frame.without_padding().data):
+                self._count_flood('empty_data')
+        elif frame.type == constants.FrameType.HEADERS:
+            self._continuation_frames = 0
+        elif frame.type == constants.FrameType.CONTINUATION:
+            self._continuation_frames += 1
+            if (self._continuation_frames >
+                    self.params.max_continuation_frames):
+                self._flood_detected('continuation')
+
+    def _count_flood(self, name):
+        now = IOLoop.current().time()
+        if (self._flood_interval_start is None or
+                now - self._flood_interval_start >= 1):
+            self._flood_interval_start = now
+            self.flood_counts.clear()
+        self.flood_counts[name] += 1
+        if self.flood_counts[name] > self.params.flood_limits[name]:
+            self._flood_detected(name)
+
+    def _flood_detected(self, name):
+        self.flood_limit_exceeded = name
+        flood_limits_exceeded[name] += 1
+        gen_log.info("closing HTTP/2 connection from %s: too many %s frames",
+                     getattr(self.context, 'address', None), name)
+        raise ConnectionError(constants.ErrorCode.ENHANCE_YOUR_CALM,
+                              "too many %s frames" % name)
+
+    def dump_trace(self, path=None):
+        """Writes this connection's `.FrameTrace` to a file.
+
+        ``path`` defaults to a new file in ``params.trace_dir``.
+        Returns the path written, or None if tracing is disabled.
+        """
+        if self.trace is None:
+            return None
+        if path is None:
+            path = os.path.join(self.params.trace_dir or '.',
+                                'h2trace-%d-%d-%x.bin' % (
+                                    time.time(), os.getpid(), id(self)))
+        with open(path, 'wb') as f:
+            self.trace.dump(f)
+        return path
+
+    def _dump_trace_on_error(self):
+        if self.trace is None or self.params.trace_dir is None:
+            return
+        try:
+            path = self.dump_trace()
+        except Exception:
+            gen_log.warning("failed to write HTTP/2 frame trace",
+                            exc_info=True)
+        else:
+            gen_log.info("wrote HTTP/2 frame trace to %s", path)
+
+    def _record_reset(self, stream_id):
+        """Remembers that we reset ``stream_id``, so that frames the
+        peer sent before receiving our RST_STREAM are ignored.
+
+        Only the most recent ``_MAX_RESET_STREAM_IDS`` are kept; frames
+        for older ones are treated as errors, like those for streams
+        that ended normally.
+        """
+        self._reset_stream_ids[stream_id] = None
+        if len(self._reset_stream_ids) > self._MAX_RESET_STREAM_IDS:
+            self._reset_stream_ids.popitem(last=False)
+
+    def _discard_frame(self, frame):
+        if frame.type in (constants.FrameType.HEADERS,
+                          constants.FrameType.CONTINUATION):
+            self._discard_header_frame(frame)
+        elif frame.type == constants.FrameType.DATA and frame.data:
+            # Still counts against the connection's flow control window.
+            self._write_frame(Frame(constants.FrameType.WINDOW_UPDATE, 0, 0,
+                                    struct.pack('>I', len(frame.data))))
+
+    def _discard_header_frame(self, frame):
+        # Header blocks for closed streams must still be decoded to
+        # keep the HPACK state in sync (RFC 7540 section 4.3).
+        if frame.type == constants.FrameType.HEADERS:
+            frame = frame.without_padding()
+            data = frame.data
+            if frame.flags & constants.FrameFlag.PRIORITY:
+                data = data[5:]
+            self._discarded_header_block = bytearray(data)
+        else:
+            self._discarded_header_block += frame.data
+        if frame.flags & constants.FrameFlag.END_HEADERS:
+            block = self._discarded_header_block
+            self._discarded_header_block = bytearray()
+            try:
+                self.hpack_decoder.decode(block)
+            except HpackError:
+                raise ConnectionError(constants.ErrorCode.COMPRESSION_ERROR)
+
     def _write_frame(self, frame):
-        logging.debug('sending frame %r', frame)
+        return self._write_bytes(self._encode_frame(frame))
+
+    def _write_frames(self, frames):
+        """Writes several frames with a single `.IOStream.write`."""
+        return self._write_bytes(b''.join(self._encode_frame(frame)
+                                          for frame in frames))
+
+    def _write_bytes(self, data):
+        future = self.stream.write(data)
+        self._buffered_output += len(data)
+        future.add_done_callback(functools.partial(self._on_output_written,
+                                                   len(data)))
+        return future
+
+    def _on_output_written(self, size, future):
+        self._buffered_output -= size
+        self._wake_output_waiters()
+
+    def _output_blocked(self):
+        """Returns True if a DATA frame must wait for `_output_turn`.
+
+        This is the case while the output buffer is full, and while
+        other writers are waiting or taking their turn.
+        """
+        return bool(self._buffered_output >=
+                    self.params.max_output_buffer_size or
+                    self._output_waiters or self._output_turns)
+
+    def _output_turn(self):
+        """Returns a Future that resolves when the caller may write one
+        DATA frame, after which it must call `_end_output_turn`.
+
+        Waiting writers are woken together (in order) when the buffer
+        drains, and each writes one frame before any writes another, so
+        streams share the connection fairly.
+        """
+        future = Future()
+        self._output_waiters.append(future)
+        self._wake_output_waiters()
+        return future
+
+    def _end_output_turn(self):
+        self._output_turns -= 1
+        self._wake_output_waiters()
+
+    def _wake_output_waiters(self, force=False):
+        if not force and (
+                self._output_turns or
+                self._buffered_output >= self.params.max_output_buffer_size):
+            return
+        waiters = self._output_waiters
+        self._output_waiters = collections.deque()
+        self._output_turns += len(waiters)
+        for future in waiters:
+            future.set_result(None)
+
+    def _encode_frame(self, frame):
+        if self._log_frames:
+            logging.debug('sending frame %r', frame)
         # The frame header starts with a 24-bit length. Since `struct`
         # doesn't support 24-bit ints, encode as 32 and slice off the first
         # byte.
         header = struct.pack('>iBBi', len(frame.data), frame.type.value,
-                             frame.flags, frame.stream_id)
-        encoded_frame = header[1:] + frame.data
-        return self.stream.write(encoded_frame)
+                             frame.flags, frame.stream_id)[1:]
+        if self.trace is not None:
+            self.trace.record(SENT, header, frame.data)
+        return header + frame.data
 
     @gen.coroutine
     def _read_frame(self):
@@ -207,6 +506,8 @@ class Connection(object):
         # Strip the reserved bit off of stream_id
         stream_id = stream_id & 0x7fffffff
         data = yield self.stream.read_bytes(data_len)
+        if self.trace is not None:
+            self.trace.record(RECEIVED, header_bytes, data)
         raise gen.Return(Frame(typ, flags, stream_id, data))
 
     def _goaway_frame(self, error_code, last_stream_id, message):
@@ -224,23 +525,46 @@ class Connection(object):
 
     def _settings_frame(self):
         # TODO: parameterize?
+        payload = struct.pack('>HI', constants.Setting.MAX_HEADER_LIST_SIZE.code,
+                              self.params.max_header_size)
         if self.is_client:
-            payload = struct.pack('>HI', constants.Setting.ENABLE_PUSH.code, 0)
-        else:
-            payload = b''
+            payload += struct.pack('>HI', constants.Setting.ENABLE_PUSH.code, 0)
+        elif self.params.enable_connect_protocol:
+            payload += struct.pack(
+                '>HI', constants.Setting.ENABLE_CONNECT_PROTOCOL.code, 1)
         return Frame(constants.FrameType.SETTINGS, 0, 0, payload)
 
     def _settings_ack_frame(self):
         return Frame(constants.FrameType.SETTINGS, constants.FrameFlag.ACK,
                      0, b'')
 
+    def write_initial_settings(self):
+        """Writes our SETTINGS frame, if it has not already been written.
+
+        This is normally done by `start`; it is public so that an
+        HTTP/1.1 upgrade can send it immediately after the 101 response.
+        """
+        if not self._initial_settings_written.done():
+            self._write_frame(self._settings_frame())
+            self._initial_settings_written.set_result(None)
+
     def _handle_settings_frame(self, frame):
         if frame.flags & constants.FrameFlag.ACK:
             if frame.data:
                 raise ConnectionError(constants.ErrorCode.FRAME_SIZE_ERROR,
                                       "SETTINGS ACK must be empty")
             return
-        data = frame.data
+        self.apply_settings(frame.data)
+        self._write_frame(self._settings_ack_frame())
+
+    def apply_settings(self, data):
+        """Applies the peer's settings from a SETTINGS frame payload.
+
+        Used directly (without an ACK) for the HTTP2-Settings header
+        of an HTTP/1.1 upgrade request. Raises `.ConnectionError` if
+        the payload is invalid, in which case no settings are changed.
+        """
+        settings = []
         while data:
             if len(data) < 6:
                 raise ConnectionError(
@@ -253,6 +577,11 @@ class Connection(object):
                 if value not in (0, 1):
                     raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
                                           "ENABLE_PUSH must be 0 or 1")
+            elif code == constants.Setting.ENABLE_CONNECT_PROTOCOL.code:
+                if value not in (0, 1):
+                    raise ConnectionError(
+                        constants.ErrorCode.PROTOCOL_ERROR,
+                        "ENABLE_CONNECT_PROTOCOL must be 0 or 1")
             elif code == constants.Setting.INITIAL_WINDOW_SIZE.code:
                 if value > constants.MAX_WINDOW_SIZE:
                     raise ConnectionError(
@@ -264,8 +593,8 @@ class Connection(object):
                         value > constants.MAX_MAX_FRAME_SIZE):
                     raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
                                           "MAX_FRAME_SIZE out of bounds")
-            self._settings[code] = value
-        self._write_frame(self._settings_ack_frame())
+            settings.append((code, value))
+        self._settings.update(settings)
 
     def _handle_window_update_frame(self, frame):
         self.window.apply_window_update(frame)
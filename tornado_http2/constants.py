@@ -48,8 +48,11 @@ class Setting(enum.Enum):
     INITIAL_WINDOW_SIZE = (0x4, 65535)
     MAX_FRAME_SIZE = (0x5, 16384)
     MAX_HEADER_LIST_SIZE = (0x6, None)
+    # RFC 8441
+    ENABLE_CONNECT_PROTOCOL = (0x8, 0)
 
 MAX_WINDOW_SIZE = 2**31 - 1
+MAX_STREAM_ID = 2**31 - 1
 MAX_MAX_FRAME_SIZE = 2**24 - 1
 
 class ErrorCode(enum.Enum):
@@ -1,6 +1,13 @@
-from collections import defaultdict
-import os
-import re
+from .hpack_tables import (HUFFMAN_ACCEPT, HUFFMAN_CODES,
+                           HUFFMAN_DECODE_STATES, HUFFMAN_DECODE_TABLE,
+                           HUFFMAN_EMIT, HUFFMAN_FAIL, HUFFMAN_STATE_MASK,
+                           HUFFMAN_SYMBOL_SHIFT)
+
+_HUFFMAN_EOS = 256
+
+# On python 2, iterating over a byte string yields 1-character strings
+# instead of ints.
+_PY2 = bytes is str
 
 
 class EODError(Exception):
@@ -49,8 +56,11 @@ class BitEncoder(object):
 
     def write_huffman_char(self, c):
         # TODO: optimize this.
-        for b in _huffman_map[c]:
-            self.write_bit(b)
+        if _PY2:
+            c = ord(c)
+        code, bit_len = HUFFMAN_CODES[c]
+        for shift in range(bit_len - 1, -1, -1):
+            self.write_bit((code >> shift) & 1)
 
     def write_huffman_string(self, s):
         for c in s:
@@ -113,66 +123,55 @@ class BitDecoder(object):
         """
         if limit is None:
             limit = len(self._data)
-        tree_node = _huffman_tree
+        node = 0
         while self._byte_offset < limit:
-            tree_node = tree_node[self.read_bit()]
-            if not isinstance(tree_node, dict):
-                return tree_node
+            entry = HUFFMAN_DECODE_TABLE[2 * node + self.read_bit()]
+            if entry < 0:
+                sym = ~entry
+                if sym == _HUFFMAN_EOS:
+                    raise ValueError("EOS in huffman-encoded string")
+                return chr(sym) if _PY2 else sym
+            node = entry
         # End-of-stream.
         # TODO: it is an error to reach this point if we are not aligned
         # at the end of a byte or if any of the bits read in this call were
         # zero. Verify this.
         return None
 
+    def read_huffman_string(self, length):
+        """Decodes the next ``length`` bytes, which must start on a
+        byte boundary, as a huffman-encoded string. Returns a bytearray.
+
+        Uses `.HUFFMAN_DECODE_STATES` to decode four bits at a time.
+        Raises ValueError if the string contains the end-of-string
+        symbol or is not padded as RFC 7541 section 5.2 requires.
+        """
+        assert self._bit_offset == 0, 'not byte-aligned'
+        start = self._byte_offset
+        end = start + length
+        if end > len(self._data):
+            raise EODError()
+        table = HUFFMAN_DECODE_STATES
+        result = bytearray()
+        entry = HUFFMAN_ACCEPT
+        for b in self._data[start:end]:
+            entry = table[(entry & HUFFMAN_STATE_MASK) | (b >> 4)]
+            if entry & (HUFFMAN_EMIT | HUFFMAN_FAIL):
+                if entry & HUFFMAN_FAIL:
+                    raise ValueError("EOS in huffman-encoded string")
+                result.append((entry >> HUFFMAN_SYMBOL_SHIFT) & 0xff)
+            entry = table[(entry & HUFFMAN_STATE_MASK) | (b & 0xf)]
+            if entry & (HUFFMAN_EMIT | HUFFMAN_FAIL):
+                if entry & HUFFMAN_FAIL:
+                    raise ValueError("EOS in huffman-encoded string")
+                result.append((entry >> HUFFMAN_SYMBOL_SHIFT) & 0xff)
+        if not entry & HUFFMAN_ACCEPT:
+            raise ValueError("invalid padding in huffman-encoded string")
+        self._byte_offset = end
+        return result
+
     def read_char(self):
         assert self._bit_offset == 0, 'not byte-aligned'
         ch = self._data[self._byte_offset]
         self._byte_offset += 1
         return ch
-
-
-def _tree():
-    return defaultdict(_tree)
-
-
-def _load_huffman_data():
-    """Parses hpack_huffman_data, which was copied from
-    http://http2.github.io/http2-spec/compression.html#huffman.code
-    (corresponding to
-    http://tools.ietf.org/html/draft-ietf-httpbis-header-compression-12#appendix-B )
-
-    Implements a very crude and inefficient huffman codec.
-    """
-    huffman_map = {}
-    huffman_tree = _tree()
-    with open(os.path.join(os.path.dirname(__file__),
-                           'hpack_huffman_data.txt')) as f:
-        line_re = re.compile(
-            r"(?:   |EOS|'(.)') \(([ 0-9]{3})\)  ([|01]+) +([0-9a-f]+)  \[([ 0-9]{2})\]")
-        for line in f:
-            m = line_re.match(line)
-            ch, i, bits, hx, bit_len = m.groups()
-            i = int(i.strip())
-            bits = [int(c) for c in bits if c != '|']
-            bit_len = int(bit_len.strip())
-            if ch is not None and ord(ch) != i:
-                raise ValueError("ord(%s) == %d, not %d", ch, ord(ch), i)
-            if len(bits) != bit_len:
-                raise ValueError("len(bits) == %d, not %d", len(bits), bit_len)
-            if i == 256:
-                # Skip the end-of-stream marker for now.
-                continue
-            if isinstance(chr(i), type(b'')):
-                key = chr(i)
-            else:
-                key = i
-            if key in huffman_map:
-                raise ValueError("chr(%d) already in map", i)
-            huffman_map[key] = bits
-            tree_node = huffman_tree
-            for b in bits[:-1]:
-                tree_node = tree_node[b]
-            tree_node[bits[-1]] = key
-    return huffman_map, huffman_tree
-
-_huffman_map, _huffman_tree = _load_huffman_data()
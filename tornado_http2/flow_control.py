@@ -19,6 +19,9 @@ class Window(object):
     def close(self):
         self.closed = True
         self.cond.notify_all()
+        if self.parent is not None:
+            # Wake our writers waiting for the parent's credit.
+            self.parent.cond.notify_all()
 
     def _raise_error(self, code, message):
         if self.parent is None:
@@ -46,15 +49,65 @@ class Window(object):
                               "window update must not be zero")
         self.adjust(window_update)
 
-    @gen.coroutine
-    def consume(self, amount):
-        while not self.closed and self.size <= 0:
-            yield self.cond.wait()
-        if self.closed:
-            raise StreamClosedError()
-        if self.size < amount:
-            amount = self.size
+    def try_consume(self, amount):
+        """Consumes ``amount`` if this window and its parent allow it.
+
+        Unlike `consume`, this never waits: it returns False, consuming
+        nothing, if the full amount is not available.
+        """
+        if amount == 0:
+            return True
+        window = self
+        while window is not None:
+            if window.closed or window.size < amount:
+                return False
+            window = window.parent
+        window = self
+        while window is not None:
+            window.size -= amount
+            window = window.parent
+        return True
+
+    def consume_nowait(self, amount):
+        """Consumes up to ``amount`` without waiting.
+
+        Returns the amount consumed, which is zero if this window or
+        its parent is exhausted or closed.
+        """
+        if self.closed or self.size <= 0:
+            return 0
+        amount = min(amount, self.size)
         if self.parent is not None:
-            amount = yield self.parent.consume(amount)
+            amount = self.parent.consume_nowait(amount)
         self.size -= amount
+        return amount
+
+    @gen.coroutine
+    def consume(self, amount):
+        """Consumes up to ``amount``, waiting until this window and its
+        parent both have credit.
+
+        Raises `.StreamClosedError` if either window is closed first;
+        nothing is consumed then, so a closed stream never takes its
+        connection's credit.
+        """
+        while True:
+            window = self
+            while window is not None:
+                if window.closed:
+                    raise StreamClosedError()
+                if window.size <= 0:
+                    break
+                window = window.parent
+            if window is None:
+                break
+            yield window.cond.wait()
+        window = self
+        while window is not None:
+            amount = min(amount, window.size)
+            window = window.parent
+        window = self
+        while window is not None:
+            window.size -= amount
+            window = window.parent
         raise gen.Return(amount)
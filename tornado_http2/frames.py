@@ -10,17 +10,22 @@ class Frame(collections.namedtuple(
     def without_padding(self):
         """Returns a new Frame, equal to this one with any padding removed."""
         if self.flags & constants.FrameFlag.PADDED:
-            pad_len, = struct.unpack('>b', self.data[:1])
+            if not self.data:
+                self._invalid_padding()
+            pad_len, = struct.unpack('>B', self.data[:1])
             if pad_len > (len(self.data)-1):
-                if self.type == constants.FrameType.HEADERS:
-                    raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
-                                          "invalid padding length")
-                raise StreamError(self.stream_id,
-                                  constants.ErrorCode.PROTOCOL_ERROR)
-            data = self.data[1:-pad_len]
+                self._invalid_padding()
+            data = self.data[1:len(self.data) - pad_len]
             return Frame(self.type, self.flags, self.stream_id, data)
         return self
 
+    def _invalid_padding(self):
+        if self.type == constants.FrameType.HEADERS:
+            raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
+                                  "invalid padding length")
+        raise StreamError(self.stream_id,
+                          constants.ErrorCode.PROTOCOL_ERROR)
+
 
 def parse_window_update_frame(frame):
     try:
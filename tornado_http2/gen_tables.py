@@ -0,0 +1,217 @@
+"""Generates `tornado_http2.hpack_tables` from the HPACK spec text files.
+
+Parsing the spec text at import time is slow enough to matter for
+short-lived processes, so the parsed tables are checked in as a
+python module. Regenerate it after changing either text file with::
+
+    python -m tornado_http2.gen_tables
+
+The test suite verifies that the checked-in module is up to date.
+"""
+from __future__ import print_function
+
+import os
+import re
+import sys
+
+from tornado.escape import utf8
+
+_TABLES_MODULE = os.path.join(os.path.dirname(__file__), 'hpack_tables.py')
+
+
+def parse_static_table():
+    """Parses the hpack static table, which was copied from
+    http://http2.github.io/http2-spec/compression.html#static.table
+    corresponding to
+    http://tools.ietf.org/html/draft-ietf-httpbis-header-compression-12#appendix-A
+
+    Returns a list of (name, value) pairs, starting with a dummy entry
+    for index 0. ``value`` is None for entries without a value.
+    """
+    table = [None]
+    with open(os.path.join(os.path.dirname(__file__),
+                           'hpack_static_table.txt')) as f:
+        for line in f:
+            if not line:
+                continue
+            fields = line.split('\t')
+            if int(fields[0]) != len(table):
+                raise ValueError("inconsistent numbering in static table")
+            name = utf8(fields[1].strip())
+            value = utf8(fields[2].strip()) if len(fields) > 2 else None
+            table.append((name, value))
+    return table
+
+
+def parse_huffman_data():
+    """Parses hpack_huffman_data, which was copied from
+    http://http2.github.io/http2-spec/compression.html#huffman.code
+    (corresponding to
+    http://tools.ietf.org/html/draft-ietf-httpbis-header-compression-12#appendix-B )
+
+    Returns a list of (code, bit_length) pairs, indexed by symbol
+    (256 is the end-of-string marker).
+    """
+    codes = []
+    with open(os.path.join(os.path.dirname(__file__),
+                           'hpack_huffman_data.txt')) as f:
+        line_re = re.compile(
+            r"(?:   |EOS|'(.)') \(([ 0-9]{3})\)  ([|01]+) +([0-9a-f]+)  \[([ 0-9]{2})\]")
+        for line in f:
+            m = line_re.match(line)
+            ch, i, bits, hx, bit_len = m.groups()
+            i = int(i.strip())
+            bits = bits.replace('|', '')
+            bit_len = int(bit_len.strip())
+            if ch is not None and ord(ch) != i:
+                raise ValueError("ord(%s) == %d, not %d" % (ch, ord(ch), i))
+            if i != len(codes):
+                raise ValueError("inconsistent numbering in huffman data")
+            if len(bits) != bit_len:
+                raise ValueError("len(bits) == %d, not %d" %
+                                 (len(bits), bit_len))
+            if int(bits, 2) != int(hx, 16):
+                raise ValueError("code for %d does not match hex" % i)
+            codes.append((int(bits, 2), bit_len))
+    return codes
+
+
+def build_huffman_decode_table(codes):
+    """Builds a flat binary decoding tree from huffman ``codes``.
+
+    Node ``n`` of the tree occupies entries ``2*n`` and ``2*n + 1``,
+    for the 0 and 1 branches. A non-negative entry is the index of the
+    next node; a negative entry ``e`` is a leaf for symbol ``~e``.
+    The root is node 0.
+    """
+    table = [None, None]
+    for sym, (code, bit_len) in enumerate(codes):
+        node = 0
+        for shift in range(bit_len - 1, 0, -1):
+            entry = 2 * node + ((code >> shift) & 1)
+            if table[entry] is None:
+                table[entry] = len(table) // 2
+                table.extend([None, None])
+            elif table[entry] < 0:
+                raise ValueError("huffman code for %d is not prefix-free" %
+                                 sym)
+            node = table[entry]
+        entry = 2 * node + (code & 1)
+        if table[entry] is not None:
+            raise ValueError("huffman code for %d is not prefix-free" % sym)
+        table[entry] = ~sym
+    if None in table:
+        raise ValueError("huffman code is incomplete")
+    return table
+
+
+# Layout of HUFFMAN_DECODE_STATES entries.
+HUFFMAN_STATE_MASK = 0xfff
+HUFFMAN_SYMBOL_SHIFT = 12
+HUFFMAN_EMIT = 1 << 20
+HUFFMAN_ACCEPT = 1 << 21
+HUFFMAN_FAIL = 1 << 22
+
+
+def build_huffman_decode_states(tree):
+    """Builds a state table for decoding huffman codes four bits
+    at a time from the binary ``tree`` of `build_huffman_decode_table`.
+
+    The states are the internal nodes of the tree. The entry for
+    state ``s`` and nibble ``n`` is at index ``16*s + n``; its low
+    bits (`HUFFMAN_STATE_MASK`) hold ``16*`` the next state, so the
+    next nibble is simply added to them. The codes are at least five
+    bits long, so a nibble completes at most one symbol: if it does,
+    `HUFFMAN_EMIT` is set and the symbol is stored above
+    `HUFFMAN_SYMBOL_SHIFT`. `HUFFMAN_FAIL` means the nibble completed
+    the end-of-string symbol, which may not be decoded. `HUFFMAN_ACCEPT`
+    means the string may end here: the bits since the last symbol are
+    fewer than eight and all ones (RFC 7541 section 5.2).
+    """
+    # The nodes reached from the root by up to seven 1 bits.
+    accepting = set([0])
+    node = 0
+    for i in range(7):
+        node = tree[2 * node + 1]
+        accepting.add(node)
+    states = []
+    for state in range(len(tree) // 2):
+        for nibble in range(16):
+            node = state
+            entry = 0
+            for shift in (3, 2, 1, 0):
+                branch = tree[2 * node + ((nibble >> shift) & 1)]
+                if branch >= 0:
+                    node = branch
+                    continue
+                node = 0
+                sym = ~branch
+                if sym == 256:
+                    entry |= HUFFMAN_FAIL
+                elif entry & HUFFMAN_EMIT:
+                    raise ValueError("huffman code shorter than five bits")
+                else:
+                    entry |= HUFFMAN_EMIT | (sym << HUFFMAN_SYMBOL_SHIFT)
+            if node in accepting:
+                entry |= HUFFMAN_ACCEPT
+            states.append(entry | (node << 4))
+    return states
+
+
+def _format_tuple(name, items, per_line):
+    lines = ['%s = (' % name]
+    for i in range(0, len(items), per_line):
+        lines.append('    ' + ' '.join('%s,' % item
+                                        for item in items[i:i + per_line]))
+    lines.append(')')
+    return '\n'.join(lines)
+
+
+def _bytes_repr(b):
+    # repr() of bytes lacks the b prefix on python 2.
+    if b is None:
+        return 'None'
+    return 'b' + repr(b.decode('latin1')).lstrip('u')
+
+
+def generate():
+    """Returns the source of the `tornado_http2.hpack_tables` module."""
+    static_table = parse_static_table()
+    codes = parse_huffman_data()
+    decode_table = build_huffman_decode_table(codes)
+    decode_states = build_huffman_decode_states(decode_table)
+    static_items = ['None'] + ['(%s, %s)' % (_bytes_repr(name),
+                                             _bytes_repr(value))
+                               for name, value in static_table[1:]]
+    return '\n\n'.join([
+        '"""HPACK tables, generated by tornado_http2.gen_tables. DO NOT EDIT."""',
+        '# (name, value) pairs of the static table. Index 0 is unused.\n' +
+        _format_tuple('STATIC_TABLE', static_items, 1),
+        '# (code, bit length) of the huffman code for each symbol;\n'
+        '# 256 is the end-of-string marker.\n' +
+        _format_tuple('HUFFMAN_CODES',
+                      ['(0x%x, %d)' % c for c in codes], 4),
+        '# Flat binary decoding tree; see gen_tables.build_huffman_decode_table.\n' +
+        _format_tuple('HUFFMAN_DECODE_TABLE',
+                      [str(e) for e in decode_table], 12),
+        '# Decoding state table, indexed by 16 * state + nibble; see\n'
+        '# gen_tables.build_huffman_decode_states.\n' +
+        'HUFFMAN_STATE_MASK = 0x%x\n' % HUFFMAN_STATE_MASK +
+        'HUFFMAN_SYMBOL_SHIFT = %d\n' % HUFFMAN_SYMBOL_SHIFT +
+        ''.join('%s = 0x%x\n' % (name, value) for name, value in [
+            ('HUFFMAN_EMIT', HUFFMAN_EMIT),
+            ('HUFFMAN_ACCEPT', HUFFMAN_ACCEPT),
+            ('HUFFMAN_FAIL', HUFFMAN_FAIL)]) +
+        _format_tuple('HUFFMAN_DECODE_STATES',
+                      ['0x%x' % e for e in decode_states], 8),
+    ]) + '\n'
+
+
+def main():
+    with open(_TABLES_MODULE, 'w') as f:
+        f.write(generate())
+    print("wrote %s" % _TABLES_MODULE, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
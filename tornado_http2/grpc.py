@@ -0,0 +1,109 @@
+"""Length-prefixed message framing, as used by gRPC.
+
+gRPC sends each message in the body of an HTTP/2 stream as a one-byte
+compressed flag and a four-byte big-endian length, followed by the
+message (https://github.com/grpc/grpc/blob/master/doc/PROTOCOL-HTTP2.md).
+Since messages don't line up with DATA frames, `MessageDecoder` collects
+them from the chunks passed to ``data_received``::
+
+    class EchoDelegate(HTTPMessageDelegate):
+        def __init__(self, request_conn):
+            self.request_conn = request_conn
+            self.decoder = MessageDecoder()
+
+        def headers_received(self, start_line, headers):
+            self.request_conn.write_headers(
+                ResponseStartLine('HTTP/2.0', 200, 'OK'),
+                HTTPHeaders({'Content-Type': 'application/grpc'}))
+
+        def data_received(self, chunk):
+            for message in self.decoder.feed(chunk):
+                self.request_conn.write(encode_message(message))
+
+        def finish(self):
+            self.decoder.finish()
+            self.request_conn.set_trailers(HTTPHeaders({'grpc-status': '0'}))
+            self.request_conn.finish()
+
+Responses may be written while the request is still being received,
+and the request's trailers (if any) are passed to the delegate's
+``trailers_received`` method before ``finish``.
+"""
+import struct
+
+_PREFIX = struct.Struct('>BI')
+
+# gRPC's default limit for received messages.
+DEFAULT_MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+
+class MessageError(Exception):
+    """Raised for a malformed or oversized message."""
+    pass
+
+
+def encode_message(message, compress=None):
+    """Returns ``message`` (bytes) with its length prefix.
+
+    If ``compress`` is given, it is called with the message and the
+    message is marked as compressed.
+    """
+    if compress is not None:
+        message = compress(message)
+        return _PREFIX.pack(1, len(message)) + message
+    return _PREFIX.pack(0, len(message)) + message
+
+
+class MessageDecoder(object):
+    """Splits a stream of chunks into length-prefixed messages.
+
+    ``decompress`` is called with the data of messages marked as
+    compressed; if it is None, such messages are an error.
+    """
+    def __init__(self, max_message_size=DEFAULT_MAX_MESSAGE_SIZE,
+                 decompress=None):
+        self.max_message_size = max_message_size
+        self.decompress = decompress
+        self._buffer = bytearray()
+        # The prefix of the message being received, once known.
+        self._compressed = None
+        self._length = None
+
+    def feed(self, chunk):
+        """Adds ``chunk`` and returns a list of the messages completed
+        by it.
+        """
+        self._buffer += chunk
+        messages = []
+        buf = self._buffer
+        offset = 0
+        while True:
+            if self._length is None:
+                if len(buf) - offset < _PREFIX.size:
+                    break
+                self._compressed, self._length = _PREFIX.unpack_from(
+                    buf, offset)
+                offset += _PREFIX.size
+                if self._compressed not in (0, 1):
+                    raise MessageError("invalid compressed flag")
+                if self._length > self.max_message_size:
+                    raise MessageError("message of %d bytes is too large" %
+                                       self._length)
+            if len(buf) - offset < self._length:
+                break
+            message = bytes(buf[offset:offset + self._length])
+            offset += self._length
+            if self._compressed:
+                if self.decompress is None:
+                    raise MessageError("compressed message but no "
+                                       "decompress function")
+                message = self.decompress(message)
+            messages.append(message)
+            self._compressed = self._length = None
+        del buf[:offset]
+        return messages
+
+    def finish(self):
+        """Checks that the stream did not end inside a message."""
+        if self._buffer or self._length is not None:
+            raise MessageError("incomplete message")
@@ -0,0 +1,182 @@
+from tornado.escape import native_str, utf8
+from tornado.httputil import HTTPHeaders
+
+from .hpack import encode_static_header
+from .hpack_tables import STATIC_TABLE
+
+# Header names from the HPACK static table, which are known to be
+# lowercase. Decoded names are replaced by these instances so that
+# the same names received in many requests share one object.
+_KNOWN_NAMES = dict((name, name) for name, value in STATIC_TABLE[1:]
+                    if not name.startswith(b':'))
+
+
+class _RawNameCache(dict):
+    """Maps header names as passed to `.HTTPHeaders` methods to the
+    lowercase byte strings used in HTTP/2.
+    """
+    def __init__(self, size):
+        super(_RawNameCache, self).__init__()
+        self.size = size
+
+    def __missing__(self, key):
+        raw = utf8(key.lower())
+        raw = _KNOWN_NAMES.get(raw, raw)
+        if len(self) >= self.size:
+            self.clear()
+        self[key] = raw
+        return raw
+
+
+_raw_names = _RawNameCache(1000)
+
+
+def intern_name(name):
+    """Returns a shared instance of the header name ``name`` (bytes),
+    or None if it is not one of the common, known-lowercase names.
+    """
+    return _KNOWN_NAMES.get(name)
+
+
+# Headers that write_headers drops or generates itself.
+_UNCACHEABLE_NAMES = frozenset(['connection', 'host', 'keep-alive',
+                                'proxy-connection', 'transfer-encoding',
+                                'upgrade'])
+
+
+class ConstantHeaderCache(object):
+    """Header fields encoded once and shared by all connections.
+
+    Headers registered here (typically ones set by every response,
+    like ``Server`` or ``Strict-Transport-Security``) are encoded with
+    `.encode_static_header` when registered. When `.Stream.write_headers`
+    sees a registered (name, value) pair it appends the cached bytes to
+    the header block instead of encoding it again; only the other
+    headers go through the connection's `.HpackEncoder`.
+
+    Registered headers are not added to the dynamic table, and are
+    sent after the other headers, so a name that is sometimes set
+    per-request should only be registered if the order of its values
+    doesn't matter.
+
+    Use the shared instance, ``tornado_http2.headers.constant_headers``.
+    """
+    def __init__(self):
+        # Maps (name, value) as returned by HTTPHeaders.get_all to
+        # the encoded field.
+        self._encoded = {}
+
+    def register(self, headers):
+        """Registers headers, given as an `.HTTPHeaders`, a dict or a
+        list of (name, value) pairs.
+        """
+        if isinstance(headers, HTTPHeaders):
+            headers = headers.get_all()
+        elif hasattr(headers, 'items'):
+            headers = headers.items()
+        normalized = HTTPHeaders()
+        for name, value in headers:
+            name = native_str(name)
+            if name.startswith(':') or name.lower() in _UNCACHEABLE_NAMES:
+                raise ValueError("cannot register header %r" % name)
+            normalized.add(name, native_str(value))
+        for name, value in normalized.get_all():
+            self._encoded[(name, value)] = encode_static_header(
+                utf8(name), utf8(value))
+
+    def clear(self):
+        """Forgets all registered headers."""
+        self._encoded.clear()
+
+    def get(self, name, value):
+        """Returns the encoded form of a header from
+        `.HTTPHeaders.get_all`, or None if it is not registered.
+        """
+        return self._encoded.get((name, value))
+
+    def __len__(self):
+        return len(self._encoded)
+
+
+constant_headers = ConstantHeaderCache()
+
+
+class LazyHTTPHeaders(HTTPHeaders):
+    """An `.HTTPHeaders` backed by the (name, value) byte strings of a
+    decoded HTTP/2 header block.
+
+    Names must already be lowercase, as HTTP/2 requires. Looking up a
+    header (with ``[]``, ``get``, ``in`` or ``get_list``) converts just
+    its values to native strings; the regular `.HTTPHeaders` structure
+    is only built when the headers are modified or iterated over.
+    """
+    def __init__(self):
+        super(LazyHTTPHeaders, self).__init__()
+        # Maps lowercase bytes names to lists of bytes values, in the
+        # order received. None once materialized.
+        self._raw = {}
+
+    def add_raw(self, name, value):
+        """Adds a header from the header block."""
+        values = self._raw.get(name)
+        if values is None:
+            self._raw[name] = [value]
+        else:
+            values.append(value)
+
+    def _materialize(self):
+        raw = self._raw
+        if raw is None:
+            return
+        self._raw = None
+        for name, values in raw.items():
+            name = native_str(name)
+            for value in values:
+                super(LazyHTTPHeaders, self).add(name, native_str(value))
+
+    def __getitem__(self, name):
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).__getitem__(name)
+        values = self._raw[_raw_names[name]]
+        if len(values) == 1:
+            return native_str(values[0])
+        return ','.join(native_str(v) for v in values)
+
+    def __contains__(self, name):
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).__contains__(name)
+        return _raw_names[name] in self._raw
+
+    def get_list(self, name):
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).get_list(name)
+        return [native_str(v) for v in self._raw.get(_raw_names[name], ())]
+
+    def add(self, name, value):
+        self._materialize()
+        super(LazyHTTPHeaders, self).add(name, value)
+
+    def get_all(self):
+        self._materialize()
+        return super(LazyHTTPHeaders, self).get_all()
+
+    def parse_line(self, line):
+        self._materialize()
+        super(LazyHTTPHeaders, self).parse_line(line)
+
+    def __setitem__(self, name, value):
+        self._materialize()
+        super(LazyHTTPHeaders, self).__setitem__(name, value)
+
+    def __delitem__(self, name):
+        self._materialize()
+        super(LazyHTTPHeaders, self).__delitem__(name)
+
+    def __len__(self):
+        if self._raw is None:
+            return super(LazyHTTPHeaders, self).__len__()
+        return len(self._raw)
+
+    def __iter__(self):
+        self._materialize()
+        return super(LazyHTTPHeaders, self).__iter__()
@@ -1,9 +1,8 @@
 import collections
-import os
-from tornado.escape import utf8
 
 from .constants import HeaderIndexMode
 from .encoding import BitDecoder, BitEncoder
+from .hpack_tables import STATIC_TABLE
 
 
 def _entry_size(name, value):
@@ -14,13 +13,32 @@ class HpackError(Exception):
     pass
 
 
+class HeaderListTooLarge(HpackError):
+    """Raised by `HpackDecoder.decode` when the decoded headers exceed
+    its ``max_header_list_size``.
+
+    The whole block has been processed, so the decoder remains usable.
+    """
+    pass
+
+
 class HpackDecoder(object):
     def __init__(self, dynamic_table_limit):
         self._dynamic_table = collections.deque()
         self._dynamic_table_size = 0
         self._dynamic_table_limit = dynamic_table_limit
 
-    def decode(self, data):
+    def decode(self, data, max_header_list_size=None):
+        """Decodes a header block into a list of (name, value, mode).
+
+        If ``max_header_list_size`` is given and the headers (counted
+        as for SETTINGS_MAX_HEADER_LIST_SIZE) would exceed it, decoding
+        stops building the list and only processes the rest of the block
+        as far as the dynamic table requires before raising
+        `HeaderListTooLarge`.
+        """
+        too_large = False
+        header_list_size = 0
         try:
             header_list = []
             bit_decoder = BitDecoder(data)
@@ -32,16 +50,20 @@ class HpackDecoder(object):
                 is_indexed = bit_decoder.read_bit()
                 if is_indexed:
                     idx = bit_decoder.read_hpack_int()
+                    limit_update_allowed = False
+                    if too_large:
+                        continue
                     name, value = self.read_from_index(idx)
                     header_list.append((name, value, HeaderIndexMode.YES))
-                    limit_update_allowed = False
                 else:
                     add_to_index = bit_decoder.read_bit()
                     if add_to_index:
                         name, value = self.read_name_value_pair(bit_decoder)
-                        header_list.append((name, value, HeaderIndexMode.YES))
                         self.add_to_dynamic_table(name, value)
                         limit_update_allowed = False
+                        if too_large:
+                            continue
+                        header_list.append((name, value, HeaderIndexMode.YES))
                     else:
                         is_limit_update = bit_decoder.read_bit()
                         if is_limit_update:
@@ -53,16 +75,30 @@ class HpackDecoder(object):
                             # TODO: fail if new_limit is higher than old limit.
                             self._dynamic_table_limit = new_limit
                             self._gc_dynamic_table()
+                            continue
                         else:
                             if bit_decoder.read_bit():
                                 mode = HeaderIndexMode.NEVER
                             else:
                                 mode = HeaderIndexMode.NO
+                            limit_update_allowed = False
+                            if too_large:
+                                # Not needed for the dynamic table, so
+                                # don't even decode it.
+                                self.skip_name_value_pair(bit_decoder)
+                                continue
                             name, value = self.read_name_value_pair(bit_decoder)
                             header_list.append((name, value, mode))
-                            limit_update_allowed = False
+                if max_header_list_size is not None:
+                    header_list_size += _entry_size(name, value)
+                    if header_list_size > max_header_list_size:
+                        too_large = True
+                        header_list = []
         except Exception as e:
             raise HpackError(str(e))
+        if too_large:
+            raise HeaderListTooLarge("header list larger than %d bytes" %
+                                     max_header_list_size)
         return header_list
 
     def read_name_value_pair(self, bit_decoder):
@@ -74,20 +110,24 @@ class HpackDecoder(object):
         value = self.read_string(bit_decoder)
         return name, value
 
+    def skip_name_value_pair(self, bit_decoder):
+        if bit_decoder.read_hpack_int() == 0:
+            self.skip_string(bit_decoder)
+        self.skip_string(bit_decoder)
+
+    def skip_string(self, bit_decoder):
+        bit_decoder.read_bit()  # huffman flag
+        length = bit_decoder.read_hpack_int()
+        if bit_decoder._byte_offset + length > len(bit_decoder._data):
+            raise ValueError("string extends past end of block")
+        bit_decoder._byte_offset += length
+
     def read_string(self, bit_decoder):
         is_huffman = bit_decoder.read_bit()
         length = bit_decoder.read_hpack_int()
         if is_huffman:
-            # read huffman chars until we have read 'length' bytes
-            dest_byte = bit_decoder._byte_offset + length
-            chars = []
-            while bit_decoder._byte_offset < dest_byte:
-                char = bit_decoder.read_huffman_char(dest_byte)
-                if char is None:
-                    break
-                chars.append(char)
-        else:
-            chars = [bit_decoder.read_char() for i in range(length)]
+            return bytes(bit_decoder.read_huffman_string(length))
+        chars = [bit_decoder.read_char() for i in range(length)]
         return bytes(bytearray(chars))
 
     def read_from_index(self, idx):
@@ -180,25 +220,48 @@ class HpackEncoder(object):
             self._dynamic_table_size -= _entry_size(name, value)
 
 
-def _load_static_table():
-    """Parses the hpack static table, which was copied from
-    http://http2.github.io/http2-spec/compression.html#static.table
-    corresponding to
-    http://tools.ietf.org/html/draft-ietf-httpbis-header-compression-12#appendix-A
+def encode_static_header(name, value):
+    """Encodes one header field without using the dynamic table.
+
+    The result does not depend on (or change) any encoder's state, so
+    it can be computed once and spliced into header blocks produced by
+    any `HpackEncoder`. The field is encoded as a static table index
+    if possible, otherwise as a literal without indexing (with a static
+    name index if there is one), using Huffman coding for strings
+    where it is shorter.
     """
-    # start the table with a dummy entry 0
-    table = [None]
-    with open(os.path.join(os.path.dirname(__file__),
-                           'hpack_static_table.txt')) as f:
-        for line in f:
-            if not line:
-                continue
-            fields = line.split('\t')
-            if int(fields[0]) != len(table):
-                raise ValueError("inconsistent numbering in static table")
-            name = utf8(fields[1].strip())
-            value = utf8(fields[2].strip()) if len(fields) > 2 else None
-            table.append((name, value))
+    name = name.lower()
+    bit_encoder = BitEncoder()
+    idx = _static_pairs.get((name, value))
+    if idx:
+        bit_encoder.write_bit(1)
+        bit_encoder.write_hpack_int(idx)
+        return bytes(bit_encoder.data())
+    bit_encoder.write_bits(0, 0, 0, 0)
+    idx = _static_keys.get(name)
+    if idx:
+        bit_encoder.write_hpack_int(idx)
+    else:
+        bit_encoder.write_hpack_int(0)
+        _write_shortest_string(bit_encoder, name)
+    _write_shortest_string(bit_encoder, value)
+    return bytes(bit_encoder.data())
+
+
+def _write_shortest_string(bit_encoder, s):
+    enc = BitEncoder()
+    enc.write_huffman_string(s)
+    huffman = enc.data()
+    if len(huffman) < len(s):
+        bit_encoder.write_bit(1)
+        s = huffman
+    else:
+        bit_encoder.write_bit(0)
+    bit_encoder.write_hpack_int(len(s))
+    bit_encoder.write_string(s)
+
+
+def _index_static_table(table):
     static_keys = {}
     static_pairs = {}
     for i, pair in enumerate(table):
@@ -208,6 +271,7 @@ def _load_static_table():
             # For repeated keys, prefer the earlier one.
             static_keys[pair[0]] = i
         static_pairs[pair] = i
-    return table, static_keys, static_pairs
+    return static_keys, static_pairs
 
-_static_table, _static_keys, _static_pairs = _load_static_table()
+_static_table = STATIC_TABLE
+_static_keys, _static_pairs = _index_static_table(_static_table)
@@ -0,0 +1,706 @@
+"""HPACK tables, generated by tornado_http2.gen_tables. DO NOT EDIT."""
+
+# (name, value) pairs of the static table. Index 0 is unused.
+STATIC_TABLE = (
+    None,
+    (b':authority', None),
+    (b':method', b'GET'),
+    (b':method', b'POST'),
+    (b':path', b'/'),
+    (b':path', b'/index.html'),
+    (b':scheme', b'http'),
+    (b':scheme', b'https'),
+    (b':status', b'200'),
+    (b':status', b'204'),
+    (b':status', b'206'),
+    (b':status', b'304'),
+    (b':status', b'400'),
+    (b':status', b'404'),
+    (b':status', b'500'),
+    (b'accept-charset', None),
+    (b'accept-encoding', b'gzip, deflate'),
+    (b'accept-language', None),
+    (b'accept-ranges', None),
+    (b'accept', None),
+    (b'access-control-allow-origin', None),
+    (b'age', None),
+    (b'allow', None),
+    (b'authorization', None),
+    (b'cache-control', None),
+    (b'content-disposition', None),
+    (b'content-encoding', None),
+    (b'content-language', None),
+    (b'content-length', None),
+    (b'content-location', None),
+    (b'content-range', None),
+    (b'content-type', None),
+    (b'cookie', None),
+    (b'date', None),
+    (b'etag', None),
+    (b'expect', None),
+    (b'expires', None),
+    (b'from', None),
+    (b'host', None),
+    (b'if-match', None),
+    (b'if-modified-since', None),
+    (b'if-none-match', None),
+    (b'if-range', None),
+    (b'if-unmodified-since', None),
+    (b'last-modified', None),
+    (b'link', None),
+    (b'location', None),
+    (b'max-forwards', None),
+    (b'proxy-authenticate', None),
+    (b'proxy-authorization', None),
+    (b'range', None),
+    (b'referer', None),
+    (b'refresh', None),
+    (b'retry-after', None),
+    (b'server', None),
+    (b'set-cookie', None),
+    (b'strict-transport-security', None),
+    (b'transfer-encoding', None),
+    (b'user-agent', None),
+    (b'vary', None),
+    (b'via', None),
+    (b'www-authenticate', None),
+)
+
+# (code, bit length) of the huffman code for each symbol;
+# 256 is the end-of-string marker.
+HUFFMAN_CODES = (
+    (0x1ff8, 13), (0x7fffd8, 23), (0xfffffe2, 28), (0xfffffe3, 28),
+    (0xfffffe4, 28), (0xfffffe5, 28), (0xfffffe6, 28), (0xfffffe7, 28),
+    (0xfffffe8, 28), (0xffffea, 24), (0x3ffffffc, 30), (0xfffffe9, 28),
+    (0xfffffea, 28), (0x3ffffffd, 30), (0xfffffeb, 28), (0xfffffec, 28),
+    (0xfffffed, 28), (0xfffffee, 28), (0xfffffef, 28), (0xffffff0, 28),
+    (0xffffff1, 28), (0xffffff2, 28), (0x3ffffffe, 30), (0xffffff3, 28),
+    (0xffffff4, 28), (0xffffff5, 28), (0xffffff6, 28), (0xffffff7, 28),
+    (0xffffff8, 28), (0xffffff9, 28), (0xffffffa, 28), (0xffffffb, 28),
+    (0x14, 6), (0x3f8, 10), (0x3f9, 10), (0xffa, 12),
+    (0x1ff9, 13), (0x15, 6), (0xf8, 8), (0x7fa, 11),
+    (0x3fa, 10), (0x3fb, 10), (0xf9, 8), (0x7fb, 11),
+    (0xfa, 8), (0x16, 6), (0x17, 6), (0x18, 6),
+    (0x0, 5), (0x1, 5), (0x2, 5), (0x19, 6),
+    (0x1a, 6), (0x1b, 6), (0x1c, 6), (0x1d, 6),
+    (0x1e, 6), (0x1f, 6), (0x5c, 7), (0xfb, 8),
+    (0x7ffc, 15), (0x20, 6), (0xffb, 12), (0x3fc, 10),
+    (0x1ffa, 13), (0x21, 6), (0x5d, 7), (0x5e, 7),
+    (0x5f, 7), (0x60, 7), (0x61, 7), (0x62, 7),
+    (0x63, 7), (0x64, 7), (0x65, 7), (0x66, 7),
+    (0x67, 7), (0x68, 7), (0x69, 7), (0x6a, 7),
+    (0x6b, 7), (0x6c, 7), (0x6d, 7), (0x6e, 7),
+    (0x6f, 7), (0x70, 7), (0x71, 7), (0x72, 7),
+    (0xfc, 8), (0x73, 7), (0xfd, 8), (0x1ffb, 13),
+    (0x7fff0, 19), (0x1ffc, 13), (0x3ffc, 14), (0x22, 6),
+    (0x7ffd, 15), (0x3, 5), (0x23, 6), (0x4, 5),
+    (0x24, 6), (0x5, 5), (0x25, 6), (0x26, 6),
+    (0x27, 6), (0x6, 5), (0x74, 7), (0x75, 7),
+    (0x28, 6), (0x29, 6), (0x2a, 6), (0x7, 5),
+    (0x2b, 6), (0x76, 7), (0x2c, 6), (0x8, 5),
+    (0x9, 5), (0x2d, 6), (0x77, 7), (0x78, 7),
+    (0x79, 7), (0x7a, 7), (0x7b, 7), (0x7ffe, 15),
+    (0x7fc, 11), (0x3ffd, 14), (0x1ffd, 13), (0xffffffc, 28),
+    (0xfffe6, 20), (0x3fffd2, 22), (0xfffe7, 20), (0xfffe8, 20),
+    (0x3fffd3, 22), (0x3fffd4, 22), (0x3fffd5, 22), (0x7fffd9, 23),
+    (0x3fffd6, 22), (0x7fffda, 23), (0x7fffdb, 23), (0x7fffdc, 23),
+    (0x7fffdd, 23), (0x7fffde, 23), (0xffffeb, 24), (0x7fffdf, 23),
+    (0xffffec, 24), (0xffffed, 24), (0x3fffd7, 22), (0x7fffe0, 23),
+    (0xffffee, 24), (0x7fffe1, 23), (0x7fffe2, 23), (0x7fffe3, 23),
+    (0x7fffe4, 23), (0x1fffdc, 21), (0x3fffd8, 22), (0x7fffe5, 23),
+    (0x3fffd9, 22), (0x7fffe6, 23), (0x7fffe7, 23), (0xffffef, 24),
+    (0x3fffda, 22), (0x1fffdd, 21), (0xfffe9, 20), (0x3fffdb, 22),
+    (0x3fffdc, 22), (0x7fffe8, 23), (0x7fffe9, 23), (0x1fffde, 21),
+    (0x7fffea, 23), (0x3fffdd, 22), (0x3fffde, 22), (0xfffff0, 24),
+    (0x1fffdf, 21), (0x3fffdf, 22), (0x7fffeb, 23), (0x7fffec, 23),
+    (0x1fffe0, 21), (0x1fffe1, 21), (0x3fffe0, 22), (0x1fffe2, 21),
+    (0x7fffed, 23), (0x3fffe1, 22), (0x7fffee, 23), (0x7fffef, 23),
+    (0xfffea, 20), (0x3fffe2, 22), (0x3fffe3, 22), (0x3fffe4, 22),
+    (0x7ffff0, 23), (0x3fffe5, 22), (0x3fffe6, 22), (0x7ffff1, 23),
+    (0x3ffffe0, 26), (0x3ffffe1, 26), (0xfffeb, 20), (0x7fff1, 19),
+    (0x3fffe7, 22), (0x7ffff2, 23), (0x3fffe8, 22), (0x1ffffec, 25),
+    (0x3ffffe2, 26), (0x3ffffe3, 26), (0x3ffffe4, 26), (0x7ffffde, 27),
+    (0x7ffffdf, 27), (0x3ffffe5, 26), (0xfffff1, 24), (0x1ffffed, 25),
+    (0x7fff2, 19), (0x1fffe3, 21), (0x3ffffe6, 26), (0x7ffffe0, 27),
+    (0x7ffffe1, 27), (0x3ffffe7, 26), (0x7ffffe2, 27), (0xfffff2, 24),
+    (0x1fffe4, 21), (0x1fffe5, 21), (0x3ffffe8, 26), (0x3ffffe9, 26),
+    (0xffffffd, 28), (0x7ffffe3, 27), (0x7ffffe4, 27), (0x7ffffe5, 27),
+    (0xfffec, 20), (0xfffff3, 24), (0xfffed, 20), (0x1fffe6, 21),
+    (0x3fffe9, 22), (0x1fffe7, 21), (0x1fffe8, 21), (0x7ffff3, 23),
+    (0x3fffea, 22), (0x3fffeb, 22), (0x1ffffee, 25), (0x1ffffef, 25),
+    (0xfffff4, 24), (0xfffff5, 24), (0x3ffffea, 26), (0x7ffff4, 23),
+    (0x3ffffeb, 26), (0x7ffffe6, 27), (0x3ffffec, 26), (0x3ffffed, 26),
+    (0x7ffffe7, 27), (0x7ffffe8, 27), (0x7ffffe9, 27), (0x7ffffea, 27),
+    (0x7ffffeb, 27), (0xffffffe, 28), (0x7ffffec, 27), (0x7ffffed, 27),
+    (0x7ffffee, 27), (0x7ffffef, 27), (0x7fffff0, 27), (0x3ffffee, 26),
+    (0x3fffffff, 30),
+)
+
+# Flat binary decoding tree; see gen_tables.build_huffman_decode_table.
+HUFFMAN_DECODE_TABLE = (
+    66, 1, 93, 2, 104, 3, 119, 4, 144, 5, 75, 6,
+    123, 7, 71, 8, 77, 9, 73, 10, 11, 13, 12, 102,
+    -1, -37, 127, 14, 128, 15, 98, 16, -124, 17, 124, 18,
+    150, 19, 20, 25, 199, 21, 216, 22, 23, 162, 24, 161,
+    -2, -136, 167, 26, 41, 27, 191, 28, 211, 29, 229, 30,
+    31, 45, 32, 38, 33, 35, -255, 34, -3, -4, 36, 37,
+    -5, -6, -7, -8, 39, 52, 40, 51, -9, -12, 208, 42,
+    43, 165, -240, 44, -10, -143, 55, 46, 63, 47, 147, 48,
+    -250, 49, 50, 59, -11, -14, -13, -15, 53, 54, -16, -17,
+    -18, -19, 56, 60, 57, 58, -20, -21, -22, -24, -23, -257,
+    61, 62, -25, -26, -27, -28, 64, 65, -29, -30, -31, -32,
+    85, 67, 68, 82, 143, 69, 70, 81, -33, -38, 72, 79,
+    -34, -35, -125, 74, -36, -63, 76, 80, -39, -43, -64, 78,
+    -40, -44, -41, -42, -45, -60, -46, -47, 83, 90, 84, 89,
+    -48, -52, 86, 130, 87, 88, -49, -50, -51, -98, -53, -54,
+    91, 92, -55, -56, -57, -58, 99, 94, 138, 95, 142, 96,
+    97, 103, -59, -67, -61, -97, 100, 132, 101, 129, -62, -66,
+    -65, -92, -68, -69, 105, 112, 106, 109, 107, 108, -70, -71,
+    -72, -73, 110, 111, -74, -75, -76, -77, 113, 116, 114, 115,
+    -78, -79, -80, -81, 117, 118, -82, -83, -84, -85, 120, 136,
+    121, 122, -86, -87, -88, -90, -89, -91, 125, 155, 126, 148,
+    -93, -196, -94, -127, -95, -126, -96, -99, 131, 135, -100, -102,
+    133, 134, -101, -103, -104, -105, -106, -112, 137, 141, -107, -108,
+    139, 140, -109, -110, -111, -113, -114, -119, -115, -118, -116, -117,
+    145, 146, -120, -121, -122, -123, -128, -221, -209, 149, -129, -131,
+    196, 151, 152, 178, 153, 158, -231, 154, -130, -133, 156, 175,
+    157, 204, -132, -163, 159, 160, -134, -135, -137, -147, -138, -139,
+    163, 164, -140, -141, -142, -144, 166, 171, -145, -146, 168, 185,
+    169, 173, 170, 172, -148, -150, -149, -160, -151, -152, 174, 181,
+    -153, -156, 241, 176, 177, 188, -154, -162, 179, 183, 180, 182,
+    -155, -157, -158, -159, -161, -164, 184, 190, -165, -170, 186, 194,
+    187, 189, -166, -167, -168, -173, -169, -175, -171, -174, 192, 218,
+    193, 234, -172, -207, 195, 203, -176, -181, 197, 235, 198, 202,
+    -177, -178, 200, 206, 201, 205, -179, -182, -180, -210, -183, -184,
+    -185, -195, -186, -187, 207, 210, -188, -190, 209, 215, -189, -192,
+    -191, -197, 212, 224, 213, 222, 214, 221, -193, -194, -198, -232,
+    217, 243, -199, -229, 245, 219, 220, 244, -200, -208, -201, -202,
+    223, 228, -203, -206, 237, 225, 248, 226, -256, 227, -204, -205,
+    -211, -214, 230, 249, 231, 239, 232, 233, -212, -213, -215, -222,
+    -216, -226, 236, 242, -217, -218, 238, 246, -219, -220, 240, 247,
+    -223, -224, -225, -227, -228, -230, -233, -234, -235, -236, -237, -238,
+    -239, -241, -242, -245, -243, -244, 250, 253, 251, 252, -246, -247,
+    -248, -249, 254, 255, -251, -252, -253, -254,
+)
+
+# Decoding state table, indexed by 16 * state + nibble; see
+# gen_tables.build_huffman_decode_states.
+HUFFMAN_STATE_MASK = 0xfff
+HUFFMAN_SYMBOL_SHIFT = 12
+HUFFMAN_EMIT = 0x100000
+HUFFMAN_ACCEPT = 0x200000
+HUFFMAN_FAIL = 0x400000
+HUFFMAN_DECODE_STATES = (
+    0x570, 0x580, 0x830, 0x870, 0x8f0, 0x450, 0x530, 0x5a0,
+    0x640, 0x840, 0x8a0, 0x5f0, 0x690, 0x700, 0x770, 0x200040,
+    0x650, 0x810, 0x850, 0x860, 0x8b0, 0x8c0, 0x8e0, 0x600,
+    0x6a0, 0x6d0, 0x710, 0x740, 0x780, 0x880, 0x900, 0x200050,
+    0x6b0, 0x6c0, 0x6e0, 0x6f0, 0x720, 0x730, 0x750, 0x760,
+    0x790, 0x7a0, 0x890, 0x8d0, 0x910, 0x920, 0x4b0, 0x200060,
+    0x355000, 0x356000, 0x357000, 0x359000, 0x36a000, 0x36b000, 0x371000, 0x376000,
+    0x377000, 0x378000, 0x379000, 0x37a000, 0x4c0, 0x500, 0x7b0, 0x200070,
+    0x177420, 0x377010, 0x178420, 0x378010, 0x179420, 0x379010, 0x17a420, 0x37a010,
+    0x326000, 0x32a000, 0x32c000, 0x33b000, 0x358000, 0x35a000, 0x470, 0x80,
+    0x126420, 0x326010, 0x12a420, 0x32a010, 0x12c420, 0x32c010, 0x13b420, 0x33b010,
+    0x158420, 0x358010, 0x15a420, 0x35a010, 0x480, 0x4f0, 0x4d0, 0x90,
+    0x158550, 0x158430, 0x1585d0, 0x358020, 0x15a550, 0x15a430, 0x15a5d0, 0x35a020,
+    0x321000, 0x322000, 0x328000, 0x329000, 0x33f000, 0x4e0, 0x490, 0xa0,
+    0x121420, 0x321010, 0x122420, 0x322010, 0x128420, 0x328010, 0x129420, 0x329010,
+    0x13f420, 0x33f010, 0x327000, 0x32b000, 0x37c000, 0x4a0, 0xb0, 0xd0,
+    0x13f550, 0x13f430, 0x13f5d0, 0x33f020, 0x127420, 0x327010, 0x12b420, 0x32b010,
+    0x17c420, 0x37c010, 0x323000, 0x33e000, 0xc0, 0x660, 0x7f0, 0xe0,
+    0x17c550, 0x17c430, 0x17c5d0, 0x37c020, 0x123420, 0x323010, 0x13e420, 0x33e010,
+    0x300000, 0x324000, 0x340000, 0x35b000, 0x35d000, 0x37e000, 0x800, 0xf0,
+    0x100420, 0x300010, 0x124420, 0x324010, 0x140420, 0x340010, 0x15b420, 0x35b010,
+    0x15d420, 0x35d010, 0x17e420, 0x37e010, 0x35e000, 0x37d000, 0x620, 0x100,
+    0x100550, 0x100430, 0x1005d0, 0x300020, 0x124550, 0x124430, 0x1245d0, 0x324020,
+    0x140550, 0x140430, 0x1405d0, 0x340020, 0x15b550, 0x15b430, 0x15b5d0, 0x35b020,
+    0x100560, 0x100820, 0x100440, 0x100520, 0x100630, 0x1005e0, 0x100680, 0x300030,
+    0x124560, 0x124820, 0x124440, 0x124520, 0x124630, 0x1245e0, 0x124680, 0x324030,
+    0x15d550, 0x15d430, 0x15d5d0, 0x35d020, 0x17e550, 0x17e430, 0x17e5d0, 0x37e020,
+    0x15e420, 0x35e010, 0x17d420, 0x37d010, 0x33c000, 0x360000, 0x37b000, 0x110,
+    0x15e550, 0x15e430, 0x15e5d0, 0x35e020, 0x17d550, 0x17d430, 0x17d5d0, 0x37d020,
+    0x13c420, 0x33c010, 0x160420, 0x360010, 0x17b420, 0x37b010, 0x7c0, 0x120,
+    0x13c550, 0x13c430, 0x13c5d0, 0x33c020, 0x160550, 0x160430, 0x1605d0, 0x360020,
+    0x17b550, 0x17b430, 0x17b5d0, 0x37b020, 0x7d0, 0x9b0, 0x960, 0x130,
+    0x17b560, 0x17b820, 0x17b440, 0x17b520, 0x17b630, 0x17b5e0, 0x17b680, 0x37b030,
+    0x7e0, 0x940, 0x9c0, 0xaf0, 0xc40, 0x970, 0x140, 0x190,
+    0x35c000, 0x3c3000, 0x3d0000, 0x950, 0x9d0, 0xcc0, 0xf10, 0xb00,
+    0xc50, 0xeb0, 0x980, 0xb20, 0xc70, 0x150, 0xa70, 0x1a0,
+    0xc60, 0xca0, 0xec0, 0xf20, 0x990, 0x9e0, 0xb30, 0xb70,
+    0xc80, 0xce0, 0xd80, 0x160, 0xa80, 0xb90, 0x290, 0x1b0,
+    0xc90, 0xcd0, 0xcf0, 0xd20, 0xd90, 0xf30, 0x170, 0xa20,
+    0xa90, 0xad0, 0xba0, 0xc20, 0xd00, 0x2a0, 0xbf0, 0x1c0,
+    0x3b2000, 0x3b5000, 0x3b9000, 0x3ba000, 0x3bb000, 0x3bd000, 0x3be000, 0x3c4000,
+    0x3c6000, 0x3e4000, 0x3e8000, 0x3e9000, 0x180, 0xa10, 0xa30, 0xa40,
+    0x1c6420, 0x3c6010, 0x1e4420, 0x3e4010, 0x1e8420, 0x3e8010, 0x1e9420, 0x3e9010,
+    0x301000, 0x387000, 0x389000, 0x38a000, 0x38b000, 0x38c000, 0x38d000, 0x38f000,
+    0x101420, 0x301010, 0x187420, 0x387010, 0x189420, 0x389010, 0x18a420, 0x38a010,
+    0x18b420, 0x38b010, 0x18c420, 0x38c010, 0x18d420, 0x38d010, 0x18f420, 0x38f010,
+    0x101550, 0x101430, 0x1015d0, 0x301020, 0x187550, 0x187430, 0x1875d0, 0x387020,
+    0x189550, 0x189430, 0x1895d0, 0x389020, 0x18a550, 0x18a430, 0x18a5d0, 0x38a020,
+    0x101560, 0x101820, 0x101440, 0x101520, 0x101630, 0x1015e0, 0x101680, 0x301030,
+    0x187560, 0x187820, 0x187440, 0x187520, 0x187630, 0x1875e0, 0x187680, 0x387030,
+    0xaa0, 0xac0, 0xae0, 0xb50, 0xbb0, 0xbd0, 0xc30, 0xcb0,
+    0xd10, 0xd70, 0x2b0, 0xa50, 0xc00, 0xda0, 0xd30, 0x1d0,
+    0x3bc000, 0x3bf000, 0x3c5000, 0x3e7000, 0x3ef000, 0x2c0, 0xa60, 0xab0,
+    0xc10, 0xea0, 0xf50, 0xdb0, 0xd40, 0xe00, 0xe50, 0x1e0,
+    0x3ab000, 0x3ce000, 0x3d7000, 0x3e1000, 0x3ec000, 0x3ed000, 0xdc0, 0xf40,
+    0xd50, 0xde0, 0xed0, 0xe10, 0xe60, 0xf90, 0x1f0, 0x2d0,
+    0xd60, 0xdd0, 0xdf0, 0xe40, 0xee0, 0xf60, 0xf80, 0xe20,
+    0xe70, 0xef0, 0xfa0, 0xfd0, 0x200, 0x260, 0x370, 0x2e0,
+    0xe80, 0xe90, 0xf00, 0xf70, 0xfb0, 0xfc0, 0xfe0, 0xff0,
+    0x210, 0x230, 0x270, 0x340, 0x380, 0x3c0, 0x3f0, 0x2f0,
+    0x3fe000, 0x220, 0x240, 0x250, 0x280, 0x330, 0x350, 0x360,
+    0x390, 0x3a0, 0x3d0, 0x3e0, 0x400, 0x410, 0x930, 0x300,
+    0x1fe420, 0x3fe010, 0x302000, 0x303000, 0x304000, 0x305000, 0x306000, 0x307000,
+    0x308000, 0x30b000, 0x30c000, 0x30e000, 0x30f000, 0x310000, 0x311000, 0x312000,
+    0x1fe550, 0x1fe430, 0x1fe5d0, 0x3fe020, 0x102420, 0x302010, 0x103420, 0x303010,
+    0x104420, 0x304010, 0x105420, 0x305010, 0x106420, 0x306010, 0x107420, 0x307010,
+    0x1fe560, 0x1fe820, 0x1fe440, 0x1fe520, 0x1fe630, 0x1fe5e0, 0x1fe680, 0x3fe030,
+    0x102550, 0x102430, 0x1025d0, 0x302020, 0x103550, 0x103430, 0x1035d0, 0x303020,
+    0x102560, 0x102820, 0x102440, 0x102520, 0x102630, 0x1025e0, 0x102680, 0x302030,
+    0x103560, 0x103820, 0x103440, 0x103520, 0x103630, 0x1035e0, 0x103680, 0x303030,
+    0x104550, 0x104430, 0x1045d0, 0x304020, 0x105550, 0x105430, 0x1055d0, 0x305020,
+    0x106550, 0x106430, 0x1065d0, 0x306020, 0x107550, 0x107430, 0x1075d0, 0x307020,
+    0x104560, 0x104820, 0x104440, 0x104520, 0x104630, 0x1045e0, 0x104680, 0x304030,
+    0x105560, 0x105820, 0x105440, 0x105520, 0x105630, 0x1055e0, 0x105680, 0x305030,
+    0x106560, 0x106820, 0x106440, 0x106520, 0x106630, 0x1065e0, 0x106680, 0x306030,
+    0x107560, 0x107820, 0x107440, 0x107520, 0x107630, 0x1075e0, 0x107680, 0x307030,
+    0x108420, 0x308010, 0x10b420, 0x30b010, 0x10c420, 0x30c010, 0x10e420, 0x30e010,
+    0x10f420, 0x30f010, 0x110420, 0x310010, 0x111420, 0x311010, 0x112420, 0x312010,
+    0x108550, 0x108430, 0x1085d0, 0x308020, 0x10b550, 0x10b430, 0x10b5d0, 0x30b020,
+    0x10c550, 0x10c430, 0x10c5d0, 0x30c020, 0x10e550, 0x10e430, 0x10e5d0, 0x30e020,
+    0x108560, 0x108820, 0x108440, 0x108520, 0x108630, 0x1085e0, 0x108680, 0x308030,
+    0x10b560, 0x10b820, 0x10b440, 0x10b520, 0x10b630, 0x10b5e0, 0x10b680, 0x30b030,
+    0x1bc420, 0x3bc010, 0x1bf420, 0x3bf010, 0x1c5420, 0x3c5010, 0x1e7420, 0x3e7010,
+    0x1ef420, 0x3ef010, 0x309000, 0x38e000, 0x390000, 0x391000, 0x394000, 0x39f000,
+    0x1ef550, 0x1ef430, 0x1ef5d0, 0x3ef020, 0x109420, 0x309010, 0x18e420, 0x38e010,
+    0x190420, 0x390010, 0x191420, 0x391010, 0x194420, 0x394010, 0x19f420, 0x39f010,
+    0x1ef560, 0x1ef820, 0x1ef440, 0x1ef520, 0x1ef630, 0x1ef5e0, 0x1ef680, 0x3ef030,
+    0x109550, 0x109430, 0x1095d0, 0x309020, 0x18e550, 0x18e430, 0x18e5d0, 0x38e020,
+    0x109560, 0x109820, 0x109440, 0x109520, 0x109630, 0x1095e0, 0x109680, 0x309030,
+    0x18e560, 0x18e820, 0x18e440, 0x18e520, 0x18e630, 0x18e5e0, 0x18e680, 0x38e030,
+    0x313000, 0x314000, 0x315000, 0x317000, 0x318000, 0x319000, 0x31a000, 0x31b000,
+    0x31c000, 0x31d000, 0x31e000, 0x31f000, 0x37f000, 0x3dc000, 0x3f9000, 0x310,
+    0x11c420, 0x31c010, 0x11d420, 0x31d010, 0x11e420, 0x31e010, 0x11f420, 0x31f010,
+    0x17f420, 0x37f010, 0x1dc420, 0x3dc010, 0x1f9420, 0x3f9010, 0x320, 0x3b0,
+    0x17f550, 0x17f430, 0x17f5d0, 0x37f020, 0x1dc550, 0x1dc430, 0x1dc5d0, 0x3dc020,
+    0x1f9550, 0x1f9430, 0x1f95d0, 0x3f9020, 0x30a000, 0x30d000, 0x316000, 0x600000,
+    0x1f9560, 0x1f9820, 0x1f9440, 0x1f9520, 0x1f9630, 0x1f95e0, 0x1f9680, 0x3f9030,
+    0x10a420, 0x30a010, 0x10d420, 0x30d010, 0x116420, 0x316010, 0x400420, 0x600010,
+    0x10a550, 0x10a430, 0x10a5d0, 0x30a020, 0x10d550, 0x10d430, 0x10d5d0, 0x30d020,
+    0x116550, 0x116430, 0x1165d0, 0x316020, 0x400550, 0x400430, 0x4005d0, 0x600020,
+    0x10a560, 0x10a820, 0x10a440, 0x10a520, 0x10a630, 0x10a5e0, 0x10a680, 0x30a030,
+    0x10d560, 0x10d820, 0x10d440, 0x10d520, 0x10d630, 0x10d5e0, 0x10d680, 0x30d030,
+    0x10c560, 0x10c820, 0x10c440, 0x10c520, 0x10c630, 0x10c5e0, 0x10c680, 0x30c030,
+    0x10e560, 0x10e820, 0x10e440, 0x10e520, 0x10e630, 0x10e5e0, 0x10e680, 0x30e030,
+    0x10f550, 0x10f430, 0x10f5d0, 0x30f020, 0x110550, 0x110430, 0x1105d0, 0x310020,
+    0x111550, 0x111430, 0x1115d0, 0x311020, 0x112550, 0x112430, 0x1125d0, 0x312020,
+    0x10f560, 0x10f820, 0x10f440, 0x10f520, 0x10f630, 0x10f5e0, 0x10f680, 0x30f030,
+    0x110560, 0x110820, 0x110440, 0x110520, 0x110630, 0x1105e0, 0x110680, 0x310030,
+    0x111560, 0x111820, 0x111440, 0x111520, 0x111630, 0x1115e0, 0x111680, 0x311030,
+    0x112560, 0x112820, 0x112440, 0x112520, 0x112630, 0x1125e0, 0x112680, 0x312030,
+    0x113420, 0x313010, 0x114420, 0x314010, 0x115420, 0x315010, 0x117420, 0x317010,
+    0x118420, 0x318010, 0x119420, 0x319010, 0x11a420, 0x31a010, 0x11b420, 0x31b010,
+    0x113550, 0x113430, 0x1135d0, 0x313020, 0x114550, 0x114430, 0x1145d0, 0x314020,
+    0x115550, 0x115430, 0x1155d0, 0x315020, 0x117550, 0x117430, 0x1175d0, 0x317020,
+    0x113560, 0x113820, 0x113440, 0x113520, 0x113630, 0x1135e0, 0x113680, 0x313030,
+    0x114560, 0x114820, 0x114440, 0x114520, 0x114630, 0x1145e0, 0x114680, 0x314030,
+    0x115560, 0x115820, 0x115440, 0x115520, 0x115630, 0x1155e0, 0x115680, 0x315030,
+    0x117560, 0x117820, 0x117440, 0x117520, 0x117630, 0x1175e0, 0x117680, 0x317030,
+    0x116560, 0x116820, 0x116440, 0x116520, 0x116630, 0x1165e0, 0x116680, 0x316030,
+    0x400560, 0x400820, 0x400440, 0x400520, 0x400630, 0x4005e0, 0x400680, 0x600030,
+    0x118550, 0x118430, 0x1185d0, 0x318020, 0x119550, 0x119430, 0x1195d0, 0x319020,
+    0x11a550, 0x11a430, 0x11a5d0, 0x31a020, 0x11b550, 0x11b430, 0x11b5d0, 0x31b020,
+    0x118560, 0x118820, 0x118440, 0x118520, 0x118630, 0x1185e0, 0x118680, 0x318030,
+    0x119560, 0x119820, 0x119440, 0x119520, 0x119630, 0x1195e0, 0x119680, 0x319030,
+    0x11a560, 0x11a820, 0x11a440, 0x11a520, 0x11a630, 0x11a5e0, 0x11a680, 0x31a030,
+    0x11b560, 0x11b820, 0x11b440, 0x11b520, 0x11b630, 0x11b5e0, 0x11b680, 0x31b030,
+    0x11c550, 0x11c430, 0x11c5d0, 0x31c020, 0x11d550, 0x11d430, 0x11d5d0, 0x31d020,
+    0x11e550, 0x11e430, 0x11e5d0, 0x31e020, 0x11f550, 0x11f430, 0x11f5d0, 0x31f020,
+    0x11c560, 0x11c820, 0x11c440, 0x11c520, 0x11c630, 0x11c5e0, 0x11c680, 0x31c030,
+    0x11d560, 0x11d820, 0x11d440, 0x11d520, 0x11d630, 0x11d5e0, 0x11d680, 0x31d030,
+    0x11e560, 0x11e820, 0x11e440, 0x11e520, 0x11e630, 0x11e5e0, 0x11e680, 0x31e030,
+    0x11f560, 0x11f820, 0x11f440, 0x11f520, 0x11f630, 0x11f5e0, 0x11f680, 0x31f030,
+    0x330000, 0x331000, 0x332000, 0x361000, 0x363000, 0x365000, 0x369000, 0x36f000,
+    0x373000, 0x374000, 0x460, 0x510, 0x540, 0x590, 0x5b0, 0x5c0,
+    0x173420, 0x373010, 0x174420, 0x374010, 0x320000, 0x325000, 0x32d000, 0x32e000,
+    0x32f000, 0x333000, 0x334000, 0x335000, 0x336000, 0x337000, 0x338000, 0x339000,
+    0x173550, 0x173430, 0x1735d0, 0x373020, 0x174550, 0x174430, 0x1745d0, 0x374020,
+    0x120420, 0x320010, 0x125420, 0x325010, 0x12d420, 0x32d010, 0x12e420, 0x32e010,
+    0x120550, 0x120430, 0x1205d0, 0x320020, 0x125550, 0x125430, 0x1255d0, 0x325020,
+    0x12d550, 0x12d430, 0x12d5d0, 0x32d020, 0x12e550, 0x12e430, 0x12e5d0, 0x32e020,
+    0x120560, 0x120820, 0x120440, 0x120520, 0x120630, 0x1205e0, 0x120680, 0x320030,
+    0x125560, 0x125820, 0x125440, 0x125520, 0x125630, 0x1255e0, 0x125680, 0x325030,
+    0x121550, 0x121430, 0x1215d0, 0x321020, 0x122550, 0x122430, 0x1225d0, 0x322020,
+    0x128550, 0x128430, 0x1285d0, 0x328020, 0x129550, 0x129430, 0x1295d0, 0x329020,
+    0x121560, 0x121820, 0x121440, 0x121520, 0x121630, 0x1215e0, 0x121680, 0x321030,
+    0x122560, 0x122820, 0x122440, 0x122520, 0x122630, 0x1225e0, 0x122680, 0x322030,
+    0x17c560, 0x17c820, 0x17c440, 0x17c520, 0x17c630, 0x17c5e0, 0x17c680, 0x37c030,
+    0x123550, 0x123430, 0x1235d0, 0x323020, 0x13e550, 0x13e430, 0x13e5d0, 0x33e020,
+    0x123560, 0x123820, 0x123440, 0x123520, 0x123630, 0x1235e0, 0x123680, 0x323030,
+    0x13e560, 0x13e820, 0x13e440, 0x13e520, 0x13e630, 0x13e5e0, 0x13e680, 0x33e030,
+    0x126550, 0x126430, 0x1265d0, 0x326020, 0x12a550, 0x12a430, 0x12a5d0, 0x32a020,
+    0x12c550, 0x12c430, 0x12c5d0, 0x32c020, 0x13b550, 0x13b430, 0x13b5d0, 0x33b020,
+    0x126560, 0x126820, 0x126440, 0x126520, 0x126630, 0x1265e0, 0x126680, 0x326030,
+    0x12a560, 0x12a820, 0x12a440, 0x12a520, 0x12a630, 0x12a5e0, 0x12a680, 0x32a030,
+    0x13f560, 0x13f820, 0x13f440, 0x13f520, 0x13f630, 0x13f5e0, 0x13f680, 0x33f030,
+    0x127550, 0x127430, 0x1275d0, 0x327020, 0x12b550, 0x12b430, 0x12b5d0, 0x32b020,
+    0x127560, 0x127820, 0x127440, 0x127520, 0x127630, 0x1275e0, 0x127680, 0x327030,
+    0x12b560, 0x12b820, 0x12b440, 0x12b520, 0x12b630, 0x12b5e0, 0x12b680, 0x32b030,
+    0x128560, 0x128820, 0x128440, 0x128520, 0x128630, 0x1285e0, 0x128680, 0x328030,
+    0x129560, 0x129820, 0x129440, 0x129520, 0x129630, 0x1295e0, 0x129680, 0x329030,
+    0x12c560, 0x12c820, 0x12c440, 0x12c520, 0x12c630, 0x12c5e0, 0x12c680, 0x32c030,
+    0x13b560, 0x13b820, 0x13b440, 0x13b520, 0x13b630, 0x13b5e0, 0x13b680, 0x33b030,
+    0x12d560, 0x12d820, 0x12d440, 0x12d520, 0x12d630, 0x12d5e0, 0x12d680, 0x32d030,
+    0x12e560, 0x12e820, 0x12e440, 0x12e520, 0x12e630, 0x12e5e0, 0x12e680, 0x32e030,
+    0x12f420, 0x32f010, 0x133420, 0x333010, 0x134420, 0x334010, 0x135420, 0x335010,
+    0x136420, 0x336010, 0x137420, 0x337010, 0x138420, 0x338010, 0x139420, 0x339010,
+    0x12f550, 0x12f430, 0x12f5d0, 0x32f020, 0x133550, 0x133430, 0x1335d0, 0x333020,
+    0x134550, 0x134430, 0x1345d0, 0x334020, 0x135550, 0x135430, 0x1355d0, 0x335020,
+    0x12f560, 0x12f820, 0x12f440, 0x12f520, 0x12f630, 0x12f5e0, 0x12f680, 0x32f030,
+    0x133560, 0x133820, 0x133440, 0x133520, 0x133630, 0x1335e0, 0x133680, 0x333030,
+    0x130420, 0x330010, 0x131420, 0x331010, 0x132420, 0x332010, 0x161420, 0x361010,
+    0x163420, 0x363010, 0x165420, 0x365010, 0x169420, 0x369010, 0x16f420, 0x36f010,
+    0x130550, 0x130430, 0x1305d0, 0x330020, 0x131550, 0x131430, 0x1315d0, 0x331020,
+    0x132550, 0x132430, 0x1325d0, 0x332020, 0x161550, 0x161430, 0x1615d0, 0x361020,
+    0x130560, 0x130820, 0x130440, 0x130520, 0x130630, 0x1305e0, 0x130680, 0x330030,
+    0x131560, 0x131820, 0x131440, 0x131520, 0x131630, 0x1315e0, 0x131680, 0x331030,
+    0x132560, 0x132820, 0x132440, 0x132520, 0x132630, 0x1325e0, 0x132680, 0x332030,
+    0x161560, 0x161820, 0x161440, 0x161520, 0x161630, 0x1615e0, 0x161680, 0x361030,
+    0x134560, 0x134820, 0x134440, 0x134520, 0x134630, 0x1345e0, 0x134680, 0x334030,
+    0x135560, 0x135820, 0x135440, 0x135520, 0x135630, 0x1355e0, 0x135680, 0x335030,
+    0x136550, 0x136430, 0x1365d0, 0x336020, 0x137550, 0x137430, 0x1375d0, 0x337020,
+    0x138550, 0x138430, 0x1385d0, 0x338020, 0x139550, 0x139430, 0x1395d0, 0x339020,
+    0x136560, 0x136820, 0x136440, 0x136520, 0x136630, 0x1365e0, 0x136680, 0x336030,
+    0x137560, 0x137820, 0x137440, 0x137520, 0x137630, 0x1375e0, 0x137680, 0x337030,
+    0x138560, 0x138820, 0x138440, 0x138520, 0x138630, 0x1385e0, 0x138680, 0x338030,
+    0x139560, 0x139820, 0x139440, 0x139520, 0x139630, 0x1395e0, 0x139680, 0x339030,
+    0x33d000, 0x341000, 0x35f000, 0x362000, 0x364000, 0x366000, 0x367000, 0x368000,
+    0x36c000, 0x36d000, 0x36e000, 0x370000, 0x372000, 0x375000, 0x610, 0x670,
+    0x16c420, 0x36c010, 0x16d420, 0x36d010, 0x16e420, 0x36e010, 0x170420, 0x370010,
+    0x172420, 0x372010, 0x175420, 0x375010, 0x33a000, 0x342000, 0x343000, 0x344000,
+    0x172550, 0x172430, 0x1725d0, 0x372020, 0x175550, 0x175430, 0x1755d0, 0x375020,
+    0x13a420, 0x33a010, 0x142420, 0x342010, 0x143420, 0x343010, 0x144420, 0x344010,
+    0x13a550, 0x13a430, 0x13a5d0, 0x33a020, 0x142550, 0x142430, 0x1425d0, 0x342020,
+    0x143550, 0x143430, 0x1435d0, 0x343020, 0x144550, 0x144430, 0x1445d0, 0x344020,
+    0x13a560, 0x13a820, 0x13a440, 0x13a520, 0x13a630, 0x13a5e0, 0x13a680, 0x33a030,
+    0x142560, 0x142820, 0x142440, 0x142520, 0x142630, 0x1425e0, 0x142680, 0x342030,
+    0x13c560, 0x13c820, 0x13c440, 0x13c520, 0x13c630, 0x13c5e0, 0x13c680, 0x33c030,
+    0x160560, 0x160820, 0x160440, 0x160520, 0x160630, 0x1605e0, 0x160680, 0x360030,
+    0x13d420, 0x33d010, 0x141420, 0x341010, 0x15f420, 0x35f010, 0x162420, 0x362010,
+    0x164420, 0x364010, 0x166420, 0x366010, 0x167420, 0x367010, 0x168420, 0x368010,
+    0x13d550, 0x13d430, 0x13d5d0, 0x33d020, 0x141550, 0x141430, 0x1415d0, 0x341020,
+    0x15f550, 0x15f430, 0x15f5d0, 0x35f020, 0x162550, 0x162430, 0x1625d0, 0x362020,
+    0x13d560, 0x13d820, 0x13d440, 0x13d520, 0x13d630, 0x13d5e0, 0x13d680, 0x33d030,
+    0x141560, 0x141820, 0x141440, 0x141520, 0x141630, 0x1415e0, 0x141680, 0x341030,
+    0x140560, 0x140820, 0x140440, 0x140520, 0x140630, 0x1405e0, 0x140680, 0x340030,
+    0x15b560, 0x15b820, 0x15b440, 0x15b520, 0x15b630, 0x15b5e0, 0x15b680, 0x35b030,
+    0x143560, 0x143820, 0x143440, 0x143520, 0x143630, 0x1435e0, 0x143680, 0x343030,
+    0x144560, 0x144820, 0x144440, 0x144520, 0x144630, 0x1445e0, 0x144680, 0x344030,
+    0x345000, 0x346000, 0x347000, 0x348000, 0x349000, 0x34a000, 0x34b000, 0x34c000,
+    0x34d000, 0x34e000, 0x34f000, 0x350000, 0x351000, 0x352000, 0x353000, 0x354000,
+    0x145420, 0x345010, 0x146420, 0x346010, 0x147420, 0x347010, 0x148420, 0x348010,
+    0x149420, 0x349010, 0x14a420, 0x34a010, 0x14b420, 0x34b010, 0x14c420, 0x34c010,
+    0x145550, 0x145430, 0x1455d0, 0x345020, 0x146550, 0x146430, 0x1465d0, 0x346020,
+    0x147550, 0x147430, 0x1475d0, 0x347020, 0x148550, 0x148430, 0x1485d0, 0x348020,
+    0x145560, 0x145820, 0x145440, 0x145520, 0x145630, 0x1455e0, 0x145680, 0x345030,
+    0x146560, 0x146820, 0x146440, 0x146520, 0x146630, 0x1465e0, 0x146680, 0x346030,
+    0x147560, 0x147820, 0x147440, 0x147520, 0x147630, 0x1475e0, 0x147680, 0x347030,
+    0x148560, 0x148820, 0x148440, 0x148520, 0x148630, 0x1485e0, 0x148680, 0x348030,
+    0x149550, 0x149430, 0x1495d0, 0x349020, 0x14a550, 0x14a430, 0x14a5d0, 0x34a020,
+    0x14b550, 0x14b430, 0x14b5d0, 0x34b020, 0x14c550, 0x14c430, 0x14c5d0, 0x34c020,
+    0x149560, 0x149820, 0x149440, 0x149520, 0x149630, 0x1495e0, 0x149680, 0x349030,
+    0x14a560, 0x14a820, 0x14a440, 0x14a520, 0x14a630, 0x14a5e0, 0x14a680, 0x34a030,
+    0x14b560, 0x14b820, 0x14b440, 0x14b520, 0x14b630, 0x14b5e0, 0x14b680, 0x34b030,
+    0x14c560, 0x14c820, 0x14c440, 0x14c520, 0x14c630, 0x14c5e0, 0x14c680, 0x34c030,
+    0x14d420, 0x34d010, 0x14e420, 0x34e010, 0x14f420, 0x34f010, 0x150420, 0x350010,
+    0x151420, 0x351010, 0x152420, 0x352010, 0x153420, 0x353010, 0x154420, 0x354010,
+    0x14d550, 0x14d430, 0x14d5d0, 0x34d020, 0x14e550, 0x14e430, 0x14e5d0, 0x34e020,
+    0x14f550, 0x14f430, 0x14f5d0, 0x34f020, 0x150550, 0x150430, 0x1505d0, 0x350020,
+    0x14d560, 0x14d820, 0x14d440, 0x14d520, 0x14d630, 0x14d5e0, 0x14d680, 0x34d030,
+    0x14e560, 0x14e820, 0x14e440, 0x14e520, 0x14e630, 0x14e5e0, 0x14e680, 0x34e030,
+    0x14f560, 0x14f820, 0x14f440, 0x14f520, 0x14f630, 0x14f5e0, 0x14f680, 0x34f030,
+    0x150560, 0x150820, 0x150440, 0x150520, 0x150630, 0x1505e0, 0x150680, 0x350030,
+    0x151550, 0x151430, 0x1515d0, 0x351020, 0x152550, 0x152430, 0x1525d0, 0x352020,
+    0x153550, 0x153430, 0x1535d0, 0x353020, 0x154550, 0x154430, 0x1545d0, 0x354020,
+    0x151560, 0x151820, 0x151440, 0x151520, 0x151630, 0x1515e0, 0x151680, 0x351030,
+    0x152560, 0x152820, 0x152440, 0x152520, 0x152630, 0x1525e0, 0x152680, 0x352030,
+    0x153560, 0x153820, 0x153440, 0x153520, 0x153630, 0x1535e0, 0x153680, 0x353030,
+    0x154560, 0x154820, 0x154440, 0x154520, 0x154630, 0x1545e0, 0x154680, 0x354030,
+    0x155420, 0x355010, 0x156420, 0x356010, 0x157420, 0x357010, 0x159420, 0x359010,
+    0x16a420, 0x36a010, 0x16b420, 0x36b010, 0x171420, 0x371010, 0x176420, 0x376010,
+    0x155550, 0x155430, 0x1555d0, 0x355020, 0x156550, 0x156430, 0x1565d0, 0x356020,
+    0x157550, 0x157430, 0x1575d0, 0x357020, 0x159550, 0x159430, 0x1595d0, 0x359020,
+    0x155560, 0x155820, 0x155440, 0x155520, 0x155630, 0x1555e0, 0x155680, 0x355030,
+    0x156560, 0x156820, 0x156440, 0x156520, 0x156630, 0x1565e0, 0x156680, 0x356030,
+    0x157560, 0x157820, 0x157440, 0x157520, 0x157630, 0x1575e0, 0x157680, 0x357030,
+    0x159560, 0x159820, 0x159440, 0x159520, 0x159630, 0x1595e0, 0x159680, 0x359030,
+    0x158560, 0x158820, 0x158440, 0x158520, 0x158630, 0x1585e0, 0x158680, 0x358030,
+    0x15a560, 0x15a820, 0x15a440, 0x15a520, 0x15a630, 0x15a5e0, 0x15a680, 0x35a030,
+    0x15c420, 0x35c010, 0x1c3420, 0x3c3010, 0x1d0420, 0x3d0010, 0x380000, 0x382000,
+    0x383000, 0x3a2000, 0x3b8000, 0x3c2000, 0x3e0000, 0x3e2000, 0xb10, 0xbc0,
+    0x15c550, 0x15c430, 0x15c5d0, 0x35c020, 0x1c3550, 0x1c3430, 0x1c35d0, 0x3c3020,
+    0x1d0550, 0x1d0430, 0x1d05d0, 0x3d0020, 0x180420, 0x380010, 0x182420, 0x382010,
+    0x15c560, 0x15c820, 0x15c440, 0x15c520, 0x15c630, 0x15c5e0, 0x15c680, 0x35c030,
+    0x1c3560, 0x1c3820, 0x1c3440, 0x1c3520, 0x1c3630, 0x1c35e0, 0x1c3680, 0x3c3030,
+    0x15d560, 0x15d820, 0x15d440, 0x15d520, 0x15d630, 0x15d5e0, 0x15d680, 0x35d030,
+    0x17e560, 0x17e820, 0x17e440, 0x17e520, 0x17e630, 0x17e5e0, 0x17e680, 0x37e030,
+    0x15e560, 0x15e820, 0x15e440, 0x15e520, 0x15e630, 0x15e5e0, 0x15e680, 0x35e030,
+    0x17d560, 0x17d820, 0x17d440, 0x17d520, 0x17d630, 0x17d5e0, 0x17d680, 0x37d030,
+    0x15f560, 0x15f820, 0x15f440, 0x15f520, 0x15f630, 0x15f5e0, 0x15f680, 0x35f030,
+    0x162560, 0x162820, 0x162440, 0x162520, 0x162630, 0x1625e0, 0x162680, 0x362030,
+    0x163550, 0x163430, 0x1635d0, 0x363020, 0x165550, 0x165430, 0x1655d0, 0x365020,
+    0x169550, 0x169430, 0x1695d0, 0x369020, 0x16f550, 0x16f430, 0x16f5d0, 0x36f020,
+    0x163560, 0x163820, 0x163440, 0x163520, 0x163630, 0x1635e0, 0x163680, 0x363030,
+    0x165560, 0x165820, 0x165440, 0x165520, 0x165630, 0x1655e0, 0x165680, 0x365030,
+    0x164550, 0x164430, 0x1645d0, 0x364020, 0x166550, 0x166430, 0x1665d0, 0x366020,
+    0x167550, 0x167430, 0x1675d0, 0x367020, 0x168550, 0x168430, 0x1685d0, 0x368020,
+    0x164560, 0x164820, 0x164440, 0x164520, 0x164630, 0x1645e0, 0x164680, 0x364030,
+    0x166560, 0x166820, 0x166440, 0x166520, 0x166630, 0x1665e0, 0x166680, 0x366030,
+    0x167560, 0x167820, 0x167440, 0x167520, 0x167630, 0x1675e0, 0x167680, 0x367030,
+    0x168560, 0x168820, 0x168440, 0x168520, 0x168630, 0x1685e0, 0x168680, 0x368030,
+    0x169560, 0x169820, 0x169440, 0x169520, 0x169630, 0x1695e0, 0x169680, 0x369030,
+    0x16f560, 0x16f820, 0x16f440, 0x16f520, 0x16f630, 0x16f5e0, 0x16f680, 0x36f030,
+    0x16a550, 0x16a430, 0x16a5d0, 0x36a020, 0x16b550, 0x16b430, 0x16b5d0, 0x36b020,
+    0x171550, 0x171430, 0x1715d0, 0x371020, 0x176550, 0x176430, 0x1765d0, 0x376020,
+    0x16a560, 0x16a820, 0x16a440, 0x16a520, 0x16a630, 0x16a5e0, 0x16a680, 0x36a030,
+    0x16b560, 0x16b820, 0x16b440, 0x16b520, 0x16b630, 0x16b5e0, 0x16b680, 0x36b030,
+    0x16c550, 0x16c430, 0x16c5d0, 0x36c020, 0x16d550, 0x16d430, 0x16d5d0, 0x36d020,
+    0x16e550, 0x16e430, 0x16e5d0, 0x36e020, 0x170550, 0x170430, 0x1705d0, 0x370020,
+    0x16c560, 0x16c820, 0x16c440, 0x16c520, 0x16c630, 0x16c5e0, 0x16c680, 0x36c030,
+    0x16d560, 0x16d820, 0x16d440, 0x16d520, 0x16d630, 0x16d5e0, 0x16d680, 0x36d030,
+    0x16e560, 0x16e820, 0x16e440, 0x16e520, 0x16e630, 0x16e5e0, 0x16e680, 0x36e030,
+    0x170560, 0x170820, 0x170440, 0x170520, 0x170630, 0x1705e0, 0x170680, 0x370030,
+    0x171560, 0x171820, 0x171440, 0x171520, 0x171630, 0x1715e0, 0x171680, 0x371030,
+    0x176560, 0x176820, 0x176440, 0x176520, 0x176630, 0x1765e0, 0x176680, 0x376030,
+    0x172560, 0x172820, 0x172440, 0x172520, 0x172630, 0x1725e0, 0x172680, 0x372030,
+    0x175560, 0x175820, 0x175440, 0x175520, 0x175630, 0x1755e0, 0x175680, 0x375030,
+    0x173560, 0x173820, 0x173440, 0x173520, 0x173630, 0x1735e0, 0x173680, 0x373030,
+    0x174560, 0x174820, 0x174440, 0x174520, 0x174630, 0x1745e0, 0x174680, 0x374030,
+    0x177550, 0x177430, 0x1775d0, 0x377020, 0x178550, 0x178430, 0x1785d0, 0x378020,
+    0x179550, 0x179430, 0x1795d0, 0x379020, 0x17a550, 0x17a430, 0x17a5d0, 0x37a020,
+    0x177560, 0x177820, 0x177440, 0x177520, 0x177630, 0x1775e0, 0x177680, 0x377030,
+    0x178560, 0x178820, 0x178440, 0x178520, 0x178630, 0x1785e0, 0x178680, 0x378030,
+    0x179560, 0x179820, 0x179440, 0x179520, 0x179630, 0x1795e0, 0x179680, 0x379030,
+    0x17a560, 0x17a820, 0x17a440, 0x17a520, 0x17a630, 0x17a5e0, 0x17a680, 0x37a030,
+    0x17f560, 0x17f820, 0x17f440, 0x17f520, 0x17f630, 0x17f5e0, 0x17f680, 0x37f030,
+    0x1dc560, 0x1dc820, 0x1dc440, 0x1dc520, 0x1dc630, 0x1dc5e0, 0x1dc680, 0x3dc030,
+    0x1d0560, 0x1d0820, 0x1d0440, 0x1d0520, 0x1d0630, 0x1d05e0, 0x1d0680, 0x3d0030,
+    0x180550, 0x180430, 0x1805d0, 0x380020, 0x182550, 0x182430, 0x1825d0, 0x382020,
+    0x180560, 0x180820, 0x180440, 0x180520, 0x180630, 0x1805e0, 0x180680, 0x380030,
+    0x182560, 0x182820, 0x182440, 0x182520, 0x182630, 0x1825e0, 0x182680, 0x382030,
+    0x3b0000, 0x3b1000, 0x3b3000, 0x3d1000, 0x3d8000, 0x3d9000, 0x3e3000, 0x3e5000,
+    0x3e6000, 0x9a0, 0x9f0, 0xa00, 0xb40, 0xb60, 0xb80, 0xbe0,
+    0x1e6420, 0x3e6010, 0x381000, 0x384000, 0x385000, 0x386000, 0x388000, 0x392000,
+    0x39a000, 0x39c000, 0x3a0000, 0x3a3000, 0x3a4000, 0x3a9000, 0x3aa000, 0x3ad000,
+    0x1e6550, 0x1e6430, 0x1e65d0, 0x3e6020, 0x181420, 0x381010, 0x184420, 0x384010,
+    0x185420, 0x385010, 0x186420, 0x386010, 0x188420, 0x388010, 0x192420, 0x392010,
+    0x1e6560, 0x1e6820, 0x1e6440, 0x1e6520, 0x1e6630, 0x1e65e0, 0x1e6680, 0x3e6030,
+    0x181550, 0x181430, 0x1815d0, 0x381020, 0x184550, 0x184430, 0x1845d0, 0x384020,
+    0x181560, 0x181820, 0x181440, 0x181520, 0x181630, 0x1815e0, 0x181680, 0x381030,
+    0x184560, 0x184820, 0x184440, 0x184520, 0x184630, 0x1845e0, 0x184680, 0x384030,
+    0x183420, 0x383010, 0x1a2420, 0x3a2010, 0x1b8420, 0x3b8010, 0x1c2420, 0x3c2010,
+    0x1e0420, 0x3e0010, 0x1e2420, 0x3e2010, 0x399000, 0x3a1000, 0x3a7000, 0x3ac000,
+    0x183550, 0x183430, 0x1835d0, 0x383020, 0x1a2550, 0x1a2430, 0x1a25d0, 0x3a2020,
+    0x1b8550, 0x1b8430, 0x1b85d0, 0x3b8020, 0x1c2550, 0x1c2430, 0x1c25d0, 0x3c2020,
+    0x183560, 0x183820, 0x183440, 0x183520, 0x183630, 0x1835e0, 0x183680, 0x383030,
+    0x1a2560, 0x1a2820, 0x1a2440, 0x1a2520, 0x1a2630, 0x1a25e0, 0x1a2680, 0x3a2030,
+    0x185550, 0x185430, 0x1855d0, 0x385020, 0x186550, 0x186430, 0x1865d0, 0x386020,
+    0x188550, 0x188430, 0x1885d0, 0x388020, 0x192550, 0x192430, 0x1925d0, 0x392020,
+    0x185560, 0x185820, 0x185440, 0x185520, 0x185630, 0x1855e0, 0x185680, 0x385030,
+    0x186560, 0x186820, 0x186440, 0x186520, 0x186630, 0x1865e0, 0x186680, 0x386030,
+    0x188560, 0x188820, 0x188440, 0x188520, 0x188630, 0x1885e0, 0x188680, 0x388030,
+    0x192560, 0x192820, 0x192440, 0x192520, 0x192630, 0x1925e0, 0x192680, 0x392030,
+    0x189560, 0x189820, 0x189440, 0x189520, 0x189630, 0x1895e0, 0x189680, 0x389030,
+    0x18a560, 0x18a820, 0x18a440, 0x18a520, 0x18a630, 0x18a5e0, 0x18a680, 0x38a030,
+    0x18b550, 0x18b430, 0x18b5d0, 0x38b020, 0x18c550, 0x18c430, 0x18c5d0, 0x38c020,
+    0x18d550, 0x18d430, 0x18d5d0, 0x38d020, 0x18f550, 0x18f430, 0x18f5d0, 0x38f020,
+    0x18b560, 0x18b820, 0x18b440, 0x18b520, 0x18b630, 0x18b5e0, 0x18b680, 0x38b030,
+    0x18c560, 0x18c820, 0x18c440, 0x18c520, 0x18c630, 0x18c5e0, 0x18c680, 0x38c030,
+    0x18d560, 0x18d820, 0x18d440, 0x18d520, 0x18d630, 0x18d5e0, 0x18d680, 0x38d030,
+    0x18f560, 0x18f820, 0x18f440, 0x18f520, 0x18f630, 0x18f5e0, 0x18f680, 0x38f030,
+    0x190550, 0x190430, 0x1905d0, 0x390020, 0x191550, 0x191430, 0x1915d0, 0x391020,
+    0x194550, 0x194430, 0x1945d0, 0x394020, 0x19f550, 0x19f430, 0x19f5d0, 0x39f020,
+    0x190560, 0x190820, 0x190440, 0x190520, 0x190630, 0x1905e0, 0x190680, 0x390030,
+    0x191560, 0x191820, 0x191440, 0x191520, 0x191630, 0x1915e0, 0x191680, 0x391030,
+    0x393000, 0x395000, 0x396000, 0x397000, 0x398000, 0x39b000, 0x39d000, 0x39e000,
+    0x3a5000, 0x3a6000, 0x3a8000, 0x3ae000, 0x3af000, 0x3b4000, 0x3b6000, 0x3b7000,
+    0x193420, 0x393010, 0x195420, 0x395010, 0x196420, 0x396010, 0x197420, 0x397010,
+    0x198420, 0x398010, 0x19b420, 0x39b010, 0x19d420, 0x39d010, 0x19e420, 0x39e010,
+    0x193550, 0x193430, 0x1935d0, 0x393020, 0x195550, 0x195430, 0x1955d0, 0x395020,
+    0x196550, 0x196430, 0x1965d0, 0x396020, 0x197550, 0x197430, 0x1975d0, 0x397020,
+    0x193560, 0x193820, 0x193440, 0x193520, 0x193630, 0x1935e0, 0x193680, 0x393030,
+    0x195560, 0x195820, 0x195440, 0x195520, 0x195630, 0x1955e0, 0x195680, 0x395030,
+    0x194560, 0x194820, 0x194440, 0x194520, 0x194630, 0x1945e0, 0x194680, 0x394030,
+    0x19f560, 0x19f820, 0x19f440, 0x19f520, 0x19f630, 0x19f5e0, 0x19f680, 0x39f030,
+    0x196560, 0x196820, 0x196440, 0x196520, 0x196630, 0x1965e0, 0x196680, 0x396030,
+    0x197560, 0x197820, 0x197440, 0x197520, 0x197630, 0x1975e0, 0x197680, 0x397030,
+    0x198550, 0x198430, 0x1985d0, 0x398020, 0x19b550, 0x19b430, 0x19b5d0, 0x39b020,
+    0x19d550, 0x19d430, 0x19d5d0, 0x39d020, 0x19e550, 0x19e430, 0x19e5d0, 0x39e020,
+    0x198560, 0x198820, 0x198440, 0x198520, 0x198630, 0x1985e0, 0x198680, 0x398030,
+    0x19b560, 0x19b820, 0x19b440, 0x19b520, 0x19b630, 0x19b5e0, 0x19b680, 0x39b030,
+    0x1e0550, 0x1e0430, 0x1e05d0, 0x3e0020, 0x1e2550, 0x1e2430, 0x1e25d0, 0x3e2020,
+    0x199420, 0x399010, 0x1a1420, 0x3a1010, 0x1a7420, 0x3a7010, 0x1ac420, 0x3ac010,
+    0x199550, 0x199430, 0x1995d0, 0x399020, 0x1a1550, 0x1a1430, 0x1a15d0, 0x3a1020,
+    0x1a7550, 0x1a7430, 0x1a75d0, 0x3a7020, 0x1ac550, 0x1ac430, 0x1ac5d0, 0x3ac020,
+    0x199560, 0x199820, 0x199440, 0x199520, 0x199630, 0x1995e0, 0x199680, 0x399030,
+    0x1a1560, 0x1a1820, 0x1a1440, 0x1a1520, 0x1a1630, 0x1a15e0, 0x1a1680, 0x3a1030,
+    0x19a420, 0x39a010, 0x19c420, 0x39c010, 0x1a0420, 0x3a0010, 0x1a3420, 0x3a3010,
+    0x1a4420, 0x3a4010, 0x1a9420, 0x3a9010, 0x1aa420, 0x3aa010, 0x1ad420, 0x3ad010,
+    0x19a550, 0x19a430, 0x19a5d0, 0x39a020, 0x19c550, 0x19c430, 0x19c5d0, 0x39c020,
+    0x1a0550, 0x1a0430, 0x1a05d0, 0x3a0020, 0x1a3550, 0x1a3430, 0x1a35d0, 0x3a3020,
+    0x19a560, 0x19a820, 0x19a440, 0x19a520, 0x19a630, 0x19a5e0, 0x19a680, 0x39a030,
+    0x19c560, 0x19c820, 0x19c440, 0x19c520, 0x19c630, 0x19c5e0, 0x19c680, 0x39c030,
+    0x19d560, 0x19d820, 0x19d440, 0x19d520, 0x19d630, 0x19d5e0, 0x19d680, 0x39d030,
+    0x19e560, 0x19e820, 0x19e440, 0x19e520, 0x19e630, 0x19e5e0, 0x19e680, 0x39e030,
+    0x1a0560, 0x1a0820, 0x1a0440, 0x1a0520, 0x1a0630, 0x1a05e0, 0x1a0680, 0x3a0030,
+    0x1a3560, 0x1a3820, 0x1a3440, 0x1a3520, 0x1a3630, 0x1a35e0, 0x1a3680, 0x3a3030,
+    0x1a4550, 0x1a4430, 0x1a45d0, 0x3a4020, 0x1a9550, 0x1a9430, 0x1a95d0, 0x3a9020,
+    0x1aa550, 0x1aa430, 0x1aa5d0, 0x3aa020, 0x1ad550, 0x1ad430, 0x1ad5d0, 0x3ad020,
+    0x1a4560, 0x1a4820, 0x1a4440, 0x1a4520, 0x1a4630, 0x1a45e0, 0x1a4680, 0x3a4030,
+    0x1a9560, 0x1a9820, 0x1a9440, 0x1a9520, 0x1a9630, 0x1a95e0, 0x1a9680, 0x3a9030,
+    0x1a5420, 0x3a5010, 0x1a6420, 0x3a6010, 0x1a8420, 0x3a8010, 0x1ae420, 0x3ae010,
+    0x1af420, 0x3af010, 0x1b4420, 0x3b4010, 0x1b6420, 0x3b6010, 0x1b7420, 0x3b7010,
+    0x1a5550, 0x1a5430, 0x1a55d0, 0x3a5020, 0x1a6550, 0x1a6430, 0x1a65d0, 0x3a6020,
+    0x1a8550, 0x1a8430, 0x1a85d0, 0x3a8020, 0x1ae550, 0x1ae430, 0x1ae5d0, 0x3ae020,
+    0x1a5560, 0x1a5820, 0x1a5440, 0x1a5520, 0x1a5630, 0x1a55e0, 0x1a5680, 0x3a5030,
+    0x1a6560, 0x1a6820, 0x1a6440, 0x1a6520, 0x1a6630, 0x1a65e0, 0x1a6680, 0x3a6030,
+    0x1a7560, 0x1a7820, 0x1a7440, 0x1a7520, 0x1a7630, 0x1a75e0, 0x1a7680, 0x3a7030,
+    0x1ac560, 0x1ac820, 0x1ac440, 0x1ac520, 0x1ac630, 0x1ac5e0, 0x1ac680, 0x3ac030,
+    0x1a8560, 0x1a8820, 0x1a8440, 0x1a8520, 0x1a8630, 0x1a85e0, 0x1a8680, 0x3a8030,
+    0x1ae560, 0x1ae820, 0x1ae440, 0x1ae520, 0x1ae630, 0x1ae5e0, 0x1ae680, 0x3ae030,
+    0x1aa560, 0x1aa820, 0x1aa440, 0x1aa520, 0x1aa630, 0x1aa5e0, 0x1aa680, 0x3aa030,
+    0x1ad560, 0x1ad820, 0x1ad440, 0x1ad520, 0x1ad630, 0x1ad5e0, 0x1ad680, 0x3ad030,
+    0x1ab420, 0x3ab010, 0x1ce420, 0x3ce010, 0x1d7420, 0x3d7010, 0x1e1420, 0x3e1010,
+    0x1ec420, 0x3ec010, 0x1ed420, 0x3ed010, 0x3c7000, 0x3cf000, 0x3ea000, 0x3eb000,
+    0x1ab550, 0x1ab430, 0x1ab5d0, 0x3ab020, 0x1ce550, 0x1ce430, 0x1ce5d0, 0x3ce020,
+    0x1d7550, 0x1d7430, 0x1d75d0, 0x3d7020, 0x1e1550, 0x1e1430, 0x1e15d0, 0x3e1020,
+    0x1ab560, 0x1ab820, 0x1ab440, 0x1ab520, 0x1ab630, 0x1ab5e0, 0x1ab680, 0x3ab030,
+    0x1ce560, 0x1ce820, 0x1ce440, 0x1ce520, 0x1ce630, 0x1ce5e0, 0x1ce680, 0x3ce030,
+    0x1af550, 0x1af430, 0x1af5d0, 0x3af020, 0x1b4550, 0x1b4430, 0x1b45d0, 0x3b4020,
+    0x1b6550, 0x1b6430, 0x1b65d0, 0x3b6020, 0x1b7550, 0x1b7430, 0x1b75d0, 0x3b7020,
+    0x1af560, 0x1af820, 0x1af440, 0x1af520, 0x1af630, 0x1af5e0, 0x1af680, 0x3af030,
+    0x1b4560, 0x1b4820, 0x1b4440, 0x1b4520, 0x1b4630, 0x1b45e0, 0x1b4680, 0x3b4030,
+    0x1b0420, 0x3b0010, 0x1b1420, 0x3b1010, 0x1b3420, 0x3b3010, 0x1d1420, 0x3d1010,
+    0x1d8420, 0x3d8010, 0x1d9420, 0x3d9010, 0x1e3420, 0x3e3010, 0x1e5420, 0x3e5010,
+    0x1b0550, 0x1b0430, 0x1b05d0, 0x3b0020, 0x1b1550, 0x1b1430, 0x1b15d0, 0x3b1020,
+    0x1b3550, 0x1b3430, 0x1b35d0, 0x3b3020, 0x1d1550, 0x1d1430, 0x1d15d0, 0x3d1020,
+    0x1b0560, 0x1b0820, 0x1b0440, 0x1b0520, 0x1b0630, 0x1b05e0, 0x1b0680, 0x3b0030,
+    0x1b1560, 0x1b1820, 0x1b1440, 0x1b1520, 0x1b1630, 0x1b15e0, 0x1b1680, 0x3b1030,
+    0x1b2420, 0x3b2010, 0x1b5420, 0x3b5010, 0x1b9420, 0x3b9010, 0x1ba420, 0x3ba010,
+    0x1bb420, 0x3bb010, 0x1bd420, 0x3bd010, 0x1be420, 0x3be010, 0x1c4420, 0x3c4010,
+    0x1b2550, 0x1b2430, 0x1b25d0, 0x3b2020, 0x1b5550, 0x1b5430, 0x1b55d0, 0x3b5020,
+    0x1b9550, 0x1b9430, 0x1b95d0, 0x3b9020, 0x1ba550, 0x1ba430, 0x1ba5d0, 0x3ba020,
+    0x1b2560, 0x1b2820, 0x1b2440, 0x1b2520, 0x1b2630, 0x1b25e0, 0x1b2680, 0x3b2030,
+    0x1b5560, 0x1b5820, 0x1b5440, 0x1b5520, 0x1b5630, 0x1b55e0, 0x1b5680, 0x3b5030,
+    0x1b3560, 0x1b3820, 0x1b3440, 0x1b3520, 0x1b3630, 0x1b35e0, 0x1b3680, 0x3b3030,
+    0x1d1560, 0x1d1820, 0x1d1440, 0x1d1520, 0x1d1630, 0x1d15e0, 0x1d1680, 0x3d1030,
+    0x1b6560, 0x1b6820, 0x1b6440, 0x1b6520, 0x1b6630, 0x1b65e0, 0x1b6680, 0x3b6030,
+    0x1b7560, 0x1b7820, 0x1b7440, 0x1b7520, 0x1b7630, 0x1b75e0, 0x1b7680, 0x3b7030,
+    0x1b8560, 0x1b8820, 0x1b8440, 0x1b8520, 0x1b8630, 0x1b85e0, 0x1b8680, 0x3b8030,
+    0x1c2560, 0x1c2820, 0x1c2440, 0x1c2520, 0x1c2630, 0x1c25e0, 0x1c2680, 0x3c2030,
+    0x1b9560, 0x1b9820, 0x1b9440, 0x1b9520, 0x1b9630, 0x1b95e0, 0x1b9680, 0x3b9030,
+    0x1ba560, 0x1ba820, 0x1ba440, 0x1ba520, 0x1ba630, 0x1ba5e0, 0x1ba680, 0x3ba030,
+    0x1bb550, 0x1bb430, 0x1bb5d0, 0x3bb020, 0x1bd550, 0x1bd430, 0x1bd5d0, 0x3bd020,
+    0x1be550, 0x1be430, 0x1be5d0, 0x3be020, 0x1c4550, 0x1c4430, 0x1c45d0, 0x3c4020,
+    0x1bb560, 0x1bb820, 0x1bb440, 0x1bb520, 0x1bb630, 0x1bb5e0, 0x1bb680, 0x3bb030,
+    0x1bd560, 0x1bd820, 0x1bd440, 0x1bd520, 0x1bd630, 0x1bd5e0, 0x1bd680, 0x3bd030,
+    0x1bc550, 0x1bc430, 0x1bc5d0, 0x3bc020, 0x1bf550, 0x1bf430, 0x1bf5d0, 0x3bf020,
+    0x1c5550, 0x1c5430, 0x1c55d0, 0x3c5020, 0x1e7550, 0x1e7430, 0x1e75d0, 0x3e7020,
+    0x1bc560, 0x1bc820, 0x1bc440, 0x1bc520, 0x1bc630, 0x1bc5e0, 0x1bc680, 0x3bc030,
+    0x1bf560, 0x1bf820, 0x1bf440, 0x1bf520, 0x1bf630, 0x1bf5e0, 0x1bf680, 0x3bf030,
+    0x1be560, 0x1be820, 0x1be440, 0x1be520, 0x1be630, 0x1be5e0, 0x1be680, 0x3be030,
+    0x1c4560, 0x1c4820, 0x1c4440, 0x1c4520, 0x1c4630, 0x1c45e0, 0x1c4680, 0x3c4030,
+    0x3c0000, 0x3c1000, 0x3c8000, 0x3c9000, 0x3ca000, 0x3cd000, 0x3d2000, 0x3d5000,
+    0x3da000, 0x3db000, 0x3ee000, 0x3f0000, 0x3f2000, 0x3f3000, 0x3ff000, 0xe30,
+    0x1c0420, 0x3c0010, 0x1c1420, 0x3c1010, 0x1c8420, 0x3c8010, 0x1c9420, 0x3c9010,
+    0x1ca420, 0x3ca010, 0x1cd420, 0x3cd010, 0x1d2420, 0x3d2010, 0x1d5420, 0x3d5010,
+    0x1c0550, 0x1c0430, 0x1c05d0, 0x3c0020, 0x1c1550, 0x1c1430, 0x1c15d0, 0x3c1020,
+    0x1c8550, 0x1c8430, 0x1c85d0, 0x3c8020, 0x1c9550, 0x1c9430, 0x1c95d0, 0x3c9020,
+    0x1c0560, 0x1c0820, 0x1c0440, 0x1c0520, 0x1c0630, 0x1c05e0, 0x1c0680, 0x3c0030,
+    0x1c1560, 0x1c1820, 0x1c1440, 0x1c1520, 0x1c1630, 0x1c15e0, 0x1c1680, 0x3c1030,
+    0x1c5560, 0x1c5820, 0x1c5440, 0x1c5520, 0x1c5630, 0x1c55e0, 0x1c5680, 0x3c5030,
+    0x1e7560, 0x1e7820, 0x1e7440, 0x1e7520, 0x1e7630, 0x1e75e0, 0x1e7680, 0x3e7030,
+    0x1c6550, 0x1c6430, 0x1c65d0, 0x3c6020, 0x1e4550, 0x1e4430, 0x1e45d0, 0x3e4020,
+    0x1e8550, 0x1e8430, 0x1e85d0, 0x3e8020, 0x1e9550, 0x1e9430, 0x1e95d0, 0x3e9020,
+    0x1c6560, 0x1c6820, 0x1c6440, 0x1c6520, 0x1c6630, 0x1c65e0, 0x1c6680, 0x3c6030,
+    0x1e4560, 0x1e4820, 0x1e4440, 0x1e4520, 0x1e4630, 0x1e45e0, 0x1e4680, 0x3e4030,
+    0x1ec550, 0x1ec430, 0x1ec5d0, 0x3ec020, 0x1ed550, 0x1ed430, 0x1ed5d0, 0x3ed020,
+    0x1c7420, 0x3c7010, 0x1cf420, 0x3cf010, 0x1ea420, 0x3ea010, 0x1eb420, 0x3eb010,
+    0x1c7550, 0x1c7430, 0x1c75d0, 0x3c7020, 0x1cf550, 0x1cf430, 0x1cf5d0, 0x3cf020,
+    0x1ea550, 0x1ea430, 0x1ea5d0, 0x3ea020, 0x1eb550, 0x1eb430, 0x1eb5d0, 0x3eb020,
+    0x1c7560, 0x1c7820, 0x1c7440, 0x1c7520, 0x1c7630, 0x1c75e0, 0x1c7680, 0x3c7030,
+    0x1cf560, 0x1cf820, 0x1cf440, 0x1cf520, 0x1cf630, 0x1cf5e0, 0x1cf680, 0x3cf030,
+    0x1c8560, 0x1c8820, 0x1c8440, 0x1c8520, 0x1c8630, 0x1c85e0, 0x1c8680, 0x3c8030,
+    0x1c9560, 0x1c9820, 0x1c9440, 0x1c9520, 0x1c9630, 0x1c95e0, 0x1c9680, 0x3c9030,
+    0x1ca550, 0x1ca430, 0x1ca5d0, 0x3ca020, 0x1cd550, 0x1cd430, 0x1cd5d0, 0x3cd020,
+    0x1d2550, 0x1d2430, 0x1d25d0, 0x3d2020, 0x1d5550, 0x1d5430, 0x1d55d0, 0x3d5020,
+    0x1ca560, 0x1ca820, 0x1ca440, 0x1ca520, 0x1ca630, 0x1ca5e0, 0x1ca680, 0x3ca030,
+    0x1cd560, 0x1cd820, 0x1cd440, 0x1cd520, 0x1cd630, 0x1cd5e0, 0x1cd680, 0x3cd030,
+    0x1da420, 0x3da010, 0x1db420, 0x3db010, 0x1ee420, 0x3ee010, 0x1f0420, 0x3f0010,
+    0x1f2420, 0x3f2010, 0x1f3420, 0x3f3010, 0x1ff420, 0x3ff010, 0x3cb000, 0x3cc000,
+    0x1f2550, 0x1f2430, 0x1f25d0, 0x3f2020, 0x1f3550, 0x1f3430, 0x1f35d0, 0x3f3020,
+    0x1ff550, 0x1ff430, 0x1ff5d0, 0x3ff020, 0x1cb420, 0x3cb010, 0x1cc420, 0x3cc010,
+    0x1ff560, 0x1ff820, 0x1ff440, 0x1ff520, 0x1ff630, 0x1ff5e0, 0x1ff680, 0x3ff030,
+    0x1cb550, 0x1cb430, 0x1cb5d0, 0x3cb020, 0x1cc550, 0x1cc430, 0x1cc5d0, 0x3cc020,
+    0x1cb560, 0x1cb820, 0x1cb440, 0x1cb520, 0x1cb630, 0x1cb5e0, 0x1cb680, 0x3cb030,
+    0x1cc560, 0x1cc820, 0x1cc440, 0x1cc520, 0x1cc630, 0x1cc5e0, 0x1cc680, 0x3cc030,
+    0x1d2560, 0x1d2820, 0x1d2440, 0x1d2520, 0x1d2630, 0x1d25e0, 0x1d2680, 0x3d2030,
+    0x1d5560, 0x1d5820, 0x1d5440, 0x1d5520, 0x1d5630, 0x1d55e0, 0x1d5680, 0x3d5030,
+    0x3d3000, 0x3d4000, 0x3d6000, 0x3dd000, 0x3de000, 0x3df000, 0x3f1000, 0x3f4000,
+    0x3f5000, 0x3f6000, 0x3f7000, 0x3f8000, 0x3fa000, 0x3fb000, 0x3fc000, 0x3fd000,
+    0x1d3420, 0x3d3010, 0x1d4420, 0x3d4010, 0x1d6420, 0x3d6010, 0x1dd420, 0x3dd010,
+    0x1de420, 0x3de010, 0x1df420, 0x3df010, 0x1f1420, 0x3f1010, 0x1f4420, 0x3f4010,
+    0x1d3550, 0x1d3430, 0x1d35d0, 0x3d3020, 0x1d4550, 0x1d4430, 0x1d45d0, 0x3d4020,
+    0x1d6550, 0x1d6430, 0x1d65d0, 0x3d6020, 0x1dd550, 0x1dd430, 0x1dd5d0, 0x3dd020,
+    0x1d3560, 0x1d3820, 0x1d3440, 0x1d3520, 0x1d3630, 0x1d35e0, 0x1d3680, 0x3d3030,
+    0x1d4560, 0x1d4820, 0x1d4440, 0x1d4520, 0x1d4630, 0x1d45e0, 0x1d4680, 0x3d4030,
+    0x1d6560, 0x1d6820, 0x1d6440, 0x1d6520, 0x1d6630, 0x1d65e0, 0x1d6680, 0x3d6030,
+    0x1dd560, 0x1dd820, 0x1dd440, 0x1dd520, 0x1dd630, 0x1dd5e0, 0x1dd680, 0x3dd030,
+    0x1d7560, 0x1d7820, 0x1d7440, 0x1d7520, 0x1d7630, 0x1d75e0, 0x1d7680, 0x3d7030,
+    0x1e1560, 0x1e1820, 0x1e1440, 0x1e1520, 0x1e1630, 0x1e15e0, 0x1e1680, 0x3e1030,
+    0x1d8550, 0x1d8430, 0x1d85d0, 0x3d8020, 0x1d9550, 0x1d9430, 0x1d95d0, 0x3d9020,
+    0x1e3550, 0x1e3430, 0x1e35d0, 0x3e3020, 0x1e5550, 0x1e5430, 0x1e55d0, 0x3e5020,
+    0x1d8560, 0x1d8820, 0x1d8440, 0x1d8520, 0x1d8630, 0x1d85e0, 0x1d8680, 0x3d8030,
+    0x1d9560, 0x1d9820, 0x1d9440, 0x1d9520, 0x1d9630, 0x1d95e0, 0x1d9680, 0x3d9030,
+    0x1da550, 0x1da430, 0x1da5d0, 0x3da020, 0x1db550, 0x1db430, 0x1db5d0, 0x3db020,
+    0x1ee550, 0x1ee430, 0x1ee5d0, 0x3ee020, 0x1f0550, 0x1f0430, 0x1f05d0, 0x3f0020,
+    0x1da560, 0x1da820, 0x1da440, 0x1da520, 0x1da630, 0x1da5e0, 0x1da680, 0x3da030,
+    0x1db560, 0x1db820, 0x1db440, 0x1db520, 0x1db630, 0x1db5e0, 0x1db680, 0x3db030,
+    0x1de550, 0x1de430, 0x1de5d0, 0x3de020, 0x1df550, 0x1df430, 0x1df5d0, 0x3df020,
+    0x1f1550, 0x1f1430, 0x1f15d0, 0x3f1020, 0x1f4550, 0x1f4430, 0x1f45d0, 0x3f4020,
+    0x1de560, 0x1de820, 0x1de440, 0x1de520, 0x1de630, 0x1de5e0, 0x1de680, 0x3de030,
+    0x1df560, 0x1df820, 0x1df440, 0x1df520, 0x1df630, 0x1df5e0, 0x1df680, 0x3df030,
+    0x1e0560, 0x1e0820, 0x1e0440, 0x1e0520, 0x1e0630, 0x1e05e0, 0x1e0680, 0x3e0030,
+    0x1e2560, 0x1e2820, 0x1e2440, 0x1e2520, 0x1e2630, 0x1e25e0, 0x1e2680, 0x3e2030,
+    0x1e3560, 0x1e3820, 0x1e3440, 0x1e3520, 0x1e3630, 0x1e35e0, 0x1e3680, 0x3e3030,
+    0x1e5560, 0x1e5820, 0x1e5440, 0x1e5520, 0x1e5630, 0x1e55e0, 0x1e5680, 0x3e5030,
+    0x1e8560, 0x1e8820, 0x1e8440, 0x1e8520, 0x1e8630, 0x1e85e0, 0x1e8680, 0x3e8030,
+    0x1e9560, 0x1e9820, 0x1e9440, 0x1e9520, 0x1e9630, 0x1e95e0, 0x1e9680, 0x3e9030,
+    0x1ea560, 0x1ea820, 0x1ea440, 0x1ea520, 0x1ea630, 0x1ea5e0, 0x1ea680, 0x3ea030,
+    0x1eb560, 0x1eb820, 0x1eb440, 0x1eb520, 0x1eb630, 0x1eb5e0, 0x1eb680, 0x3eb030,
+    0x1ec560, 0x1ec820, 0x1ec440, 0x1ec520, 0x1ec630, 0x1ec5e0, 0x1ec680, 0x3ec030,
+    0x1ed560, 0x1ed820, 0x1ed440, 0x1ed520, 0x1ed630, 0x1ed5e0, 0x1ed680, 0x3ed030,
+    0x1ee560, 0x1ee820, 0x1ee440, 0x1ee520, 0x1ee630, 0x1ee5e0, 0x1ee680, 0x3ee030,
+    0x1f0560, 0x1f0820, 0x1f0440, 0x1f0520, 0x1f0630, 0x1f05e0, 0x1f0680, 0x3f0030,
+    0x1f1560, 0x1f1820, 0x1f1440, 0x1f1520, 0x1f1630, 0x1f15e0, 0x1f1680, 0x3f1030,
+    0x1f4560, 0x1f4820, 0x1f4440, 0x1f4520, 0x1f4630, 0x1f45e0, 0x1f4680, 0x3f4030,
+    0x1f2560, 0x1f2820, 0x1f2440, 0x1f2520, 0x1f2630, 0x1f25e0, 0x1f2680, 0x3f2030,
+    0x1f3560, 0x1f3820, 0x1f3440, 0x1f3520, 0x1f3630, 0x1f35e0, 0x1f3680, 0x3f3030,
+    0x1f5420, 0x3f5010, 0x1f6420, 0x3f6010, 0x1f7420, 0x3f7010, 0x1f8420, 0x3f8010,
+    0x1fa420, 0x3fa010, 0x1fb420, 0x3fb010, 0x1fc420, 0x3fc010, 0x1fd420, 0x3fd010,
+    0x1f5550, 0x1f5430, 0x1f55d0, 0x3f5020, 0x1f6550, 0x1f6430, 0x1f65d0, 0x3f6020,
+    0x1f7550, 0x1f7430, 0x1f75d0, 0x3f7020, 0x1f8550, 0x1f8430, 0x1f85d0, 0x3f8020,
+    0x1f5560, 0x1f5820, 0x1f5440, 0x1f5520, 0x1f5630, 0x1f55e0, 0x1f5680, 0x3f5030,
+    0x1f6560, 0x1f6820, 0x1f6440, 0x1f6520, 0x1f6630, 0x1f65e0, 0x1f6680, 0x3f6030,
+    0x1f7560, 0x1f7820, 0x1f7440, 0x1f7520, 0x1f7630, 0x1f75e0, 0x1f7680, 0x3f7030,
+    0x1f8560, 0x1f8820, 0x1f8440, 0x1f8520, 0x1f8630, 0x1f85e0, 0x1f8680, 0x3f8030,
+    0x1fa550, 0x1fa430, 0x1fa5d0, 0x3fa020, 0x1fb550, 0x1fb430, 0x1fb5d0, 0x3fb020,
+    0x1fc550, 0x1fc430, 0x1fc5d0, 0x3fc020, 0x1fd550, 0x1fd430, 0x1fd5d0, 0x3fd020,
+    0x1fa560, 0x1fa820, 0x1fa440, 0x1fa520, 0x1fa630, 0x1fa5e0, 0x1fa680, 0x3fa030,
+    0x1fb560, 0x1fb820, 0x1fb440, 0x1fb520, 0x1fb630, 0x1fb5e0, 0x1fb680, 0x3fb030,
+    0x1fc560, 0x1fc820, 0x1fc440, 0x1fc520, 0x1fc630, 0x1fc5e0, 0x1fc680, 0x3fc030,
+    0x1fd560, 0x1fd820, 0x1fd440, 0x1fd520, 0x1fd630, 0x1fd5e0, 0x1fd680, 0x3fd030,
+)
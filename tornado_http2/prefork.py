@@ -0,0 +1,335 @@
+"""Multi-process serving with connection-count balancing.
+
+HTTP/2 connections are few, long-lived and multiplex many requests,
+so leaving it to the kernel to hand each new connection to whichever
+process calls ``accept()`` first can pile most of the load onto one
+worker. `WorkerPool` forks worker processes that share a set of
+pre-bound listening sockets. Each worker publishes its connection
+counts in a small shared-memory table and stops accepting while it
+has more connections than the least loaded worker; the parent process
+reads the same table to report aggregate statistics.
+
+Usage::
+
+    sockets = tornado.netutil.bind_sockets(8443)
+    pool = WorkerPool(sockets, num_workers=4)
+    pool.start()  # Only returns in the worker processes.
+    server = tornado_http2.server.Server(app, ssl_options=...)
+    pool.add_server(server)
+    IOLoop.current().start()
+"""
+import binascii
+import collections
+import errno
+import fcntl
+import functools
+import mmap
+import os
+import random
+import socket
+import ssl
+import struct
+import sys
+import time
+
+from tornado import gen
+from tornado.ioloop import IOLoop, PeriodicCallback
+from tornado.iostream import IOStream, SSLIOStream
+from tornado.log import app_log, gen_log
+from tornado.netutil import ssl_wrap_socket
+from tornado.process import cpu_count
+from tornado.util import errno_from_exception
+
+WorkerStats = collections.namedtuple('WorkerStats', [
+    'worker_id', 'pid', 'accepted', 'active', 'http2_active', 'paused'])
+
+# One slot per worker: pid, accepted, active, http2_active, paused.
+# A pid of zero marks a slot whose worker is not running.
+_SLOT = struct.Struct('=5q')
+
+# The most connections taken from a listening socket per wakeup.
+_ACCEPT_BATCH = 128
+
+_ERRNO_WOULDBLOCK = (errno.EWOULDBLOCK, errno.EAGAIN)
+
+
+def _reseed_random():
+    # Don't let the workers share the parent's random sequence.
+    random.seed(int(binascii.hexlify(os.urandom(16)), 16))
+
+
+def _set_close_exec(fd):
+    flags = fcntl.fcntl(fd, fcntl.F_GETFD)
+    fcntl.fcntl(fd, fcntl.F_SETFD, flags | fcntl.FD_CLOEXEC)
+
+
+class _CountedStreamMixin(object):
+    # Calls ``pool_close_callback`` once, however the stream is closed.
+    # `set_close_callback` is left to the connection using the stream.
+    pool_close_callback = None
+
+    def close(self, exc_info=False):
+        super(_CountedStreamMixin, self).close(exc_info)
+        callback, self.pool_close_callback = self.pool_close_callback, None
+        if callback is not None:
+            callback()
+
+
+class _CountedIOStream(_CountedStreamMixin, IOStream):
+    pass
+
+
+class _CountedSSLIOStream(_CountedStreamMixin, SSLIOStream):
+    pass
+
+
+class WorkerPool(object):
+    """Forks ``num_workers`` processes serving ``sockets``.
+
+    ``num_workers`` defaults to the number of CPUs. A worker stops
+    accepting new connections while it has ``max_imbalance`` or more
+    connections than the least loaded worker, and re-checks the
+    other workers every ``sync_interval`` seconds.
+
+    As with `tornado.process.fork_processes`, no IOLoop may be created
+    before `start` is called, and ``autoreload`` must not be used.
+    """
+    def __init__(self, sockets, num_workers=None, max_imbalance=1,
+                 sync_interval=0.1, max_restarts=100):
+        if num_workers is None or num_workers <= 0:
+            num_workers = cpu_count()
+        if max_imbalance < 1:
+            raise ValueError("max_imbalance must be at least 1")
+        self.sockets = list(sockets)
+        self.num_workers = num_workers
+        self.max_imbalance = max_imbalance
+        self.sync_interval = sync_interval
+        self.max_restarts = max_restarts
+        self.worker_id = None
+        # An anonymous mapping is shared with the children across fork().
+        self._table = mmap.mmap(-1, _SLOT.size * num_workers)
+        self._server = None
+        self._accepting = False
+        self._accepted = 0
+        self._active = 0
+        self._http2_active = 0
+        self._sync_callback = None
+
+    def start(self, stats_callback=None, stats_interval=10):
+        """Forks the worker processes.
+
+        In each worker, returns its id, a number between 0 and
+        ``num_workers - 1``. The parent process stays here,
+        restarting workers that exit abnormally (with the same id, up
+        to ``max_restarts`` times) and calling ``stats_callback``
+        with the result of `stats` every ``stats_interval`` seconds.
+        The parent exits once all the workers have exited normally.
+        """
+        assert self.worker_id is None, "workers already started"
+        gen_log.info("Starting %d workers", self.num_workers)
+        children = {}
+        for i in range(self.num_workers):
+            if self._start_child(i, children):
+                return i
+        num_restarts = 0
+        poll_interval = min(self.sync_interval * 10, stats_interval)
+        next_stats = time.time() + stats_interval
+        while children:
+            if stats_callback is not None and time.time() >= next_stats:
+                next_stats += stats_interval
+                stats_callback(self.stats())
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            if pid == 0:
+                time.sleep(poll_interval)
+                continue
+            if pid not in children:
+                continue
+            worker_id = children.pop(pid)
+            self._clear_slot(worker_id)
+            if os.WIFSIGNALED(status):
+                gen_log.warning("worker %d (pid %d) killed by signal %d, "
+                                "restarting", worker_id, pid,
+                                os.WTERMSIG(status))
+            elif os.WEXITSTATUS(status) != 0:
+                gen_log.warning("worker %d (pid %d) exited with status %d, "
+                                "restarting", worker_id, pid,
+                                os.WEXITSTATUS(status))
+            else:
+                gen_log.info("worker %d (pid %d) exited normally",
+                             worker_id, pid)
+                continue
+            num_restarts += 1
+            if num_restarts > self.max_restarts:
+                raise RuntimeError("Too many worker restarts, giving up")
+            if self._start_child(worker_id, children):
+                return worker_id
+        sys.exit(0)
+
+    def _start_child(self, worker_id, children):
+        self._clear_slot(worker_id)
+        pid = os.fork()
+        if pid == 0:
+            _reseed_random()
+            self._init_worker(worker_id)
+            return True
+        children[pid] = worker_id
+        return False
+
+    def _init_worker(self, worker_id):
+        self.worker_id = worker_id
+        self._publish()
+
+    def add_server(self, server):
+        """Starts accepting connections on the pool's sockets for ``server``.
+
+        Must be called in a worker process, after `start` has
+        returned. Use this instead of ``server.add_sockets``.
+        """
+        assert self.worker_id is not None, "add_server called outside a worker"
+        assert self._server is None, "worker already has a server"
+        self._server = server
+        self._resume()
+        self._sync_callback = PeriodicCallback(self._sync,
+                                               self.sync_interval * 1000)
+        self._sync_callback.start()
+
+    def stop(self):
+        """Stops accepting connections in this worker.
+
+        Existing connections are not closed.
+        """
+        if self._sync_callback is not None:
+            self._sync_callback.stop()
+            self._sync_callback = None
+        if self._accepting:
+            self._pause()
+        self._publish()
+
+    def stats(self):
+        """Returns a list of `WorkerStats` for the running workers."""
+        result = []
+        for i in range(self.num_workers):
+            fields = _SLOT.unpack_from(self._table, i * _SLOT.size)
+            if fields[0]:
+                result.append(WorkerStats(i, fields[0], fields[1], fields[2],
+                                          fields[3], bool(fields[4])))
+        return result
+
+    def total_stats(self):
+        """Returns the sum of `stats` over all running workers.
+
+        ``worker_id`` and ``pid`` are None; ``paused`` is the number of
+        workers not currently accepting connections.
+        """
+        stats = self.stats()
+        return WorkerStats(None, None,
+                           sum(s.accepted for s in stats),
+                           sum(s.active for s in stats),
+                           sum(s.http2_active for s in stats),
+                           sum(1 for s in stats if s.paused))
+
+    def _clear_slot(self, worker_id):
+        _SLOT.pack_into(self._table, worker_id * _SLOT.size, 0, 0, 0, 0, 0)
+
+    def _publish(self):
+        _SLOT.pack_into(self._table, self.worker_id * _SLOT.size,
+                        os.getpid(), self._accepted, self._active,
+                        self._http2_active,
+                        int(self._server is not None and not self._accepting))
+
+    def _handle_connection(self, connection, address):
+        # Like `.TCPServer`, but with streams that tell us when they
+        # close so the counts stay current.
+        server = self._server
+        if server.ssl_options is not None:
+            try:
+                connection = ssl_wrap_socket(connection, server.ssl_options,
+                                             server_side=True,
+                                             do_handshake_on_connect=False)
+            except ssl.SSLError as e:
+                if e.args[0] == ssl.SSL_ERROR_EOF:
+                    return connection.close()
+                raise
+            except socket.error as e:
+                if errno_from_exception(e) in (errno.ECONNABORTED,
+                                               errno.EINVAL):
+                    return connection.close()
+                raise
+            stream_class = _CountedSSLIOStream
+        else:
+            stream_class = _CountedIOStream
+        stream = stream_class(connection,
+                              max_buffer_size=server.max_buffer_size,
+                              read_chunk_size=server.read_chunk_size)
+        stream.pool_close_callback = self._on_stream_close
+        # Count the connection right away so a burst of new
+        # connections is spread across workers.
+        self._accepted += 1
+        self._active += 1
+        self._rebalance()
+        try:
+            future = server.handle_stream(stream, address)
+            if future is not None:
+                IOLoop.current().add_future(gen.convert_yielded(future),
+                                            lambda f: f.result())
+        except Exception:
+            app_log.error("Error in connection callback", exc_info=True)
+
+    def _on_stream_close(self):
+        self._active -= 1
+        if self._sync_callback is not None:
+            self._sync()
+        else:
+            self._publish()
+
+    def _sync(self):
+        # Other workers' counts change without telling us.
+        self._http2_active = len(getattr(self._server, 'http2_connections',
+                                         ()))
+        self._rebalance()
+
+    def _rebalance(self):
+        least_active = min([s.active for s in self.stats()
+                            if s.worker_id != self.worker_id] +
+                           [self._active])
+        should_accept = self._active - least_active < self.max_imbalance
+        if should_accept and not self._accepting:
+            self._resume()
+        elif not should_accept and self._accepting:
+            self._pause()
+        self._publish()
+
+    def _resume(self):
+        io_loop = IOLoop.current()
+        for sock in self.sockets:
+            io_loop.add_handler(sock, functools.partial(self._accept, sock),
+                                IOLoop.READ)
+        self._accepting = True
+
+    def _accept(self, sock, fd, events):
+        # Like the handler of `.add_accept_handler`, but stops as soon
+        # as we pause, leaving the rest of a burst to other workers.
+        for i in range(_ACCEPT_BATCH):
+            if not self._accepting:
+                return
+            try:
+                connection, address = sock.accept()
+            except socket.error as e:
+                if errno_from_exception(e) in _ERRNO_WOULDBLOCK:
+                    return
+                if errno_from_exception(e) == errno.ECONNABORTED:
+                    continue
+                raise
+            _set_close_exec(connection.fileno())
+            self._handle_connection(connection, address)
+
+    def _pause(self):
+        io_loop = IOLoop.current()
+        for sock in self.sockets:
+            io_loop.remove_handler(sock)
+        self._accepting = False
@@ -0,0 +1,456 @@
+"""A reverse proxy that streams requests to a backend server.
+
+`ReverseProxy` is an `.HTTPServerConnectionDelegate`, so it can be
+passed to a server in place of an `.Application`, or routed to from
+one::
+
+    backend = Upstream('10.0.0.2', 8080)
+    app = Application([
+        (r'/api/.*', ReverseProxy(backend)),
+        (r'/', MainHandler),
+    ])
+
+Each request is sent to the `Upstream` as soon as its headers arrive,
+as a stream on a shared HTTP/2 connection or on a pooled HTTP/1.1
+connection. Bodies are streamed in both directions rather than
+buffered: a chunk is only acknowledged (with a WINDOW_UPDATE, or by
+reading more from the socket) once the other side has accepted it, so
+a slow client slows down the backend and vice versa.
+"""
+import collections
+import datetime
+import functools
+
+from tornado import gen
+from tornado.http1connection import HTTP1Connection, HTTP1ConnectionParameters
+from tornado.httputil import (HTTPHeaders, HTTPMessageDelegate,
+                              HTTPServerConnectionDelegate, RequestStartLine,
+                              ResponseStartLine, responses)
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.log import gen_log
+from tornado.netutil import ssl_options_to_context
+from tornado.tcpclient import TCPClient
+
+from tornado_http2.connection import Connection
+from tornado_http2 import constants
+
+# Headers that describe a single connection (RFC 7230 section 6.1),
+# which a proxy must not forward. TE is handled separately, since
+# "TE: trailers" is needed end to end (by gRPC, for example).
+_HOP_BY_HOP_HEADERS = frozenset([
+    'connection', 'http2-settings', 'keep-alive', 'proxy-authenticate',
+    'proxy-authorization', 'proxy-connection', 'trailer',
+    'transfer-encoding', 'upgrade'])
+
+# Methods whose bodies an HTTP1Connection sends chunked when there is
+# no Content-Length. Other requests can't have a body of unknown size
+# on an HTTP/1.1 backend connection.
+_CHUNKED_METHODS = frozenset(['POST', 'PUT', 'PATCH'])
+
+
+def _forward_headers(headers):
+    """Returns a copy of ``headers`` without hop-by-hop headers."""
+    connection_options = set(
+        option.strip().lower() for value in headers.get_list('Connection')
+        for option in value.split(','))
+    result = HTTPHeaders()
+    for name, value in headers.get_all():
+        lname = name.lower()
+        if lname in _HOP_BY_HOP_HEADERS or lname in connection_options:
+            continue
+        if lname == 'te' and value.strip().lower() != 'trailers':
+            continue
+        result.add(name, value)
+    return result
+
+
+def _abort(conn):
+    """Abandons a message in progress on ``conn``: resets an HTTP/2
+    stream, or closes an HTTP/1 connection.
+    """
+    reset = getattr(conn, 'reset', None)
+    if reset is not None:
+        reset(constants.ErrorCode.CANCEL)
+    else:
+        conn.close()
+
+
+@gen.coroutine
+def _quietly(future):
+    """Waits for a write, ignoring the peer having gone away (which is
+    reported to the delegate separately).
+    """
+    if future is None:
+        return
+    try:
+        yield future
+    except StreamClosedError:
+        pass
+
+
+class Upstream(object):
+    """A backend server, and the connections to it.
+
+    With ``http2`` (the default), requests are sent as streams on
+    shared HTTP/2 connections: with prior knowledge, or negotiated
+    with ALPN when ``ssl_options`` is given (falling back to HTTP/1.1
+    if the server doesn't support it). Another connection is only
+    opened when the server's MAX_CONCURRENT_STREAMS is reached.
+    Otherwise each request uses an HTTP/1.1 connection of its own, and
+    up to ``max_idle_connections`` of them are kept for reuse.
+
+    ``connect_timeout`` limits how long opening a connection may take,
+    in seconds.
+    """
+    def __init__(self, host, port, ssl_options=None, http2=True,
+                 max_idle_connections=10, connect_timeout=None):
+        self.host = host
+        self.port = port
+        if ssl_options is not None and http2:
+            if isinstance(ssl_options, dict):
+                ssl_options = ssl_options_to_context(ssl_options)
+            ssl_options.set_alpn_protocols([constants.HTTP2_TLS])
+        self.ssl_options = ssl_options
+        self.http2 = http2
+        self.max_idle_connections = max_idle_connections
+        self.connect_timeout = connect_timeout
+        self.tcp_client = TCPClient()
+        # Open HTTP/2 connections, and the Future of one being opened.
+        self.connections = []
+        self._connecting = None
+        # Idle HTTP/1.1 connections (IOStreams).
+        self._idle = collections.deque()
+        # Bodies are passed through as they are, compressed or not.
+        self._http1_params = HTTP1ConnectionParameters(decompress=False)
+
+    def close(self):
+        """Closes all connections to the backend.
+
+        Returns a `.Future` that resolves when the HTTP/2 connections
+        have shut down.
+        """
+        while self._idle:
+            self._idle.pop().close()
+        return gen.multi([conn.close() for conn in self.connections])
+
+    @gen.coroutine
+    def start_request(self, delegate):
+        """Returns an `.HTTPConnection` for one request to the backend.
+
+        The caller writes the request to it; the response is passed to
+        ``delegate``, an `.HTTPMessageDelegate`. The connection also
+        has a ``reset()`` method to abandon the request.
+        """
+        if self.http2:
+            conn = yield self._get_connection()
+            if conn is not None:
+                stream = conn.create_stream(delegate, decompress=False)
+                # A lost connection fails finish_future without telling
+                # the delegate.
+                IOLoop.current().add_future(
+                    stream.finish_future,
+                    functools.partial(self._on_stream_finished, delegate))
+                raise gen.Return(stream)
+        stream = self._get_idle()
+        if stream is None:
+            stream = yield self._connect()
+        raise gen.Return(_HTTP1Request(self, stream, delegate))
+
+    def _on_stream_finished(self, delegate, future):
+        if future.exception() is not None:
+            delegate.on_connection_close()
+
+    def _connect(self):
+        future = self.tcp_client.connect(self.host, self.port,
+                                         ssl_options=self.ssl_options)
+        if self.connect_timeout is not None:
+            future = gen.with_timeout(
+                datetime.timedelta(seconds=self.connect_timeout), future,
+                quiet_exceptions=StreamClosedError)
+        return future
+
+    @gen.coroutine
+    def _get_connection(self):
+        for conn in self.connections:
+            if conn.can_create_stream():
+                raise gen.Return(conn)
+        # Requests arriving while a connection is being opened share it.
+        if self._connecting is None:
+            self._connecting = self._open_connection()
+            IOLoop.current().add_future(self._connecting,
+                                        self._on_connection_opened)
+        conn = yield self._connecting
+        raise gen.Return(conn)
+
+    def _on_connection_opened(self, future):
+        self._connecting = None
+
+    @gen.coroutine
+    def _open_connection(self):
+        stream = yield self._connect()
+        if (self.ssl_options is not None and
+                stream.socket.selected_alpn_protocol() !=
+                constants.HTTP2_TLS):
+            # The backend only speaks HTTP/1.1; use the connection for
+            # that instead.
+            self.http2 = False
+            self._release(stream)
+            raise gen.Return(None)
+        # Frames are small and often written one at a time.
+        stream.set_nodelay(True)
+        conn = Connection(stream, True)
+        self.connections.append(conn)
+        IOLoop.current().add_future(
+            conn.start(None), functools.partial(self._remove_connection, conn))
+        raise gen.Return(conn)
+
+    def _remove_connection(self, conn, future):
+        self.connections.remove(conn)
+
+    def _get_idle(self):
+        while self._idle:
+            stream = self._idle.pop()
+            stream.set_close_callback(None)
+            if not stream.closed():
+                return stream
+        return None
+
+    def _release(self, stream):
+        """Keeps an HTTP/1.1 connection whose response is done for reuse."""
+        if stream.closed() or len(self._idle) >= self.max_idle_connections:
+            stream.close()
+            return
+        # Forget connections the backend closes while they are idle.
+        stream.set_close_callback(
+            functools.partial(self._discard_idle, stream))
+        self._idle.append(stream)
+
+    def _discard_idle(self, stream):
+        if stream in self._idle:
+            self._idle.remove(stream)
+
+
+class _HTTP1Request(HTTP1Connection):
+    """One request on an HTTP/1.1 connection to an `Upstream`.
+
+    The response is read as soon as the request headers are written,
+    and the connection goes back to the pool once it is complete.
+    """
+    def __init__(self, upstream, stream, delegate):
+        super(_HTTP1Request, self).__init__(stream, True,
+                                            upstream._http1_params)
+        self._upstream = upstream
+        self._delegate = delegate
+
+    def write_headers(self, start_line, headers, chunk=None, callback=None):
+        future = super(_HTTP1Request, self).write_headers(
+            start_line, headers, chunk, callback)
+        IOLoop.current().add_future(self.read_response(self._delegate),
+                                    self._on_response)
+        return future
+
+    def _on_response(self, future):
+        if self.stream is None:
+            return
+        if future.exception() is None and future.result():
+            self._upstream._release(self.stream)
+        else:
+            self.stream.close()
+
+    def reset(self, code=None):
+        self.close()
+
+
+class ReverseProxy(HTTPServerConnectionDelegate):
+    """Forwards requests to an `Upstream`.
+
+    Hop-by-hop headers are removed in both directions, and with
+    ``xheaders`` (the default) the client's address and protocol are
+    passed on in ``X-Forwarded-For`` and ``X-Forwarded-Proto``.
+    Trailers are forwarded between HTTP/2 peers. If the backend can't
+    be reached, or fails before its response has started, the client
+    gets a 502 response; after that, its stream is reset (or, over
+    HTTP/1, its connection closed).
+    """
+    def __init__(self, upstream, xheaders=True):
+        self.upstream = upstream
+        self.xheaders = xheaders
+
+    def start_request(self, server_conn, request_conn):
+        return _ProxyRequest(self, request_conn)
+
+
+class _ProxyRequest(HTTPMessageDelegate):
+    """Receives a request from the client and forwards it."""
+    def __init__(self, proxy, request_conn):
+        self.proxy = proxy
+        self.request_conn = request_conn
+        self.upstream_conn = None
+        # The progress of the response to the client, and whether the
+        # exchange has been abandoned (failed, or the client is gone).
+        self.response_started = False
+        self.response_finished = False
+        self.closed = False
+        self._can_send_body = True
+        self._trailers = None
+        # The Future of the last step forwarding the request, which
+        # the next one waits for.
+        self._pending = None
+
+    def headers_received(self, start_line, headers):
+        self.request_conn.set_close_callback(self.on_connection_close)
+        headers = _forward_headers(headers)
+        if self.proxy.xheaders:
+            context = self.request_conn.context
+            remote_ip = getattr(context, 'remote_ip', None)
+            if remote_ip:
+                forwarded_for = headers.get('X-Forwarded-For')
+                headers['X-Forwarded-For'] = (
+                    forwarded_for + ', ' + remote_ip if forwarded_for
+                    else remote_ip)
+            protocol = getattr(context, 'protocol', None)
+            if protocol:
+                headers['X-Forwarded-Proto'] = protocol
+        self._pending = self._start(start_line, headers)
+        # HTTP/1 connections wait for this before reading the body.
+        return self._pending
+
+    @gen.coroutine
+    def _start(self, start_line, headers):
+        try:
+            conn = yield self.proxy.upstream.start_request(
+                _ProxyResponse(self))
+        except Exception as e:
+            gen_log.warning("Error connecting to backend %s:%d: %s",
+                            self.proxy.upstream.host,
+                            self.proxy.upstream.port, e)
+            self.respond_error(502)
+            return
+        if self.closed:
+            _abort(conn)
+            return
+        self.upstream_conn = conn
+        self._can_send_body = (not isinstance(conn, _HTTP1Request) or
+                               'Content-Length' in headers or
+                               start_line.method in _CHUNKED_METHODS)
+        try:
+            conn.write_headers(RequestStartLine(start_line.method,
+                                                start_line.path, 'HTTP/1.1'),
+                               headers)
+        except Exception:
+            gen_log.warning("Error sending request to backend",
+                            exc_info=True)
+            self.respond_error(502)
+
+    def data_received(self, chunk):
+        self._pending = self._write(self._pending, chunk)
+        # The client's flow control window is only credited once the
+        # chunk has been passed on.
+        return self._pending
+
+    @gen.coroutine
+    def _write(self, previous, chunk):
+        yield previous
+        if self.closed:
+            return
+        if not self._can_send_body:
+            gen_log.info("Can't forward a request body without "
+                         "Content-Length to an HTTP/1.1 backend")
+            self.respond_error(411)
+            return
+        yield _quietly(self.upstream_conn.write(chunk))
+
+    def trailers_received(self, trailers):
+        self._trailers = trailers
+
+    def finish(self):
+        self._pending = self._finish(self._pending)
+
+    @gen.coroutine
+    def _finish(self, previous):
+        yield previous
+        if self.closed:
+            return
+        set_trailers = getattr(self.upstream_conn, 'set_trailers', None)
+        if self._trailers is not None and set_trailers is not None:
+            set_trailers(self._trailers)
+        yield _quietly(self.upstream_conn.finish())
+
+    def on_connection_close(self):
+        # The client has gone away.
+        if self.closed:
+            return
+        self.closed = True
+        if self.upstream_conn is not None:
+            _abort(self.upstream_conn)
+
+    def respond_error(self, code):
+        """Ends the exchange with an error response to the client, or
+        aborts it if the response has already started.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.upstream_conn is not None:
+            _abort(self.upstream_conn)
+        if self.response_finished:
+            return
+        if self.response_started:
+            _abort(self.request_conn)
+            return
+        self.response_started = True
+        try:
+            self.request_conn.write_headers(
+                ResponseStartLine('HTTP/1.1', code, responses[code]),
+                HTTPHeaders({'Content-Length': '0'}))
+            self.request_conn.finish()
+        except StreamClosedError:
+            pass
+
+
+class _ProxyResponse(HTTPMessageDelegate):
+    """Receives the response from the backend and forwards it."""
+    def __init__(self, request):
+        self.request = request
+
+    def headers_received(self, start_line, headers):
+        request = self.request
+        if request.closed or start_line.code < 200:
+            # Interim responses (like 100 Continue) are not forwarded.
+            return None
+        request.response_started = True
+        return _quietly(request.request_conn.write_headers(
+            ResponseStartLine('HTTP/1.1', start_line.code,
+                              start_line.reason),
+            _forward_headers(headers)))
+
+    def data_received(self, chunk):
+        if self.request.closed:
+            return None
+        # The backend's flow control window is only credited (or, over
+        # HTTP/1, its socket read) once the client has taken the chunk.
+        return _quietly(self.request.request_conn.write(chunk))
+
+    def trailers_received(self, trailers):
+        set_trailers = getattr(self.request.request_conn, 'set_trailers',
+                               None)
+        if not self.request.closed and set_trailers is not None:
+            set_trailers(trailers)
+
+    def finish(self):
+        request = self.request
+        if request.closed:
+            return
+        request.response_finished = True
+        future = request.request_conn.finish()
+        if future is not None:
+            IOLoop.current().add_future(_quietly(future), lambda f: None)
+
+    def on_connection_close(self):
+        # The backend failed, or reset the stream.
+        if not self.request.closed and not self.request.response_finished:
+            gen_log.info("Backend connection to %s:%d closed",
+                         self.request.proxy.upstream.host,
+                         self.request.proxy.upstream.port)
+            self.request.respond_error(502)
@@ -1,17 +1,20 @@
+import base64
+import errno
 import functools
+import socket
 
 from tornado.escape import utf8
-from tornado import gen
 from tornado.httpserver import HTTPServer, _HTTPRequestContext
 from tornado.httputil import HTTPConnection, RequestStartLine, HTTPMessageDelegate
 from tornado.ioloop import IOLoop
-from tornado.iostream import SSLIOStream, StreamClosedError, UnsatisfiableReadError
+from tornado.iostream import SSLIOStream
 from tornado.log import app_log
 from tornado.netutil import ssl_options_to_context
-from tornado import stack_context
+from tornado.util import errno_from_exception
 
 from tornado_http2.connection import Connection, Params, Stream
 from tornado_http2 import constants
+from tornado_http2.errors import ConnectionError
 
 
 class Server(HTTPServer):
@@ -26,7 +29,23 @@ class Server(HTTPServer):
         self.http2_params = Params(
             max_header_size=kwargs.get('max_header_size'),
             decompress=kwargs.get('decompress_request', False),
+            max_output_buffer_size=kwargs.pop('max_output_buffer_size', None),
+            flood_limits=kwargs.pop('flood_limits', None),
+            max_continuation_frames=kwargs.pop('max_continuation_frames',
+                                               None),
+            header_timeout=kwargs.get('idle_connection_timeout'),
+            body_timeout=kwargs.get('body_timeout'),
+            max_body_size=kwargs.get('max_body_size'),
+            stream_timeout=kwargs.pop('stream_timeout', None),
+            trace_frames=kwargs.pop('trace_frames', None),
+            trace_dir=kwargs.pop('trace_dir', None),
+            enable_connect_protocol=kwargs.pop('enable_connect_protocol',
+                                               False),
+            compression_executor=kwargs.pop('compression_executor', None),
+            compression_threshold=kwargs.pop('compression_threshold', None),
         )
+        # The open HTTP/2 connections, including upgraded ones.
+        self.http2_connections = set()
         super(Server, self).initialize(
             request_callback, ssl_options=ssl_options, **kwargs)
 
@@ -54,41 +73,30 @@ class Server(HTTPServer):
         super(Server, self).handle_stream(stream, address)
 
     def _start_http2(self, stream, address):
+        # Frames are small and often written one at a time.
+        stream.set_nodelay(True)
         context = _HTTPRequestContext(stream, address, self.protocol)
         conn = Connection(stream, False, params=self.http2_params, context=context)
+        self._serve_http2(conn)
+
+    def _serve_http2(self, conn):
         self._connections.add(conn)
-        conn.start(self)
+        self.http2_connections.add(conn)
+        conn.start(self).add_done_callback(
+            lambda f: self.http2_connections.discard(conn))
 
 
 class CleartextHTTP2Server(Server):
     def _start_http1(self, stream, address):
-        IOLoop.current().spawn_callback(self._read_first_line, stream, address)
+        if isinstance(stream, SSLIOStream):
+            # HTTP/2 over TLS must be negotiated with ALPN
+            # (RFC 7540 section 3.3), so there is nothing to detect.
+            super(CleartextHTTP2Server, self)._start_http1(stream, address)
+            return
+        _PrefaceDetector(self, stream, address).start()
 
-    @gen.coroutine
-    def _read_first_line(self, stream, address):
-        try:
-            header_future = stream.read_until_regex(b'\r?\n\r?\n',
-                                                    max_bytes=self.conn_params.max_header_size)
-            if self.conn_params.header_timeout is None:
-                header_data = yield header_future
-            else:
-                try:
-                    header_data = yield gen.with_timeout(
-                        stream.io_loop.time() + self.conn_params.header_timeout,
-                        header_future,
-                        quiet_exceptions=StreamClosedError)
-                except gen.TimeoutError:
-                    stream.close()
-                    return
-            # TODO: make this less hacky
-            stream._read_buffer[:0] = header_data
-            stream._read_buffer_size += len(header_data)
-            if header_data == b'PRI * HTTP/2.0\r\n\r\n':
-                self._start_http2(stream, address)
-            else:
-                super(CleartextHTTP2Server, self)._start_http1(stream, address)
-        except (StreamClosedError, UnsatisfiableReadError):
-            pass
+    def _start_detected_http1(self, stream, address):
+        super(CleartextHTTP2Server, self)._start_http1(stream, address)
 
     def start_request(self, server_conn, request_conn):
         request_conn = _UpgradingConnection(request_conn,
@@ -98,103 +106,232 @@ class CleartextHTTP2Server(Server):
         return _UpgradingRequestAdapter(request_conn, delegate)
 
 
+class _PrefaceDetector(object):
+    """Detects HTTP/2 connections made with prior knowledge.
+
+    The start of the connection is peeked at (with ``MSG_PEEK``)
+    rather than read, so whichever protocol is chosen reads the
+    connection from the beginning. The decision is made as soon as
+    the data either diverges from the client preface or contains all
+    of it, without waiting for a complete HTTP/1 request header.
+
+    Peeking can't tell whether the client has closed the connection
+    after sending part of the preface, so a partial preface that stops
+    growing for ``_STALL_TIMEOUT`` seconds is handed to HTTP/1, which
+    reads it for real (and closes the connection at EOF).
+    """
+    # How long to wait before peeking again when only part of the
+    # preface has arrived. The socket stays readable while the data
+    # is unconsumed, so we can't simply wait for the next event. The
+    # interval doubles while no more data arrives.
+    _RETRY_INTERVAL = 0.01
+    _STALL_TIMEOUT = 1.0
+
+    def __init__(self, server, stream, address):
+        self.server = server
+        self.stream = stream
+        self.address = address
+        self.io_loop = IOLoop.current()
+        self._timeout = None
+        self._waiting = False
+        # The length of the partial preface seen so far, and when it
+        # last grew.
+        self._peeked = 0
+        self._peeked_time = None
+        self._retry_interval = self._RETRY_INTERVAL
+
+    def start(self):
+        header_timeout = self.server.conn_params.header_timeout
+        if header_timeout is not None:
+            self._timeout = self.io_loop.add_timeout(
+                self.io_loop.time() + header_timeout, self._on_timeout)
+        self._wait()
+
+    def _wait(self):
+        if self.stream.closed():
+            self._cancel_timeout()
+            return
+        self.io_loop.add_handler(self.stream.socket, self._on_readable,
+                                 IOLoop.READ | IOLoop.ERROR)
+        self._waiting = True
+
+    def _on_readable(self, fd, events):
+        self.io_loop.remove_handler(self.stream.socket)
+        self._waiting = False
+        try:
+            data = self.stream.socket.recv(len(constants.CLIENT_PREFACE),
+                                           socket.MSG_PEEK)
+        except socket.error as e:
+            if errno_from_exception(e) in (errno.EWOULDBLOCK, errno.EAGAIN):
+                self._wait()
+                return
+            data = b''
+        if not data:
+            self._cancel_timeout()
+            self.stream.close()
+        elif not constants.CLIENT_PREFACE.startswith(data):
+            self._cancel_timeout()
+            self.server._start_detected_http1(self.stream, self.address)
+        elif len(data) == len(constants.CLIENT_PREFACE):
+            self._cancel_timeout()
+            self.server._start_http2(self.stream, self.address)
+        else:
+            self._retry(len(data))
+
+    def _retry(self, peeked):
+        now = self.io_loop.time()
+        if peeked > self._peeked:
+            self._peeked = peeked
+            self._peeked_time = now
+            self._retry_interval = self._RETRY_INTERVAL
+        elif now - self._peeked_time >= self._STALL_TIMEOUT:
+            self._cancel_timeout()
+            self.server._start_detected_http1(self.stream, self.address)
+            return
+        else:
+            self._retry_interval = min(self._retry_interval * 2,
+                                       self._STALL_TIMEOUT / 4)
+        self.io_loop.call_later(self._retry_interval, self._wait)
+
+    def _on_timeout(self):
+        self._timeout = None
+        if self._waiting:
+            self.io_loop.remove_handler(self.stream.socket)
+            self._waiting = False
+        self.stream.close()
+
+    def _cancel_timeout(self):
+        if self._timeout is not None:
+            self.io_loop.remove_timeout(self._timeout)
+            self._timeout = None
+
+
 class _UpgradingConnection(HTTPConnection):
+    """Wraps an HTTP/1 connection that may be upgraded to HTTP/2.
+
+    After an upgrade, the request body (if any) is still read from the
+    HTTP/1 connection, but the response is written as HTTP/2 stream 1.
+    """
     def __init__(self, conn, http2_params, server):
         self.conn = conn
         self.context = conn.context
         self.http2_params = http2_params
         self.server = server
-        self.upgrading = False
-        self.written_headers = None
-        self.written_chunks = []
-        self.write_finished = False
-        self.close_callback = None
-        self.max_body_size = None
-        self.body_timeout = None
+        self.h2_conn = None
+        self.h2_stream = None
 
         # TODO: remove
         from tornado.util import ObjectDict
         self.stream = ObjectDict(io_loop=IOLoop.current(), close=conn.stream.close)
 
+    @property
+    def upgraded(self):
+        return self.h2_stream is not None
+
     def set_close_callback(self, callback):
-        if self.upgrading:
-            self.close_callback = stack_context.wrap(callback)
+        if self.upgraded:
+            self.h2_stream.set_close_callback(callback)
         else:
             self.conn.set_close_callback(callback)
 
+    # The body limits apply to the HTTP/1 connection, which reads the
+    # request body even after an upgrade.
     def set_max_body_size(self, max_body_size):
-        if self.upgrading:
-            self.max_body_size = max_body_size
-        else:
-            self.conn.set_max_body_size(max_body_size)
+        self.conn.set_max_body_size(max_body_size)
 
     def set_body_timeout(self, body_timeout):
-        if self.upgrading:
-            self.body_timeout = body_timeout
-        else:
-            self.conn.set_body_timeout(body_timeout)
+        self.conn.set_body_timeout(body_timeout)
 
     def detach(self):
         return self.conn.detach()
 
-    def write_headers(self, start_line, headers, chunk=None, callback=None):
-        if self.upgrading:
-            self.written_headers = (start_line, headers, chunk, callback)
+    def reset(self, code=constants.ErrorCode.CANCEL):
+        """Abandons the response: resets the HTTP/2 stream carrying it,
+        or closes the HTTP/1 connection.
+        """
+        conn = self.h2_stream if self.upgraded else self.conn
+        if isinstance(conn, Stream):
+            conn.reset(code)
         else:
-            return self.conn.write_headers(start_line, headers, chunk, callback)
+            conn.close()
+
+    @property
+    def timings(self):
+        """The `.StreamTimings` of the HTTP/2 stream carrying the
+        response, or None if the response is sent over HTTP/1.
+        """
+        return getattr(self.h2_stream if self.upgraded else self.conn,
+                       'timings', None)
+
+    def write_headers(self, start_line, headers, chunk=None, callback=None):
+        if self.upgraded:
+            return self.h2_stream.write_headers(start_line, headers, chunk,
+                                                callback)
+        return self.conn.write_headers(start_line, headers, chunk, callback)
 
     def write(self, chunk, callback=None):
-        if self.upgrading:
-            self.written_chunks.append((chunk, callback))
-        else:
-            return self.conn.write(chunk, callback)
+        if self.upgraded:
+            return self.h2_stream.write(chunk, callback)
+        return self.conn.write(chunk, callback)
 
     def finish(self):
-        if self.upgrading:
-            self.write_finished = True
-        else:
-            return self.conn.finish()
-
-    @gen.coroutine
-    def switch_protocols(self, callback):
-        stream = self.conn.detach()
+        if self.upgraded:
+            return self.h2_stream.finish()
+        return self.conn.finish()
+
+    @property
+    def write_file(self):
+        """The ``write_file`` method of the HTTP/2 stream carrying the
+        response, or None if the response is sent over HTTP/1.
+        """
+        return getattr(self.h2_stream if self.upgraded else self.conn,
+                       'write_file', None)
+
+    @property
+    def set_trailers(self):
+        """The ``set_trailers`` method of the HTTP/2 stream carrying the
+        response, or None if the response is sent over HTTP/1.
+        """
+        return getattr(self.h2_stream if self.upgraded else self.conn,
+                       'set_trailers', None)
+
+    def switch_protocols(self, start_line, settings):
+        """Upgrades to HTTP/2 after the request headers have been read.
+
+        Writes the 101 response and our SETTINGS immediately so the
+        response can be streamed on stream 1 while the request body
+        is still arriving. ``settings`` is the decoded HTTP2-Settings
+        header. Returns False (without writing anything) if the
+        settings are invalid.
+        """
+        stream = self.conn.stream
+        h2_conn = Connection(stream, False, params=self.http2_params,
+                             context=self.context)
+        try:
+            h2_conn.apply_settings(settings)
+        except ConnectionError:
+            return False
         stream.write(utf8(
             "HTTP/1.1 101 Switching Protocols\r\n"
             "Connection: Upgrade\r\n"
             "Upgrade: %s\r\n"
             "\r\n" % constants.HTTP2_CLEAR))
-        h2_conn = Connection(stream, False, params=self.http2_params,
-                             context=self.context)
-        self.server._connections.add(h2_conn)
-        h2_conn.start(self.server)
-        self.conn = Stream(h2_conn, 1, None, context=self.context)
-        h2_conn.streams[1] = self.conn
-        self.conn._request_start_line = RequestStartLine(
-            self._request_start_line.method,
-            self._request_start_line.path,
-            'HTTP/2.0')
-        yield h2_conn._initial_settings_written
-
-        if self.written_headers is not None:
-            self.conn.write_headers(*self.written_headers)
-        for write in self.written_chunks:
-            self.conn.write(*write)
-        if self.write_finished:
-            self.conn.finish()
-        if self.max_body_size is not None:
-            self.conn.set_max_body_size(self.max_body_size)
-        if self.body_timeout is not None:
-            self.conn.set_body_timeout(self.body_timeout)
-        if self.close_callback is not None:
-            self.conn.set_close_callback(self.close_callback)
-            self.close_callback = None
-        self.upgrading = False
-
-        try:
-            callback()
-        except Exception:
-            app_log.error("Exception in callback", exc_info=True)
-            self.conn.reset()
+        h2_conn.write_initial_settings()
+        h2_stream = Stream(h2_conn, 1, None, context=self.context)
+        # The request is complete as far as HTTP/2 is concerned, so
+        # stream 1 starts out half-closed (remote).
+        h2_stream.finish_future.set_result(None)
+        h2_stream._request_start_line = start_line
+        h2_conn.streams[1] = h2_stream
+        self.h2_conn = h2_conn
+        self.h2_stream = h2_stream
+        return True
+
+    def start_http2(self):
+        """Hands the connection over to HTTP/2 once the request body is read.
+        """
+        self.conn.detach().set_nodelay(True)
+        self.server._serve_http2(self.h2_conn)
 
 
 class _UpgradingRequestAdapter(HTTPMessageDelegate):
@@ -203,24 +340,56 @@ class _UpgradingRequestAdapter(HTTPMessageDelegate):
         self.delegate = delegate
 
     def headers_received(self, start_line, headers):
-        if 'Upgrade' in headers:
-            upgrades = set(i.strip() for i in headers['Upgrade'].split(','))
-            if constants.HTTP2_CLEAR in upgrades:
-                self.connection.upgrading = True
-                start_line = RequestStartLine(
-                    start_line.method, start_line.path, 'HTTP/2.0')
-        self.connection._request_start_line = start_line
+        settings = self._upgrade_settings(headers)
+        if settings is not None:
+            h2_start_line = RequestStartLine(
+                start_line.method, start_line.path, 'HTTP/2.0')
+            if self.connection.switch_protocols(h2_start_line, settings):
+                start_line = h2_start_line
         return self.delegate.headers_received(start_line, headers)
 
+    def _upgrade_settings(self, headers):
+        """Returns the decoded HTTP2-Settings if we should upgrade, else None.
+        """
+        if 'Upgrade' not in headers:
+            return None
+        upgrades = set(i.strip() for i in headers['Upgrade'].split(','))
+        if constants.HTTP2_CLEAR not in upgrades:
+            return None
+        # A 100-continue response would be written by the HTTP/1
+        # connection after our 101.
+        if headers.get('Expect', '').lower() == '100-continue':
+            return None
+        # RFC 7540 section 3.2.1: there must be exactly one
+        # HTTP2-Settings header.
+        settings = headers.get_list('HTTP2-Settings')
+        if len(settings) != 1:
+            return None
+        settings = utf8(settings[0].strip())
+        try:
+            return base64.urlsafe_b64decode(
+                settings + b'=' * (-len(settings) % 4))
+        except (TypeError, ValueError):
+            return None
+
     def data_received(self, chunk):
         return self.delegate.data_received(chunk)
 
+    def trailers_received(self, trailers):
+        trailers_received = getattr(self.delegate, 'trailers_received', None)
+        if trailers_received is not None:
+            trailers_received(trailers)
+
     def finish(self):
-        finish = self.delegate.finish
-        if self.connection.upgrading:
-            self.connection.switch_protocols(finish)
-        else:
-            finish()
+        if not self.connection.upgraded:
+            self.delegate.finish()
+            return
+        self.connection.start_http2()
+        try:
+            self.delegate.finish()
+        except Exception:
+            app_log.error("Exception in callback", exc_info=True)
+            self.connection.h2_stream.reset()
 
     def on_connection_close(self):
         self.delegate.on_connection_close()
@@ -1,19 +1,90 @@
+import collections
 import functools
+import mmap
+import os
 import struct
+import sys
+import time
 
 from tornado.concurrent import Future
 from tornado.escape import native_str, utf8
-from tornado import gen
 from tornado.http1connection import _GzipMessageDelegate
 from tornado.httputil import HTTPHeaders, HTTPOutputError, RequestStartLine, ResponseStartLine, responses
 from tornado.ioloop import IOLoop
-from tornado.locks import Lock
+from tornado.iostream import StreamClosedError
+from tornado.log import gen_log
 
 from . import constants
 from .errors import ConnectionError, StreamError
 from .flow_control import Window
 from .frames import Frame, parse_window_update_frame
-from .hpack import HpackError
+from .headers import LazyHTTPHeaders, constant_headers, intern_name
+from .hpack import HeaderListTooLarge, HpackError
+from .timers import TimerWheel
+from .tunnel import TunnelStream
+from .compression import GzipMessageDelegate
+
+
+_PY2 = bytes is str
+
+_REQUEST_PSEUDO_HEADERS = frozenset([b':method', b':scheme', b':authority',
+                                     b':path'])
+_RESPONSE_PSEUDO_HEADERS = frozenset([b':status'])
+# With SETTINGS_ENABLE_CONNECT_PROTOCOL (RFC 8441).
+_EXTENDED_CONNECT_PSEUDO_HEADERS = _REQUEST_PSEUDO_HEADERS | frozenset(
+    [b':protocol'])
+
+# RFC 8441 requests carry no Sec-WebSocket-Key, but tornado's
+# WebSocketHandler requires one. Its Sec-WebSocket-Accept is not sent.
+_WEBSOCKET_KEY = b'dGhlIHNhbXBsZSBub25jZQ=='
+
+# Headers of a WebSocketHandler's HTTP/1.1 101 response that don't
+# apply to an RFC 8441 tunnel's 200 response.
+_WEBSOCKET_UPGRADE_HEADERS = frozenset([
+    'connection', 'content-length', 'sec-websocket-accept', 'upgrade'])
+
+# Python 2 has no monotonic clock.
+_now = getattr(time, 'monotonic', time.time)
+
+
+def _view(data):
+    # Slices of a memoryview share its memory. Python 2 can't use
+    # them (mmap doesn't support memoryview, and memoryviews can't be
+    # concatenated to bytes), so there the data is sliced directly.
+    if _PY2:
+        return data
+    return memoryview(data)
+
+
+def _done_future():
+    future = Future()
+    future.set_result(None)
+    return future
+
+
+def _closed_future():
+    future = Future()
+    future.set_exception(StreamClosedError())
+    # Like HTTP1Connection, don't log it if the caller doesn't wait
+    # for the write.
+    future.exception()
+    return future
+
+
+def _on_write_complete(future):
+    # As above, for writes that were queued when the stream closed.
+    exc = future.exception()
+    if exc is not None and not isinstance(exc, StreamClosedError):
+        future.result()
+
+
+def _close_mapping(mapping):
+    try:
+        mapping.close()
+    except BufferError:
+        # A frame still refers to the mapping; let the garbage
+        # collector close it.
+        pass
 
 
 def _reset_on_error(f):
@@ -26,14 +97,107 @@ def _reset_on_error(f):
     return wrapper
 
 
+class _QueuedWrite(object):
+    """The unwritten part (``data[start:end]``) of a write."""
+    def __init__(self, data, start, end, callback):
+        self.data = data
+        self.start = start
+        self.end = end
+        self.callback = callback
+
+
+class StreamTimings(object):
+    """When things happened on a `Stream`, for finding out where a
+    slow request spent its time.
+
+    The event attributes are times from `time.monotonic` (`time.time`
+    on Python 2), or None if the event hasn't happened:
+
+    * ``created``: the stream was opened
+    * ``headers_received``: the first HEADERS frame arrived
+    * ``headers_decoded``: the header block was decoded (before it is
+      passed to the delegate)
+    * ``body_received``: the peer ended the stream
+    * ``headers_sent``: our headers were written
+    * ``first_data_sent``, ``last_data_sent``: the first and last DATA
+      frames were written (to the `.IOStream`)
+
+    ``flow_control_wait`` is the total time, in seconds, that writes
+    waited for the peer's flow control windows, and
+    ``output_buffer_wait`` the time they waited for the connection's
+    output buffer to drain. Both mean the network or the peer, rather
+    than the application, was slow.
+    """
+    __slots__ = ('created', 'headers_received', 'headers_decoded',
+                 'body_received', 'headers_sent', 'first_data_sent',
+                 'last_data_sent', 'flow_control_wait',
+                 'output_buffer_wait')
+
+    # Phases reported by `durations`, and the events they fall between.
+    _PHASES = [
+        ('decode', 'headers_received', 'headers_decoded'),
+        ('body', 'headers_decoded', 'body_received'),
+        ('respond', 'body_received', 'headers_sent'),
+        ('send', 'headers_sent', 'last_data_sent'),
+    ]
+
+    def __init__(self):
+        self.created = _now()
+        self.headers_received = None
+        self.headers_decoded = None
+        self.body_received = None
+        self.headers_sent = None
+        self.first_data_sent = None
+        self.last_data_sent = None
+        self.flow_control_wait = 0.0
+        self.output_buffer_wait = 0.0
+
+    def data_sent(self):
+        now = _now()
+        if self.first_data_sent is None:
+            self.first_data_sent = now
+        self.last_data_sent = now
+
+    def durations(self):
+        """Returns a list of ``(name, seconds)`` pairs.
+
+        The phases are ``decode`` (decoding the request headers),
+        ``body`` (waiting for the rest of the request), ``respond``
+        (until the response headers were written) and ``send`` (until
+        the end of the response was written), followed by the two wait
+        totals. Phases whose events haven't happened are left out.
+        """
+        result = []
+        for name, start, end in self._PHASES:
+            start = getattr(self, start)
+            end = getattr(self, end)
+            if start is not None and end is not None:
+                result.append((name, end - start))
+        result.append(('flow_control_wait', self.flow_control_wait))
+        result.append(('output_buffer_wait', self.output_buffer_wait))
+        return result
+
+
 class Stream(object):
-    def __init__(self, conn, stream_id, delegate, context=None):
+    def __init__(self, conn, stream_id, delegate, context=None,
+                 decompress=None):
         self.conn = conn
         self.stream_id = stream_id
+        self.timings = StreamTimings()
+        if decompress is None:
+            decompress = conn.params.decompress
+        self._decompress = decompress
         self.set_delegate(delegate)
         self.context = context
         self.finish_future = Future()
-        self.write_lock = Lock()
+        self._end_stream_sent = False
+        # Writes waiting for flow control credit or room in the
+        # connection's output buffer (see _write_queued). Later writes
+        # queue behind them instead of writing immediately.
+        self._write_queue = collections.deque()
+        # True while _write_queued waits to be called back.
+        self._write_waiting = False
+        self._write_wait_start = None
         from tornado.util import ObjectDict
         # TODO: remove
         self.stream = ObjectDict(io_loop=IOLoop.current(), close=conn.stream.close)
@@ -43,12 +207,38 @@ class Stream(object):
         self.window = Window(conn.window, stream_id,
                              conn.setting(constants.Setting.INITIAL_WINDOW_SIZE))
         self._header_frames = []
+        # Total size of the buffered header block fragments.
+        self._header_block_size = 0
         self._phase = constants.HTTPPhase.HEADERS
+        self._body_timeout = conn.params.body_timeout
+        self._max_body_size = conn.params.max_body_size
+        self._received_body_size = 0
+        # Maps "header", "body" and "stream" to TimerWheel timers.
+        self._timers = {}
+        self._set_timeout('stream', conn.params.stream_timeout)
+        # Trailers received from the peer, and to be sent by finish().
+        self.trailers = None
+        self._outgoing_trailers = None
+        # The :protocol of an extended CONNECT request, its TunnelStream,
+        # and whether our response accepted it.
+        self.tunnel_protocol = None
+        self._tunnel = None
+        self._tunnel_open = False
+        # Set once the stream is done, normally or by RST_STREAM.
+        self.closed = False
+        self._close_callback = None
 
     def set_delegate(self, delegate):
         self.orig_delegate = self.delegate = delegate
-        if self.conn.params.decompress:
-            self.delegate = _GzipMessageDelegate(delegate, self.conn.params.chunk_size)
+        if self._decompress:
+            params = self.conn.params
+            if params.compression_executor is None:
+                self.delegate = _GzipMessageDelegate(delegate,
+                                                     params.chunk_size)
+            else:
+                self.delegate = GzipMessageDelegate(
+                    delegate, params.chunk_size, params.compression_executor,
+                    params.compression_threshold)
 
     def handle_frame(self, frame):
         if frame.type == constants.FrameType.PRIORITY:
@@ -81,26 +271,39 @@ class Stream(object):
         return bool(self._header_frames)
 
     def _handle_headers_frame(self, frame):
+        if self.timings.headers_received is None:
+            self.timings.headers_received = _now()
         if self._phase == constants.HTTPPhase.BODY:
             self._phase = constants.HTTPPhase.TRAILERS
         frame = frame.without_padding()
-        self._header_frames.append(frame)
-        self._check_header_length()
-        if frame.flags & constants.FrameFlag.END_HEADERS:
-            self._parse_headers()
+        self._add_header_frame(frame)
 
     def _handle_continuation_frame(self, frame):
         if not self._header_frames:
             raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
                                   "CONTINUATION without HEADERS")
+        self._add_header_frame(frame)
+
+    def _add_header_frame(self, frame):
         self._header_frames.append(frame)
-        self._check_header_length()
+        self._header_block_size += len(frame.data)
+        if (not frame.flags & constants.FrameFlag.END_HEADERS and
+                'header' not in self._timers):
+            # Waiting for CONTINUATION frames.
+            self._set_timeout('header', self.conn.params.header_timeout)
+        if self._header_block_size > self.conn.params.max_header_size:
+            # The decoded headers are at least about as large as the
+            # block, but we can't decode a partial block, and skipping
+            # it would leave the HPACK state out of sync.
+            self._reject_headers()
+            raise ConnectionError(constants.ErrorCode.ENHANCE_YOUR_CALM,
+                                  "header block too large")
         if frame.flags & constants.FrameFlag.END_HEADERS:
             self._parse_headers()
 
-    def _check_header_length(self):
-        if (sum(len(f.data) for f in self._header_frames) >
-                self.conn.params.max_header_size):
+    def _reject_headers(self):
+        """Responds to headers larger than ``params.max_header_size``."""
+        if self._phase == constants.HTTPPhase.HEADERS:
             if self.conn.is_client:
                 # TODO: Need tests for client side of headers-too-large.
                 # What's the best way to send an error?
@@ -116,12 +319,13 @@ class Stream(object):
                 start_line = ResponseStartLine('HTTP/2.0', 431, 'Headers too large')
                 self.write_headers(start_line, HTTPHeaders())
                 self.finish()
-            return
 
     def _parse_headers(self):
         frame = self._header_frames[0]
         data = b''.join(f.data for f in self._header_frames)
         self._header_frames = []
+        self._header_block_size = 0
+        self._cancel_timeout('header')
         if frame.flags & constants.FrameFlag.PRIORITY:
             # TODO: support PRIORITY and PADDING.
             # This is just enough to cover an error case tested in h2spec.
@@ -133,22 +337,22 @@ class Stream(object):
                 raise ConnectionError(constants.ErrorCode.PROTOCOL_ERROR,
                                       "stream cannot depend on itself")
         pseudo_headers = {}
-        headers = HTTPHeaders()
+        headers = LazyHTTPHeaders()
+        if self.conn.is_client:
+            valid_pseudo_headers = _RESPONSE_PSEUDO_HEADERS
+        elif self.conn.params.enable_connect_protocol:
+            valid_pseudo_headers = _EXTENDED_CONNECT_PSEUDO_HEADERS
+        else:
+            valid_pseudo_headers = _REQUEST_PSEUDO_HEADERS
         try:
             # Pseudo-headers must come before any regular headers,
             # and only in the first HEADERS phase.
             has_regular_header = bool(self._phase == constants.HTTPPhase.TRAILERS)
-            for k, v, idx in self.conn.hpack_decoder.decode(bytearray(data)):
-                if k != k.lower():
-                    # RFC section 8.1.2
-                    raise StreamError(self.stream_id,
-                                      constants.ErrorCode.PROTOCOL_ERROR)
-                if k.startswith(b':'):
-                    if self.conn.is_client:
-                        valid_pseudo_headers = (b':status',)
-                    else:
-                        valid_pseudo_headers = (b':method', b':scheme',
-                                                b':authority', b':path')
+            for k, v, idx in self.conn.hpack_decoder.decode(
+                    bytearray(data), self.conn.params.max_header_size):
+                if k[:1] == b':':
+                    # The valid names are lowercase, so this also
+                    # covers RFC section 8.1.2.
                     if (has_regular_header or
                             k not in valid_pseudo_headers or
                             native_str(k) in pseudo_headers):
@@ -156,22 +360,50 @@ class Stream(object):
                                           constants.ErrorCode.PROTOCOL_ERROR)
                     pseudo_headers[native_str(k)] = native_str(v)
                     if k == b":authority":
-                        headers.add("Host", native_str(v))
+                        headers.add_raw(b"host", v)
                 else:
-                    headers.add(native_str(k),  native_str(v))
+                    name = intern_name(k)
+                    if name is None:
+                        if k != k.lower():
+                            # RFC section 8.1.2
+                            raise StreamError(
+                                self.stream_id,
+                                constants.ErrorCode.PROTOCOL_ERROR)
+                        name = k
+                    headers.add_raw(name, v)
                     has_regular_header = True
+        except HeaderListTooLarge:
+            if self._phase != constants.HTTPPhase.HEADERS:
+                raise StreamError(self.stream_id,
+                                  constants.ErrorCode.ENHANCE_YOUR_CALM)
+            self._reject_headers()
+            if not self._maybe_end_stream(frame.flags):
+                # Don't accept a body for the rejected request.
+                self.reset()
+            return
         except HpackError:
             raise ConnectionError(constants.ErrorCode.COMPRESSION_ERROR)
         if self._phase == constants.HTTPPhase.HEADERS:
+            if self.timings.headers_decoded is None:
+                self.timings.headers_decoded = _now()
             self._start_request(pseudo_headers, headers)
+            if self._check_body_size():
+                return
         elif self._phase == constants.HTTPPhase.TRAILERS:
-            # TODO: support trailers
-            pass
-        if (not self._maybe_end_stream(frame.flags) and
-                self._phase == constants.HTTPPhase.TRAILERS):
-            # The frame that finishes the trailers must also finish
-            # the stream.
-            raise StreamError(self.stream_id, constants.ErrorCode.PROTOCOL_ERROR)
+            if not frame.flags & constants.FrameFlag.END_STREAM:
+                # The frame that finishes the trailers must also finish
+                # the stream.
+                raise StreamError(self.stream_id,
+                                  constants.ErrorCode.PROTOCOL_ERROR)
+            self.trailers = headers
+            trailers_received = getattr(self.orig_delegate,
+                                        'trailers_received', None)
+            if self._delegate_started and trailers_received is not None:
+                trailers_received(headers)
+        if not self._maybe_end_stream(frame.flags):
+            if (self._phase == constants.HTTPPhase.BODY and
+                    self._tunnel is None and 'body' not in self._timers):
+                self._set_timeout('body', self._body_timeout)
 
     def _start_request(self, pseudo_headers, headers):
         if "connection" in headers:
@@ -189,6 +421,9 @@ class Stream(object):
                                       constants.ErrorCode.PROTOCOL_ERROR)
             start_line = RequestStartLine(pseudo_headers[':method'],
                                           pseudo_headers[':path'], 'HTTP/2.0')
+            if ':protocol' in pseudo_headers:
+                start_line = self._start_tunnel(start_line, pseudo_headers,
+                                                headers)
             self._request_start_line = start_line
 
         if (self.conn.is_client and
@@ -203,6 +438,48 @@ class Stream(object):
 
         self._delegate_started = True
         self.delegate.headers_received(start_line, headers)
+        if self._tunnel is not None:
+            # The rest of the stream is the tunnel's, so the request is
+            # complete as far as the delegate is concerned.
+            self._delegate_started = False
+            self.delegate.finish()
+
+    def _start_tunnel(self, start_line, pseudo_headers, headers):
+        """Handles an extended CONNECT request (RFC 8441).
+
+        A WebSocket request is passed to the delegate as the HTTP/1.1
+        upgrade request that `tornado.websocket.WebSocketHandler`
+        expects; other protocols as a CONNECT request with the protocol
+        in ``tunnel_protocol``. Returns the start line to use.
+        """
+        if start_line.method != 'CONNECT' or ':authority' not in pseudo_headers:
+            raise StreamError(self.stream_id,
+                              constants.ErrorCode.PROTOCOL_ERROR)
+        self.tunnel_protocol = pseudo_headers[':protocol']
+        self._tunnel = TunnelStream(self)
+        if self.tunnel_protocol != 'websocket':
+            return start_line
+        headers.add_raw(b'upgrade', b'websocket')
+        headers.add_raw(b'connection', b'Upgrade')
+        if 'sec-websocket-key' not in headers:
+            headers.add_raw(b'sec-websocket-key', _WEBSOCKET_KEY)
+        return RequestStartLine('GET', start_line.path, 'HTTP/2.0')
+
+    def detach(self):
+        """Returns the `.TunnelStream` of an accepted extended CONNECT
+        request, as `.HTTP1Connection.detach` returns its `.IOStream`.
+        """
+        if not self._tunnel_open:
+            raise HTTPOutputError("Only an accepted extended CONNECT "
+                                  "stream can be detached")
+        return self._tunnel
+
+    def _end_tunnel(self):
+        if not self._end_stream_sent and not self.conn.stream.closed():
+            if self._write_queue:
+                self._queue_write(None)
+            else:
+                self._write_end_stream()
 
     def _handle_data_frame(self, frame):
         if self._header_frames:
@@ -213,22 +490,51 @@ class Stream(object):
                                   "DATA after trailers")
         self._phase = constants.HTTPPhase.BODY
         frame = frame.without_padding()
+        if self._tunnel is not None:
+            if frame.data:
+                self._tunnel._data_received(frame.data)
+            if self._maybe_end_stream(frame.flags):
+                self._tunnel._eof_received()
+            return
         if self._incoming_content_remaining is not None:
             self._incoming_content_remaining -= len(frame.data)
             if self._incoming_content_remaining < 0:
                 raise StreamError(self.stream_id, constants.ErrorCode.PROTOCOL_ERROR)
+        self._received_body_size += len(frame.data)
+        if self._check_body_size():
+            # The data still counts against the connection's window.
+            self.conn._write_frame(Frame(constants.FrameType.WINDOW_UPDATE,
+                                         0, 0, struct.pack('>I',
+                                                           len(frame.data))))
+            return
         if frame.data and self._delegate_started:
             future = self.delegate.data_received(frame.data)
             if future is None:
                 self._send_window_update(len(frame.data))
             else:
                 IOLoop.current().add_future(
-                    future, lambda f: self._send_window_update(len(frame.data)))
+                    future, functools.partial(self._on_data_handled,
+                                              len(frame.data)))
         self._maybe_end_stream(frame.flags)
 
+    def _on_data_handled(self, amount, future):
+        try:
+            future.result()
+        except Exception:
+            if not self.closed:
+                # As HTTP1Connection closes the connection.
+                gen_log.error("Uncaught exception handling data on stream "
+                              "%d from %s", self.stream_id, self.context,
+                              exc_info=True)
+                self._abort(constants.ErrorCode.INTERNAL_ERROR)
+        self._send_window_update(amount)
+
     def _send_window_update(self, amount):
+        if self.conn.stream.closed():
+            return
         encoded = struct.pack('>I', amount)
-        for stream_id in (0, self.stream_id):
+        # Once the stream is closed, only the connection's window matters.
+        for stream_id in (0,) if self.closed else (0, self.stream_id):
             self.conn._write_frame(Frame(
                 constants.FrameType.WINDOW_UPDATE, 0,
                 stream_id, encoded))
@@ -238,10 +544,13 @@ class Stream(object):
             if (self._incoming_content_remaining is not None and
                     self._incoming_content_remaining != 0):
                 raise StreamError(self.stream_id, constants.ErrorCode.PROTOCOL_ERROR)
+            self._cancel_timeout('body')
+            self.timings.body_received = _now()
             if self._delegate_started:
                 self._delegate_started = False
                 self.delegate.finish()
             self.finish_future.set_result(None)
+            self._maybe_close()
             return True
         return False
 
@@ -255,25 +564,170 @@ class Stream(object):
         if len(frame.data) != 4:
             raise ConnectionError(constants.ErrorCode.FRAME_SIZE_ERROR)
         # TODO: expose error code?
-        if self._delegate_started:
-            self.delegate.on_connection_close()
+        self._close()
+        self._notify_closed()
 
     def _handle_window_update_frame(self, frame):
         self.window.apply_window_update(frame)
 
     def set_close_callback(self, callback):
-        # TODO: this shouldn't be necessary
-        pass
+        """Sets a callback to run if the stream is reset, or the
+        connection lost, before the response is complete, as
+        `.HTTP1Connection` does for its connection.
+
+        `.RequestHandler` uses this to call its ``on_connection_close``,
+        so a handler can stop producing a response nobody will read.
+        """
+        self._close_callback = callback
+
+    def reset(self, code=constants.ErrorCode.NO_ERROR):
+        """Abandons the stream, sending RST_STREAM with ``code``.
+
+        Pending writes fail with `.StreamClosedError`, as do later
+        ones. On the client side, so does ``read_response``.
+        """
+        if self.closed:
+            return
+        self._close()
+        if self._header_frames:
+            # The rest of the header block may still arrive, and must be
+            # decoded with the part we have.
+            data = b''.join(f.data for f in self._header_frames)
+            if self._header_frames[0].flags & constants.FrameFlag.PRIORITY:
+                data = data[5:]
+            self.conn._discarded_header_block = bytearray(data)
+            self._header_frames = []
+        self.conn._record_reset(self.stream_id)
+        if not self.conn.stream.closed():
+            self.conn._write_frame(Frame(constants.FrameType.RST_STREAM, 0,
+                                         self.stream_id,
+                                         struct.pack('>I', code.code)))
+        if self.conn.is_client:
+            self._fail_finish_future()
+
+    def _fail_finish_future(self):
+        if not self.finish_future.done():
+            self.finish_future.set_exception(StreamClosedError())
+            # read_response may never be called (for example, if the
+            # request body was still being written), so don't log it.
+            self.finish_future.exception()
 
-    def reset(self):
-        self.conn._write_frame(Frame(constants.FrameType.RST_STREAM,
-                                     0, self.stream_id, b'\x00\x00\x00\x00'))
+    def _abort(self, code):
+        """Resets the stream and tells the delegate it is gone."""
+        self.reset(code)
+        self._notify_closed()
+
+    def _notify_closed(self):
+        """Tells whoever is waiting for this stream that it is gone:
+        the delegate if it is receiving the message, or else the close
+        callback if our side of the stream is unfinished.
+        """
+        if self.conn.is_client:
+            self._fail_finish_future()
+        if self._delegate_started:
+            self._delegate_started = False
+            self.delegate.on_connection_close()
+        elif not self._end_stream_sent and self._close_callback is not None:
+            callback, self._close_callback = self._close_callback, None
+            IOLoop.current().add_callback(callback)
+
+    def set_body_timeout(self, timeout):
+        """Sets the time allowed for receiving the body, overriding
+        ``params.body_timeout``, as in `.HTTP1Connection`.
+
+        If the body is already being received, its deadline is
+        restarted.
+        """
+        self._body_timeout = timeout
+        if 'body' in self._timers:
+            self._set_timeout('body', timeout)
+
+    def set_max_body_size(self, max_body_size):
+        """Sets the body size limit, overriding ``params.max_body_size``,
+        as in `.HTTP1Connection`.
+        """
+        self._max_body_size = max_body_size
+
+    def _check_body_size(self):
+        """Resets the stream if its body is, or is declared to be,
+        larger than the limit. Returns True if it was reset.
+        """
+        if self._max_body_size is None:
+            return False
+        size = self._received_body_size
+        if self._incoming_content_remaining is not None:
+            size += self._incoming_content_remaining
+        if size <= self._max_body_size:
+            return False
+        gen_log.info("Request body too large on stream %d from %s",
+                     self.stream_id, self.context)
+        self._abort(constants.ErrorCode.CANCEL)
+        return True
+
+    def _set_timeout(self, name, timeout):
+        self._cancel_timeout(name)
+        if timeout is not None:
+            self._timers[name] = TimerWheel.current().call_later(
+                timeout, functools.partial(self._on_timeout, name))
+
+    def _cancel_timeout(self, name):
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            TimerWheel.current().remove(timer)
+
+    def _cancel_timeouts(self):
+        for name in list(self._timers):
+            self._cancel_timeout(name)
+
+    def _on_timeout(self, name):
+        if self._timers.pop(name, None) is None:
+            return
+        gen_log.info("Timeout (%s) on stream %d from %s", name,
+                     self.stream_id, self.context)
+        self._abort(constants.ErrorCode.CANCEL)
+
+    def on_connection_lost(self):
+        """Called by the `.Connection` when it closes with this stream open."""
+        self._close()
+        self._notify_closed()
+
+    def _maybe_close(self):
+        if self._end_stream_sent and self.finish_future.done():
+            self._close()
+        elif (self._end_stream_sent and self._tunnel is not None and
+                not self._tunnel_open):
+            # We refused the tunnel; tell the peer to stop sending.
+            self.reset()
+        elif self._end_stream_sent and not self.conn.is_client:
+            # The response is complete but the request body is not
+            # (for example, it was refused with a 413); RFC 7540
+            # section 8.1 lets us ask the client to stop sending it.
+            self.reset()
+
+    def _close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._cancel_timeouts()
+        # Fail writes waiting for flow control credit.
+        self.window.close()
+        self._fail_queued_writes()
+        if self._tunnel is not None:
+            self._tunnel._on_stream_closed()
+        # Forget closed streams so long-lived connections don't
+        # accumulate them.
+        if self.conn.streams.get(self.stream_id) is self:
+            del self.conn.streams[self.stream_id]
 
     @_reset_on_error
     def write_headers(self, start_line, headers, chunk=None, callback=None):
+        if self.closed:
+            return _closed_future()
+        if self._tunnel is not None:
+            start_line, headers = self._tunnel_response(start_line, headers)
         if (not self.conn.is_client and
             (self._request_start_line.method == 'HEAD' or
-             start_line.code == 304)):
+             start_line.code in (204, 304))):
             self._outgoing_content_remaining = 0
         elif 'Content-Length' in headers:
             self._outgoing_content_remaining = int(headers['Content-Length'])
@@ -286,10 +740,20 @@ class Stream(object):
                                 constants.HeaderIndexMode.YES))
             header_list.append((b':path', utf8(start_line.path),
                                 constants.HeaderIndexMode.NO))
+            if 'Host' in headers:
+                header_list.append((b':authority', utf8(headers['Host']),
+                                    constants.HeaderIndexMode.YES))
         else:
             header_list.append((b':status', utf8(str(start_line.code)),
                                 constants.HeaderIndexMode.YES))
+        constant_fields = []
+        cache = constant_headers if len(constant_headers) else None
         for k, v in headers.get_all():
+            if cache is not None:
+                encoded = cache.get(k, v)
+                if encoded is not None:
+                    constant_fields.append(encoded)
+                    continue
             k = utf8(k.lower())
             if k == b"connection":
                 # Remove the implicit "connection: close", which is not
@@ -297,9 +761,21 @@ class Stream(object):
                 # TODO: move the responsibility for this from httpclient
                 # to http1connection?
                 continue
+            if k == b"host" and self.conn.is_client:
+                # Sent as :authority.
+                continue
             header_list.append((k, utf8(v),
                                 constants.HeaderIndexMode.YES))
         data = bytes(self.conn.hpack_encoder.encode(header_list))
+        if constant_fields:
+            # Every field starts on a byte boundary, so pre-encoded
+            # fields can simply be appended.
+            data += b''.join(constant_fields)
+        self.timings.headers_sent = _now()
+        if self._write_complete_message(data, chunk):
+            if callback is not None:
+                callback()
+            return _done_future()
         frame = Frame(constants.FrameType.HEADERS,
                       constants.FrameFlag.END_HEADERS, self.stream_id,
                       data)
@@ -307,8 +783,74 @@ class Stream(object):
 
         return self.write(chunk, callback)
 
+    def _tunnel_response(self, start_line, headers):
+        """Translates the response to an extended CONNECT request.
+
+        A 2xx response (or the 101 response of a `.WebSocketHandler`)
+        opens the tunnel, and is sent as a 200 without a body.
+        """
+        if start_line.code != 101 and not 200 <= start_line.code < 300:
+            return start_line, headers
+        self._tunnel_open = True
+        # A tunnel lives as long as its users want it to.
+        self._cancel_timeout('stream')
+        if self.tunnel_protocol == 'websocket':
+            upgrade_headers, headers = headers, HTTPHeaders()
+            for k, v in upgrade_headers.get_all():
+                if k.lower() not in _WEBSOCKET_UPGRADE_HEADERS:
+                    headers.add(k, v)
+        return ResponseStartLine('HTTP/2.0', 200, 'OK'), headers
+
+    def _write_complete_message(self, header_data, chunk):
+        """Writes the headers, body and END_STREAM in one socket write,
+        if ``chunk`` is the whole body and fits in one DATA frame and
+        the flow control window.
+
+        This is the common case of a small response written by a
+        single `.RequestHandler.finish`, which sets Content-Length.
+        """
+        body_length = len(chunk) if chunk else 0
+        if (self._outgoing_trailers is not None or
+                self._outgoing_content_remaining != body_length or
+                body_length > self.conn.setting(
+                    constants.Setting.MAX_FRAME_SIZE) or
+                (body_length and self.conn._output_blocked()) or
+                not self.window.try_consume(body_length)):
+            return False
+        self._outgoing_content_remaining = 0
+        if body_length:
+            frames = [
+                Frame(constants.FrameType.HEADERS,
+                      constants.FrameFlag.END_HEADERS, self.stream_id,
+                      header_data),
+                Frame(constants.FrameType.DATA, constants.FrameFlag.END_STREAM,
+                      self.stream_id, chunk),
+            ]
+        else:
+            frames = [
+                Frame(constants.FrameType.HEADERS,
+                      constants.FrameFlag.END_HEADERS |
+                      constants.FrameFlag.END_STREAM,
+                      self.stream_id, header_data),
+            ]
+        self.conn._write_frames(frames)
+        if body_length:
+            self.timings.data_sent()
+        self._end_stream_sent = True
+        self._maybe_close()
+        return True
+
     @_reset_on_error
     def write(self, chunk, callback=None):
+        """Writes ``chunk`` as DATA frames.
+
+        The returned `.Future` resolves once all of ``chunk`` has been
+        sent, which waits for credit in the stream's and connection's
+        flow control windows, so a writer that waits for it (such as a
+        ``body_producer``) is paced by the peer.
+        """
+        if self.closed:
+            return _closed_future()
         if chunk:
             if self._outgoing_content_remaining is not None:
                 self._outgoing_content_remaining -= len(chunk)
@@ -317,48 +859,230 @@ class Stream(object):
                         "Tried to write more data than Content-Length")
         return self._write_chunk(chunk, callback)
 
-    @gen.coroutine
-    def _write_chunk(self, chunk, callback=None):
+    @_reset_on_error
+    def write_file(self, file, offset=0, length=None, callback=None):
+        """Writes ``length`` bytes of ``file``, starting at ``offset``.
+
+        ``file`` is a file object or descriptor; by default the rest of
+        the file is written. The file is mapped into memory and each
+        DATA frame is taken from the mapping as the flow control window
+        allows, so the data is never read into python objects. The file
+        may be closed once the returned `.Future` resolves.
+        """
+        if self.closed:
+            return _closed_future()
+        fd = file if isinstance(file, int) else file.fileno()
+        if length is None:
+            length = max(0, os.fstat(fd).st_size - offset)
+        if self._outgoing_content_remaining is not None:
+            self._outgoing_content_remaining -= length
+            if self._outgoing_content_remaining < 0:
+                raise HTTPOutputError(
+                    "Tried to write more data than Content-Length")
+        if not length:
+            return self._write_chunk(b'', callback)
+        return self._write_mapped_file(fd, offset, length, callback)
+
+    def _write_mapped_file(self, fd, offset, length, callback):
+        mapping = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        if offset + length > len(mapping):
+            mapping.close()
+            raise ValueError("file is shorter than offset + length")
         try:
-            if chunk:
-                yield self.write_lock.acquire()
-                while chunk:
-                    allowance = yield self.window.consume(len(chunk))
-
-                    yield self.conn._write_frame(
-                        Frame(constants.FrameType.DATA, 0,
-                              self.stream_id, chunk[:allowance]))
-                    chunk = chunk[allowance:]
-                self.write_lock.release()
-            if callback is not None:
-                callback()
+            future = self._write_chunk(mapping, callback, offset,
+                                       offset + length)
+        except Exception:
+            _close_mapping(mapping)
+            raise
+        future.add_done_callback(lambda future: _close_mapping(mapping))
+        return future
+
+    def _write_chunk(self, chunk, callback=None, start=0, end=None):
+        if end is None:
+            end = len(chunk) if chunk else 0
+        try:
+            if start < end and not self._write_queue:
+                # Write what the windows allow right away, and only
+                # queue the rest (if any).
+                start = self._write_data_nowait(_view(chunk), start, end)
+            if start >= end:
+                if callback is not None:
+                    callback()
+                return _done_future()
         except Exception:
             self.reset()
             raise
+        return self._queue_write(_QueuedWrite(_view(chunk), start, end,
+                                              callback))
+
+    def _queue_write(self, write):
+        """Queues ``write`` (a `_QueuedWrite`, or None for the end of
+        the stream) and returns a Future for it.
+        """
+        future = Future()
+        if write is not None:
+            future.add_done_callback(_on_write_complete)
+        self._write_queue.append((write, future))
+        if len(self._write_queue) == 1:
+            self._write_queued()
+        return future
+
+    def _write_queued(self):
+        """Writes the queued writes in order, as far as flow control
+        and the connection's output buffer allow, then arranges to be
+        called again when there is room.
+
+        The waits are resumed by callbacks rather than coroutines, so
+        when the stream closes `_fail_queued_writes` settles every
+        queued write at once and nothing is left suspended.
+        """
+        while self._write_queue and not self._write_waiting:
+            write, future = self._write_queue[0]
+            try:
+                if write is not None:
+                    write.start = self._write_data_nowait(
+                        write.data, write.start, write.end)
+                    if write.start < write.end:
+                        self._wait_to_write()
+                        return
+                self._write_queue.popleft()
+                if write is None:
+                    self._write_end_stream()
+                elif write.callback is not None:
+                    write.callback()
+            except Exception:
+                self._write_failed(future)
+                return
+            future.set_result(None)
+
+    def _wait_to_write(self):
+        if self.conn._output_blocked():
+            wait_future = self.conn._output_turn()
+            callback = self._on_output_turn
+        else:
+            window = self.window
+            if window.size > 0:
+                # The connection's window is used up.
+                window = window.parent
+            wait_future = window.cond.wait()
+            callback = self._on_window_credit
+        self._write_waiting = True
+        self._write_wait_start = _now()
+        IOLoop.current().add_future(wait_future, callback)
+
+    def _on_window_credit(self, wait_future):
+        self._write_waiting = False
+        self.timings.flow_control_wait += _now() - self._write_wait_start
+        self._write_queued()
+
+    def _on_output_turn(self, wait_future):
+        # Our turn is to write one frame (if the windows allow it)
+        # before any other stream writes another.
+        self._write_waiting = False
+        self.timings.output_buffer_wait += _now() - self._write_wait_start
+        try:
+            if self._write_queue and not self.closed:
+                write, future = self._write_queue[0]
+                allowance = self.window.consume_nowait(min(
+                    write.end - write.start,
+                    self.conn.setting(constants.Setting.MAX_FRAME_SIZE)))
+                if allowance:
+                    self.conn._write_frame(Frame(
+                        constants.FrameType.DATA, 0, self.stream_id,
+                        write.data[write.start:write.start + allowance]))
+                    write.start += allowance
+                    self.timings.data_sent()
+        except Exception:
+            self._write_failed(future)
+            return
+        finally:
+            self.conn._end_output_turn()
+        self._write_queued()
+
+    def _write_failed(self, future):
+        if self._write_queue and self._write_queue[0][1] is future:
+            self._write_queue.popleft()
+        future.set_exc_info(sys.exc_info())
+        self.reset()
+
+    def _fail_queued_writes(self):
+        writes, self._write_queue = self._write_queue, collections.deque()
+        for write, future in writes:
+            if write is None:
+                # finish() after a reset does nothing.
+                future.set_result(None)
+            else:
+                future.set_exception(StreamClosedError())
+
+    def _write_data_nowait(self, data, start, end):
+        """Writes DATA frames while the flow control windows have
+        credit. Returns the offset of the first unwritten byte.
+        """
+        max_frame_size = self.conn.setting(constants.Setting.MAX_FRAME_SIZE)
+        written = start
+        while start < end and not self.conn._output_blocked():
+            allowance = self.window.consume_nowait(min(end - start,
+                                                       max_frame_size))
+            if not allowance:
+                break
+            self.conn._write_frame(
+                Frame(constants.FrameType.DATA, 0,
+                      self.stream_id, data[start:start + allowance]))
+            start += allowance
+        if start != written:
+            self.timings.data_sent()
+        return start
+
+    def set_trailers(self, trailers):
+        """Sets trailers (an `.HTTPHeaders`) for `finish` to send after
+        the body.
+
+        Must be called before the end of the body is written; in a
+        `.RequestHandler`, before ``finish()``.
+        """
+        if self._end_stream_sent:
+            raise HTTPOutputError("Tried to set trailers after finish")
+        self._outgoing_trailers = trailers
 
     @_reset_on_error
     def finish(self):
+        if self._end_stream_sent or self._tunnel_open or self.closed:
+            # Already finished by _write_complete_message, the stream
+            # now belongs to the tunnel, or it has been reset.
+            return _done_future()
         if (self._outgoing_content_remaining is not None and
                 self._outgoing_content_remaining != 0):
             raise HTTPOutputError(
                 "Tried to write %d bytes less than Content-Length" %
                 self._outgoing_content_remaining)
-        return self._write_end_stream()
+        if self._write_queue:
+            # Callers needn't wait for write() before calling finish.
+            return self._queue_write(None)
+        self._write_end_stream()
+        return _done_future()
 
-    @gen.coroutine
     def _write_end_stream(self):
-        # Callers are not required to wait for write() before calling finish,
-        # so we must manually lock.
-        yield self.write_lock.acquire()
-        try:
+        if self._outgoing_trailers is not None:
+            header_list = []
+            for k, v in self._outgoing_trailers.get_all():
+                k = utf8(k.lower())
+                if k[:1] == b':':
+                    raise HTTPOutputError("Pseudo-headers are not allowed "
+                                          "in trailers")
+                header_list.append((k, utf8(v),
+                                    constants.HeaderIndexMode.YES))
+            data = bytes(self.conn.hpack_encoder.encode(header_list))
+            self.conn._write_frame(Frame(constants.FrameType.HEADERS,
+                                         constants.FrameFlag.END_HEADERS |
+                                         constants.FrameFlag.END_STREAM,
+                                         self.stream_id, data))
+        else:
             self.conn._write_frame(Frame(constants.FrameType.DATA,
                                          constants.FrameFlag.END_STREAM,
                                          self.stream_id, b''))
-        except Exception:
-            self.reset()
-            raise
-        finally:
-            self.write_lock.release()
+            self.timings.data_sent()
+        self._end_stream_sent = True
+        self._maybe_close()
 
     def read_response(self, delegate):
         assert delegate is self.orig_delegate, 'cannot change delegate'
@@ -0,0 +1,241 @@
+from tornado import gen
+from tornado.httpclient import HTTPRequest, HTTPResponse, _RequestProxy
+from tornado.httputil import HTTPHeaders
+from tornado.testing import gen_test
+from tornado.web import Application, RequestHandler
+import unittest
+
+from tornado_http2.cache import HTTPCache
+from tornado_http2.client import ForceHTTP2Client
+from tornado_http2.test.util import AsyncHTTP2TestCase
+
+try:
+    from io import BytesIO
+except ImportError:
+    from cStringIO import StringIO as BytesIO
+
+
+class CacheTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.counts = {}
+        counts = self.counts
+
+        class CountingHandler(RequestHandler):
+            def prepare(self):
+                counts[self.request.path] = counts.get(self.request.path, 0) + 1
+
+        class MaxAgeHandler(CountingHandler):
+            def get(self):
+                self.set_header('Cache-Control', 'max-age=60')
+                self.write('fresh')
+
+        class ETagHandler(CountingHandler):
+            # RequestHandler handles If-None-Match using the automatic Etag.
+            def get(self):
+                self.set_header('Cache-Control', 'no-cache')
+                self.write('validated')
+
+        class SlowETagHandler(CountingHandler):
+            @gen.coroutine
+            def get(self):
+                self.set_header('Cache-Control', 'no-cache')
+                if 'If-None-Match' in self.request.headers:
+                    # A header the stored response doesn't have.
+                    self.set_header('X-Revalidated', 'yes')
+                    yield gen.sleep(0.05)
+                self.write('validated')
+
+        class VaryHandler(CountingHandler):
+            def get(self):
+                self.set_header('Cache-Control', 'max-age=60')
+                self.set_header('Vary', 'Accept-Language')
+                self.write(self.request.headers.get('Accept-Language', ''))
+
+        class NoStoreHandler(CountingHandler):
+            def get(self):
+                self.set_header('Cache-Control', 'no-store')
+                self.write('uncached')
+
+        class SlowHandler(CountingHandler):
+            @gen.coroutine
+            def get(self):
+                yield gen.sleep(0.05)
+                self.set_header('Cache-Control', 'max-age=60')
+                self.write('slow')
+
+            def post(self):
+                pass
+
+        return Application([
+            ('/max_age', MaxAgeHandler),
+            ('/etag', ETagHandler),
+            ('/slow_etag', SlowETagHandler),
+            ('/vary', VaryHandler),
+            ('/no_store', NoStoreHandler),
+            ('/slow', SlowHandler),
+        ])
+
+    def setUp(self):
+        super(CacheTest, self).setUp()
+        self.cache = HTTPCache()
+        self.cached_client = ForceHTTP2Client(io_loop=self.io_loop,
+                                              force_instance=True,
+                                              cache=self.cache)
+
+    def tearDown(self):
+        self.cached_client.close()
+        super(CacheTest, self).tearDown()
+
+    @gen.coroutine
+    def fetch_twice(self, path, **kwargs):
+        url = self.get_url(path)
+        first = yield self.cached_client.fetch(url, **kwargs)
+        second = yield self.cached_client.fetch(url, **kwargs)
+        raise gen.Return((first, second))
+
+    @gen_test
+    def test_fresh(self):
+        first, second = yield self.fetch_twice('/max_age')
+        self.assertEqual(second.body, b'fresh')
+        self.assertEqual(second.headers['Cache-Control'], 'max-age=60')
+        self.assertIn('Age', second.headers)
+        self.assertEqual(self.counts['/max_age'], 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 1, 1))
+
+    @gen_test
+    def test_revalidate(self):
+        first, second = yield self.fetch_twice('/etag')
+        self.assertEqual(second.code, 200)
+        self.assertEqual(second.body, b'validated')
+        self.assertEqual(self.counts['/etag'], 2)
+        self.assertEqual(self.cache.stats().revalidations, 1)
+
+    @gen_test
+    def test_revalidate_new_header(self):
+        url = self.get_url('/slow_etag')
+        yield self.cached_client.fetch(url)
+        # The requests waiting for the revalidation complete too.
+        responses = yield [self.cached_client.fetch(url) for i in range(3)]
+        self.assertEqual([r.body for r in responses], [b'validated'] * 3)
+        self.assertEqual([r.headers.get('X-Revalidated') for r in responses],
+                         ['yes'] * 3)
+        self.assertGreaterEqual(self.cache.stats().collapsed, 2)
+
+    @gen_test
+    def test_vary(self):
+        url = self.get_url('/vary')
+        for lang in ['en', 'fr', 'en']:
+            resp = yield self.cached_client.fetch(
+                url, headers={'Accept-Language': lang})
+            self.assertEqual(resp.body, lang.encode())
+        self.assertEqual(self.counts['/vary'], 2)
+
+    @gen_test
+    def test_no_store(self):
+        first, second = yield self.fetch_twice('/no_store')
+        self.assertEqual(self.counts['/no_store'], 2)
+        self.assertEqual(self.cache.stats().entries, 0)
+
+    @gen_test
+    def test_request_no_cache(self):
+        yield self.fetch_twice('/max_age', headers={'Cache-Control': 'no-cache'})
+        self.assertEqual(self.counts['/max_age'], 2)
+
+    @gen_test
+    def test_collapse(self):
+        url = self.get_url('/slow')
+        responses = yield [self.cached_client.fetch(url) for i in range(3)]
+        self.assertEqual([r.body for r in responses], [b'slow'] * 3)
+        self.assertEqual(self.counts['/slow'], 1)
+        self.assertEqual(self.cache.stats().collapsed, 2)
+
+    @gen_test
+    def test_cancel_revalidation(self):
+        url = self.get_url('/slow_etag')
+        yield self.cached_client.fetch(url)
+        request = HTTPRequest(url)
+        response_future = self.cached_client.fetch(request, raise_error=False)
+        self.assertTrue(self.cached_client.cancel(request))
+        response = yield response_future
+        self.assertEqual(response.code, 599)
+
+    @gen_test
+    def test_unsafe_method_invalidates(self):
+        url = self.get_url('/slow')
+        yield self.cached_client.fetch(url)
+        yield self.cached_client.fetch(url, method='POST', body=b'')
+        self.assertEqual(self.cache.stats().entries, 0)
+        yield self.cached_client.fetch(url)
+        self.assertEqual(self.counts['/slow'], 3)
+
+
+class LRUTest(unittest.TestCase):
+    def fetch(self, cache, url):
+        def fetch_impl(request, callback):
+            self.upstream.append(request.url)
+            headers = HTTPHeaders({'Cache-Control': 'max-age=60'})
+            callback(HTTPResponse(request, 200, headers=headers,
+                                  buffer=BytesIO(b'a' * 1000),
+                                  effective_url=request.url))
+        responses = []
+        request = _RequestProxy(HTTPRequest(url), dict(decompress_response=True))
+        cache.fetch(request, responses.append, fetch_impl)
+        self.assertEqual(responses[0].body, b'a' * 1000)
+
+    def test_eviction(self):
+        self.upstream = []
+        # Room for two responses.
+        cache = HTTPCache(max_size=3000)
+        for url in ['/a', '/b', '/a', '/c', '/a', '/b']:
+            self.fetch(cache, 'http://example.com' + url)
+        self.assertEqual(self.upstream, ['http://example.com/a',
+                                         'http://example.com/b',
+                                         'http://example.com/c',
+                                         'http://example.com/b'])
+        stats = cache.stats()
+        self.assertEqual((stats.entries, stats.evictions), (2, 2))
+        self.assertLessEqual(stats.size, 3000)
+
+
+class ErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = HTTPCache()
+        self.upstream = []
+        self.responses = []
+
+    def fetch(self, fetch_impl, callback=None):
+        request = _RequestProxy(HTTPRequest('http://example.com/'),
+                                dict(decompress_response=True))
+        self.cache.fetch(request, callback or self.responses.append,
+                         fetch_impl)
+
+    def deferred_fetch_impl(self, request, callback):
+        self.upstream.append((request, callback))
+
+    def respond(self, request, callback):
+        callback(HTTPResponse(request, 200,
+                              headers=HTTPHeaders(), buffer=BytesIO(b'a'),
+                              effective_url='http://example.com/'))
+
+    def test_callback_error(self):
+        def fail(response):
+            raise ZeroDivisionError()
+        self.fetch(self.deferred_fetch_impl, fail)
+        self.fetch(self.deferred_fetch_impl)
+        self.assertEqual(len(self.upstream), 1)
+        with self.assertRaises(ZeroDivisionError):
+            self.respond(*self.upstream[0])
+        # The waiting request was sent on its own.
+        self.assertEqual(len(self.upstream), 2)
+        self.respond(*self.upstream[1])
+        self.assertEqual([r.body for r in self.responses], [b'a'])
+
+    def test_fetch_impl_error(self):
+        def fail(request, callback):
+            raise ZeroDivisionError()
+        with self.assertRaises(ZeroDivisionError):
+            self.fetch(fail)
+        # Later requests aren't left waiting for it.
+        self.fetch(self.deferred_fetch_impl)
+        self.assertEqual(len(self.upstream), 1)
@@ -0,0 +1,406 @@
+import ssl
+import struct
+import unittest
+
+from tornado.concurrent import Future
+from tornado import gen
+from tornado.httpclient import HTTPRequest
+from tornado.iostream import StreamClosedError
+from tornado.testing import gen_test
+from tornado.web import Application, RequestHandler, stream_request_body
+
+from tornado_http2 import constants
+from tornado_http2.client import ForceHTTP2Client, _PooledConnection
+from tornado_http2.connection import Connection
+from tornado_http2.test.util import AsyncHTTP2TestCase
+from tornado_http2.trace import RECEIVED, parse_frame
+
+
+class ConnectionPoolTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.connections = []
+        self.misdirected = 0
+        self.hang_started = False
+        self.hang_closed = Future()
+        test = self
+
+        class ConnHandler(RequestHandler):
+            def prepare(self):
+                # The client's address identifies the TCP connection.
+                address = self.request.connection.context.address
+                if address not in test.connections:
+                    test.connections.append(address)
+
+            def get(self):
+                self.write('ok')
+
+        class SlowHandler(ConnHandler):
+            @gen.coroutine
+            def get(self):
+                yield gen.sleep(0.2)
+                self.write('slow')
+
+        class HangHandler(ConnHandler):
+            @gen.coroutine
+            def get(self):
+                test.hang_started = True
+                yield test.hang_closed
+
+            def on_connection_close(self):
+                test.hang_closed.set_result(None)
+
+        class MisdirectedHandler(ConnHandler):
+            def get(self):
+                if test.misdirected == 0:
+                    test.misdirected += 1
+                    self.set_status(421, 'Misdirected Request')
+                    self.write('misdirected')
+                else:
+                    self.write(self.request.host)
+
+        return Application([
+            ('/hello', ConnHandler),
+            ('/slow', SlowHandler),
+            ('/hang', HangHandler),
+            ('/misdirected', MisdirectedHandler),
+        ])
+
+    def setUp(self):
+        super(ConnectionPoolTest, self).setUp()
+        self.client = ForceHTTP2Client(io_loop=self.io_loop,
+                                       force_instance=True)
+
+    def tearDown(self):
+        self.client.close()
+        super(ConnectionPoolTest, self).tearDown()
+
+    def pooled_connections(self):
+        return list(self.client._pool._by_stream.values())
+
+    @gen_test
+    def test_sequential_reuse(self):
+        for i in range(3):
+            resp = yield self.client.fetch(self.get_url('/hello'))
+            self.assertEqual(resp.body, b'ok')
+        self.assertEqual(len(self.connections), 1)
+        # Finished streams are not kept around.
+        self.assertEqual(self.pooled_connections()[0].conn.streams, {})
+
+    @gen_test
+    def test_concurrent_reuse(self):
+        responses = yield [self.client.fetch(self.get_url('/hello'))
+                           for i in range(5)]
+        self.assertEqual([r.body for r in responses], [b'ok'] * 5)
+        self.assertEqual(len(self.connections), 1)
+
+    @gen_test
+    def test_max_concurrent_streams(self):
+        yield self.client.fetch(self.get_url('/hello'))
+        pooled, = self.pooled_connections()
+        pooled.conn._settings[
+            constants.Setting.MAX_CONCURRENT_STREAMS.code] = 1
+        responses = yield [self.client.fetch(self.get_url('/hello'))
+                           for i in range(2)]
+        self.assertEqual([r.body for r in responses], [b'ok'] * 2)
+        self.assertEqual(len(self.connections), 2)
+
+    @gen_test
+    def test_timeout_keeps_connection(self):
+        slow = self.client.fetch(self.get_url('/slow'), request_timeout=0.05,
+                                 raise_error=False)
+        resp = yield self.client.fetch(self.get_url('/hello'))
+        self.assertEqual(resp.body, b'ok')
+        resp = yield slow
+        self.assertEqual(resp.code, 599)
+        resp = yield self.client.fetch(self.get_url('/hello'))
+        self.assertEqual(resp.body, b'ok')
+        self.assertEqual(len(self.connections), 1)
+
+    @gen_test
+    def test_cancel(self):
+        yield self.client.fetch(self.get_url('/hello'))
+        request = HTTPRequest(self.get_url('/hang'))
+        future = self.client.fetch(request, raise_error=False)
+        while not self.hang_started:
+            yield gen.sleep(0.01)
+        self.assertTrue(self.client.cancel(request))
+        resp = yield future
+        self.assertEqual(resp.code, 599)
+        self.assertEqual(str(resp.error), 'HTTP 599: Canceled')
+        # The server is told, and the connection stays open.
+        yield self.hang_closed
+        self.assertFalse(self.client.cancel(request))
+        resp = yield self.client.fetch(self.get_url('/hello'))
+        self.assertEqual(resp.body, b'ok')
+        self.assertEqual(len(self.connections), 1)
+
+    @gen_test
+    def test_cancel_queued(self):
+        client = ForceHTTP2Client(io_loop=self.io_loop, force_instance=True,
+                                  max_clients=1)
+        try:
+            first = client.fetch(self.get_url('/slow'))
+            request = HTTPRequest(self.get_url('/hello'))
+            # Can't run until the first request has its connection.
+            second = client.fetch(request, raise_error=False)
+            self.assertTrue(client.cancel(request))
+            resp = yield second
+            self.assertEqual(resp.code, 599)
+            resp = yield first
+            self.assertEqual(resp.body, b'slow')
+        finally:
+            client.close()
+
+    @gen_test
+    def test_server_close(self):
+        yield self.client.fetch(self.get_url('/hello'))
+        yield self.http_server.close_all_connections()
+        while self.pooled_connections():
+            yield gen.sleep(0.01)
+        resp = yield self.client.fetch(self.get_url('/hello'))
+        self.assertEqual(resp.body, b'ok')
+        self.assertEqual(len(self.connections), 2)
+
+    @gen_test
+    def test_misdirected_retry(self):
+        yield self.client.fetch(self.get_url('/hello'))
+        pooled, = self.pooled_connections()
+        # Pretend the connection was coalesced for "localhost".
+        key = ('localhost', self.get_http_port(), None)
+        self.client._pool._register(pooled, key)
+        url = 'http://localhost:%d/misdirected' % self.get_http_port()
+        resp = yield self.client.fetch(url)
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.body,
+                         ('localhost:%d' % self.get_http_port()).encode())
+        self.assertEqual(resp.request.url, url)
+        self.assertEqual(len(self.connections), 2)
+        self.assertIn('localhost', pooled.misdirected)
+        self.assertNotIn(key, pooled.keys)
+
+
+class FetchManyTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.addresses = set()
+        addresses = self.addresses
+
+        class SleepHandler(RequestHandler):
+            @gen.coroutine
+            def get(self):
+                addresses.add(self.request.connection.context.address)
+                yield gen.sleep(float(self.get_argument('t')))
+                self.write(self.get_argument('t'))
+
+        return Application([('/sleep', SleepHandler)])
+
+    def setUp(self):
+        super(FetchManyTest, self).setUp()
+        self.client = ForceHTTP2Client(io_loop=self.io_loop,
+                                       force_instance=True)
+
+    def tearDown(self):
+        self.client.close()
+        super(FetchManyTest, self).tearDown()
+
+    @gen.coroutine
+    def collect(self, responses):
+        results = {}
+        while not responses.done():
+            response = yield responses.next()
+            results[responses.current_index] = response
+        raise gen.Return(results)
+
+    @gen_test
+    def test_fan_out(self):
+        # More requests than max_clients (10), each taking 0.2s.
+        urls = [self.get_url('/sleep?t=0.2&i=%d' % i) for i in range(30)]
+        start = self.io_loop.time()
+        results = yield self.collect(self.client.fetch_many(urls))
+        self.assertLess(self.io_loop.time() - start, 0.5)
+        self.assertEqual(sorted(results), list(range(30)))
+        for i, response in results.items():
+            self.assertEqual(response.request.url, urls[i])
+            self.assertEqual(response.body, b'0.2')
+        self.assertEqual(len(self.addresses), 1)
+
+    @gen_test
+    def test_completion_order(self):
+        urls = [self.get_url('/sleep?t=%s' % t) for t in ('0.2', '0', '0.1')]
+        responses = self.client.fetch_many(urls)
+        order = []
+        while not responses.done():
+            yield responses.next()
+            order.append(responses.current_index)
+        self.assertEqual(order, [1, 2, 0])
+
+    @gen_test
+    def test_timeouts(self):
+        urls = [self.get_url('/sleep?t=%s' % t) for t in ('0', '0.2', '1')]
+        start = self.io_loop.time()
+        results = yield self.collect(self.client.fetch_many(
+            urls, request_timeout=0.1))
+        self.assertEqual(results[0].body, b'0')
+        self.assertEqual([results[i].code for i in (1, 2)], [599, 599])
+        self.assertLess(self.io_loop.time() - start, 0.5)
+
+        start = self.io_loop.time()
+        results = yield self.collect(self.client.fetch_many(
+            urls, timeout=0.3))
+        self.assertEqual([r.code for i, r in sorted(results.items())],
+                         [200, 200, 599])
+        self.assertLess(self.io_loop.time() - start, 0.6)
+
+
+class StreamingTest(AsyncHTTP2TestCase):
+    # Larger than the default flow control windows.
+    SIZE = 1024 * 1024
+    CHUNK = 16 * 1024
+
+    def get_app(self):
+        test = self
+        self.sent = 0
+        self.received = 0
+        self.server_gate = Future()
+
+        class DownloadHandler(RequestHandler):
+            @gen.coroutine
+            def get(self):
+                for i in range(test.SIZE // test.CHUNK):
+                    self.write(b'x' * test.CHUNK)
+                    try:
+                        yield self.flush()
+                    except StreamClosedError:
+                        return
+                    test.sent += test.CHUNK
+
+        @stream_request_body
+        class UploadHandler(RequestHandler):
+            def data_received(self, chunk):
+                test.received += len(chunk)
+                return test.server_gate
+
+            def post(self):
+                self.write(str(test.received))
+
+        return Application([('/download', DownloadHandler),
+                            ('/upload', UploadHandler)])
+
+    def get_httpserver_options(self):
+        return dict(trace_frames=1000)
+
+    def reset_codes(self):
+        codes = []
+        for conn in self.http_server._connections:
+            if not isinstance(conn, Connection):
+                continue
+            for record in conn.trace.records():
+                frame = parse_frame(record.data)
+                if (record.direction == RECEIVED and
+                        frame.type == constants.FrameType.RST_STREAM):
+                    codes.append(struct.unpack('>I', frame.data)[0])
+        return codes
+
+    def setUp(self):
+        super(StreamingTest, self).setUp()
+        self.client = ForceHTTP2Client(io_loop=self.io_loop,
+                                       force_instance=True)
+
+    def tearDown(self):
+        self.client.close()
+        super(StreamingTest, self).tearDown()
+
+    @gen_test
+    def test_streaming_callback_backpressure(self):
+        chunks = []
+        gate = Future()
+
+        def streaming_callback(chunk):
+            chunks.append(chunk)
+            return gate
+        response_future = self.client.fetch(
+            self.get_url('/download'), streaming_callback=streaming_callback)
+        yield gen.sleep(0.2)
+        # Later chunks wait for the first, and without WINDOW_UPDATEs
+        # the server can't get far ahead.
+        self.assertEqual(len(chunks), 1)
+        self.assertLess(self.sent, self.SIZE // 4)
+        self.assertFalse(response_future.done())
+        gate.set_result(None)
+        response = yield response_future
+        self.assertEqual(response.body, b'')
+        self.assertEqual(b''.join(chunks), b'x' * self.SIZE)
+
+    @gen_test
+    def test_streaming_callback_error(self):
+        def streaming_callback(chunk):
+            future = Future()
+            future.set_exception(ZeroDivisionError())
+            return future
+        response = yield self.client.fetch(
+            self.get_url('/download'), streaming_callback=streaming_callback,
+            raise_error=False)
+        self.assertEqual(response.code, 599)
+        self.assertIsInstance(response.error, ZeroDivisionError)
+        while not self.reset_codes():
+            yield gen.sleep(0.01)
+        self.assertEqual(self.reset_codes(), [constants.ErrorCode.CANCEL.code])
+
+    @gen_test
+    def test_body_producer_backpressure(self):
+        written = [0]
+
+        @gen.coroutine
+        def body_producer(write):
+            for i in range(self.SIZE // self.CHUNK):
+                yield write(b'x' * self.CHUNK)
+                written[0] += self.CHUNK
+        response_future = self.client.fetch(
+            self.get_url('/upload'), method='POST',
+            body_producer=body_producer)
+        yield gen.sleep(0.2)
+        # The server holds back WINDOW_UPDATEs, so writes stop
+        # resolving once the windows are used up.
+        self.assertLess(written[0], self.SIZE // 4)
+        self.assertFalse(response_future.done())
+        self.server_gate.set_result(None)
+        response = yield response_future
+        self.assertEqual(written[0], self.SIZE)
+        self.assertEqual(response.body, str(self.SIZE).encode())
+
+
+class CoalesceTest(unittest.TestCase):
+    def setUp(self):
+        self.ssl_options = ssl.create_default_context()
+        cert = {'subjectAltName': (('DNS', 'example.com'),
+                                   ('DNS', '*.example.com'))}
+        self.pooled = _PooledConnection(None, 'example.com', 443,
+                                        self.ssl_options, '192.0.2.1', cert)
+
+    def can_coalesce(self, host, address='192.0.2.1', port=443,
+                     ssl_options=None):
+        return self.pooled.can_coalesce(host, port,
+                                        ssl_options or self.ssl_options,
+                                        set([address]))
+
+    def test_coalesce(self):
+        self.assertTrue(self.can_coalesce('www.example.com'))
+
+    def test_not_covered_by_cert(self):
+        self.assertFalse(self.can_coalesce('example.org'))
+        self.assertFalse(self.can_coalesce('a.b.example.com'))
+
+    def test_different_address(self):
+        self.assertFalse(self.can_coalesce('www.example.com', '192.0.2.2'))
+
+    def test_different_port_or_options(self):
+        self.assertFalse(self.can_coalesce('www.example.com', port=8443))
+        self.assertFalse(self.can_coalesce(
+            'www.example.com', ssl_options=ssl.create_default_context()))
+
+    def test_misdirected(self):
+        self.pooled.misdirected.add('www.example.com')
+        self.assertFalse(self.can_coalesce('www.example.com'))
+
+    def test_no_cert(self):
+        self.pooled.cert = None
+        self.assertFalse(self.can_coalesce('example.com'))
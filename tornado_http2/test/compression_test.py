@@ -0,0 +1,239 @@
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from tornado.concurrent import Future, dummy_executor
+from tornado import gen
+from tornado.log import gen_log
+from tornado.testing import ExpectLog, gen_test
+from tornado.web import Application, RequestHandler, stream_request_body
+
+from tornado_http2.compression import PrecompressedCache, gzip_compress
+from tornado_http2.test.util import AsyncHTTP2TestCase
+from tornado_http2.web import StaticFileHandler
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+
+class CountingExecutor(object):
+    def __init__(self):
+        if ThreadPoolExecutor is not None:
+            self.executor = ThreadPoolExecutor(2)
+        else:
+            self.executor = dummy_executor
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        return self.executor.submit(fn, *args)
+
+
+class ManualExecutor(object):
+    """Runs submitted functions when ``run`` is called."""
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.calls.append((future, fn, args))
+        return future
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for future, fn, args in calls:
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+
+def _gunzip(data):
+    return gzip.GzipFile(fileobj=io.BytesIO(data)).read()
+
+
+# Compressible, and large compared to the flow control windows.
+_CONTENT = b''.join(b'%07d\n' % i for i in range(200000))
+
+
+class OffloadedDecompressionTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        test = self
+        self.received = 0
+        self.gate = Future()
+
+        class HashHandler(RequestHandler):
+            def post(self):
+                self.write(hashlib.sha1(self.request.body).hexdigest())
+
+        @stream_request_body
+        class SlowHandler(RequestHandler):
+            def prepare(self):
+                self.sha1 = hashlib.sha1()
+
+            def data_received(self, chunk):
+                test.received += len(chunk)
+                self.sha1.update(chunk)
+                return test.gate
+
+            def post(self):
+                self.write(self.sha1.hexdigest())
+
+        return Application([('/hash', HashHandler), ('/slow', SlowHandler)])
+
+    def get_httpserver_options(self):
+        self.executor = CountingExecutor()
+        return dict(decompress_request=True,
+                    compression_executor=self.executor,
+                    compression_threshold=1000)
+
+    def post(self, path, body, **kwargs):
+        return self.http_client.fetch(
+            self.get_url(path), method='POST', body=body,
+            headers={'Content-Encoding': 'gzip'}, **kwargs)
+
+    def check(self, response, body):
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.body,
+                         hashlib.sha1(body).hexdigest().encode())
+
+    @gen_test
+    def test_offloaded(self):
+        response = yield self.post('/hash', gzip_compress(_CONTENT))
+        self.check(response, _CONTENT)
+        self.assertGreater(self.executor.submitted, 0)
+
+    @gen_test
+    def test_small_body_inline(self):
+        body = gzip_compress(b'hello' * 100)
+        self.assertLess(len(body), 1000)
+        response = yield self.post('/hash', body)
+        self.check(response, b'hello' * 100)
+        self.assertEqual(self.executor.submitted, 0)
+
+    @gen_test
+    def test_invalid(self):
+        with ExpectLog(gen_log, 'Uncaught exception handling data'):
+            response = yield self.post('/hash', b'x' * 10000,
+                                       raise_error=False)
+        self.assertEqual(response.code, 599)
+        # Other streams are unaffected.
+        response = yield self.post('/hash', gzip_compress(_CONTENT))
+        self.check(response, _CONTENT)
+
+    @gen_test
+    def test_backpressure(self):
+        body = gzip_compress(os.urandom(1024 * 1024))
+        response_future = self.post('/slow', body)
+        yield gen.sleep(0.2)
+        # The handler has only seen the first inflated chunk, and the
+        # later ones wait for it rather than piling up.
+        submitted = self.executor.submitted
+        self.assertLess(self.received, 256 * 1024)
+        yield gen.sleep(0.1)
+        self.assertEqual(self.executor.submitted, submitted)
+        self.gate.set_result(None)
+        response = yield response_future
+        self.check(response, _gunzip(body))
+
+
+class PrecompressedStaticTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.cache = PrecompressedCache(executor=self.executor)
+        return Application([
+            ('/static/(.*)', StaticFileHandler,
+             dict(path=self.static_path, precompressed_cache=self.cache)),
+        ])
+
+    def setUp(self):
+        self.executor = ManualExecutor()
+        self.static_path = tempfile.mkdtemp()
+        with open(os.path.join(self.static_path, 'data.txt'), 'wb') as f:
+            f.write(_CONTENT)
+        with open(os.path.join(self.static_path, 'data.bin'), 'wb') as f:
+            f.write(_CONTENT)
+        StaticFileHandler.reset()
+        super(PrecompressedStaticTest, self).setUp()
+
+    def tearDown(self):
+        super(PrecompressedStaticTest, self).tearDown()
+        shutil.rmtree(self.static_path)
+
+    def fetch_gzip(self, path, **kwargs):
+        # Keep the response compressed, to see what was sent.
+        kwargs.setdefault('headers', {})['Accept-Encoding'] = 'gzip'
+        return self.fetch(path, decompress_response=False, **kwargs)
+
+    def test_compressed_in_background(self):
+        resp = self.fetch_gzip('/static/data.txt')
+        self.assertEqual(resp.body, _CONTENT)
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertEqual(resp.headers['Vary'], 'Accept-Encoding')
+        etag = resp.headers['Etag']
+        self.assertEqual(len(self.executor.calls), 1)
+        # Requests while it is compressed don't compress it again.
+        self.fetch_gzip('/static/data.txt')
+        self.assertEqual(len(self.executor.calls), 1)
+        self.executor.run()
+
+        resp = self.fetch_gzip('/static/data.txt')
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(int(resp.headers['Content-Length']), len(resp.body))
+        self.assertEqual(_gunzip(resp.body), _CONTENT)
+        self.assertNotEqual(resp.headers['Etag'], etag)
+        self.assertEqual(len(self.executor.calls), 0)
+
+        resp = self.fetch_gzip('/static/data.txt',
+                               headers={'If-None-Match':
+                                        resp.headers['Etag']})
+        self.assertEqual(resp.code, 304)
+
+    def test_not_compressed(self):
+        self.fetch_gzip('/static/data.txt')
+        self.executor.run()
+        # Clients that don't accept gzip, and range requests.
+        resp = self.fetch('/static/data.txt', decompress_response=False)
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertEqual(resp.body, _CONTENT)
+        resp = self.fetch_gzip('/static/data.txt',
+                               headers={'Range': 'bytes=0-99'})
+        self.assertEqual(resp.code, 206)
+        self.assertEqual(resp.body, _CONTENT[:100])
+        # Types that don't compress well.
+        resp = self.fetch_gzip('/static/data.bin')
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertNotIn('Vary', resp.headers)
+        self.assertEqual(self.executor.calls, [])
+
+
+class PrecompressedCacheTest(unittest.TestCase):
+    def test_inline(self):
+        cache = PrecompressedCache()
+        future = cache.add('a', lambda: b'aaaa')
+        self.assertEqual(_gunzip(future.result()), b'aaaa')
+        self.assertEqual(cache.get('a'), future.result())
+
+    def test_eviction(self):
+        # Room for two entries.
+        size = len(gzip_compress(b'a' * 1000, level=9))
+        cache = PrecompressedCache(max_size=size * 2)
+        cache.add('a', lambda: b'a' * 1000)
+        cache.add('b', lambda: b'b' * 1000)
+        # 'a' is now more recently used than 'b'.
+        self.assertIsNotNone(cache.get('a'))
+        cache.add('c', lambda: b'c' * 1000)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_error(self):
+        cache = PrecompressedCache()
+        with ExpectLog(gen_log, 'Failed to compress'):
+            cache.add('a', lambda: 1 / 0)
+        self.assertIsNone(cache.get('a'))
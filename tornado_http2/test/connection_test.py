@@ -0,0 +1,164 @@
+import struct
+import unittest
+
+from tornado.concurrent import Future
+from tornado import gen
+from tornado.iostream import StreamClosedError
+from tornado.testing import AsyncTestCase, gen_test
+
+from tornado_http2 import constants
+from tornado_http2.connection import Connection, Params
+from tornado_http2.errors import StreamError
+from tornado_http2.frames import Frame
+
+
+class FakeIOStream(object):
+    """Records writes, which complete when `flush` is called."""
+    def __init__(self):
+        self.writes = []
+        self.futures = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def flush(self):
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.set_result(None)
+
+    def closed(self):
+        return False
+
+    def close(self):
+        pass
+
+    def data_frames(self):
+        """Returns (stream_id, length) for each DATA frame written."""
+        frames = []
+        for data in self.writes:
+            while data:
+                length, typ, flags, stream_id = struct.unpack(
+                    '>iBBi', b'\0' + data[:9])
+                if typ == constants.FrameType.DATA.value:
+                    frames.append((stream_id, length))
+                data = data[9 + length:]
+        return frames
+
+
+class OutputBufferTest(AsyncTestCase):
+    def setUp(self):
+        super(OutputBufferTest, self).setUp()
+        self.iostream = FakeIOStream()
+        self.conn = Connection(self.iostream, False,
+                               Params(max_output_buffer_size=10000))
+
+    @gen_test
+    def test_backpressure(self):
+        stream = self.conn.create_stream(None)
+        future = stream.write(b'a' * 40000)
+        # One frame fills the buffer; the rest waits for the socket.
+        self.assertEqual(self.iostream.data_frames(), [(2, 16384)])
+        yield gen.moment
+        self.assertFalse(future.done())
+        self.assertEqual(len(self.iostream.data_frames()), 1)
+        while not future.done():
+            self.iostream.flush()
+            yield gen.moment
+        self.assertEqual(self.iostream.data_frames(),
+                         [(2, 16384), (2, 16384), (2, 7232)])
+        # The last frame is buffered when the write completes.
+        self.iostream.flush()
+        self.assertEqual(self.conn._buffered_output, 0)
+
+    @gen_test
+    def test_fairness(self):
+        streams = [self.conn.create_stream(None) for i in range(3)]
+        # Together these fit in the connection's flow control window.
+        futures = [s.write(b'a' * 20000) for s in streams]
+        while not all(f.done() for f in futures):
+            self.iostream.flush()
+            yield gen.moment
+        # After the first frame fills the buffer, the streams take
+        # turns.
+        self.assertEqual(self.iostream.data_frames(),
+                         [(2, 16384), (2, 3616), (4, 16384), (6, 16384),
+                          (4, 3616), (6, 3616)])
+
+    def test_reset_settles_queued_writes(self):
+        stream = self.conn.create_stream(None)
+        future = stream.write(b'a' * 40000)
+        finish_future = stream.finish()
+        self.assertFalse(future.done())
+        stream.reset()
+        # At once, without waiting for the IOLoop.
+        self.assertIsInstance(future.exception(), StreamClosedError)
+        self.assertTrue(finish_future.done())
+        self.assertEqual(len(self.iostream.data_frames()), 1)
+
+    @gen_test
+    def test_control_frames_not_blocked(self):
+        stream = self.conn.create_stream(None)
+        stream.write(b'a' * 40000)
+        writes = len(self.iostream.writes)
+        self.conn._write_frame(self.conn._goaway_frame(
+            constants.ErrorCode.NO_ERROR, 0, ''))
+        self.assertEqual(len(self.iostream.writes), writes + 1)
+
+
+class TimingsTest(AsyncTestCase):
+    def setUp(self):
+        super(TimingsTest, self).setUp()
+        self.iostream = FakeIOStream()
+        self.conn = Connection(self.iostream, False,
+                               Params(max_output_buffer_size=10000))
+
+    @gen_test
+    def test_output_buffer_wait(self):
+        stream = self.conn.create_stream(None)
+        future = stream.write(b'a' * 40000)
+        yield gen.sleep(0.02)
+        while not future.done():
+            self.iostream.flush()
+            yield gen.moment
+        timings = stream.timings
+        self.assertGreaterEqual(timings.output_buffer_wait, 0.02)
+        self.assertEqual(timings.flow_control_wait, 0)
+        self.assertLess(timings.first_data_sent, timings.last_data_sent)
+
+    @gen_test
+    def test_flow_control_wait(self):
+        stream = self.conn.create_stream(None)
+        self.conn.params.max_output_buffer_size = 1000000
+        future = stream.write(b'a' * 70000)
+        yield gen.sleep(0.02)
+        self.assertFalse(future.done())
+        update = struct.pack('>I', 10000)
+        self.conn.handle_frame(Frame(constants.FrameType.WINDOW_UPDATE,
+                                     0, 0, update))
+        stream.handle_frame(Frame(constants.FrameType.WINDOW_UPDATE,
+                                  0, stream.stream_id, update))
+        yield future
+        self.assertGreaterEqual(stream.timings.flow_control_wait, 0.02)
+        self.assertEqual(stream.timings.output_buffer_wait, 0)
+
+
+class PaddingTest(unittest.TestCase):
+    def frame(self, data):
+        return Frame(constants.FrameType.DATA, constants.FrameFlag.PADDED,
+                     1, data)
+
+    def test_without_padding(self):
+        self.assertEqual(self.frame(b'\x02abcxx').without_padding().data,
+                         b'abc')
+        self.assertEqual(self.frame(b'\x00abc').without_padding().data,
+                         b'abc')
+        self.assertEqual(self.frame(b'\xc8abc' + b'x' * 200)
+                         .without_padding().data, b'abc')
+
+    def test_invalid_padding(self):
+        for data in [b'', b'\x04abc']:
+            with self.assertRaises(StreamError):
+                self.frame(data).without_padding()
@@ -107,3 +107,42 @@ class BitEncodingTest(unittest.TestCase):
                 print("Decoder offsets: %d, %d" % (
                     decoder._byte_offset, decoder._bit_offset))
                 raise
+
+    def test_huffman_round_trip(self):
+        data = bytes(bytearray(range(256)))
+        encoder = BitEncoder()
+        encoder.write_huffman_string(data)
+        decoder = BitDecoder(encoder.data())
+        result = bytearray()
+        while True:
+            c = decoder.read_huffman_char(None)
+            if c is None:
+                break
+            result += bytearray([c]) if isinstance(c, int) else c
+        self.assertEqual(bytes(result), data)
+
+    def test_huffman_string(self):
+        data = bytes(bytearray(range(256))) * 2
+        encoder = BitEncoder()
+        encoder.write_huffman_string(data)
+        encoded = encoder.data()
+        decoder = BitDecoder(encoded + bytearray(b'x'))
+        self.assertEqual(bytes(decoder.read_huffman_string(len(encoded))),
+                         data)
+        self.assertEqual(decoder.read_char(), ord(b'x'))
+        self.assertRaises(EODError,
+                          BitDecoder(encoded).read_huffman_string,
+                          len(encoded) + 1)
+
+    def test_huffman_string_errors(self):
+        for name, data in [
+                # The end-of-string symbol.
+                ('eos', [0xff, 0xff, 0xff, 0xff]),
+                # Padding of eight bits.
+                ('long padding', [0x1f, 0xff]),
+                # Padding that is not all ones ('a' is 00011).
+                ('zero padding', [0x18]),
+        ]:
+            decoder = BitDecoder(bytearray(data))
+            with self.assertRaises(ValueError, msg=name):
+                decoder.read_huffman_string(len(data))
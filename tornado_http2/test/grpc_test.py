@@ -0,0 +1,139 @@
+import unittest
+import zlib
+
+from tornado import gen
+from tornado.httputil import (HTTPHeaders, HTTPMessageDelegate,
+                              HTTPServerConnectionDelegate, ResponseStartLine)
+from tornado.testing import gen_test
+
+from tornado_http2 import constants
+from tornado_http2.grpc import MessageDecoder, MessageError, encode_message
+from tornado_http2.hpack import HpackDecoder, HpackEncoder
+from tornado_http2.test.server_test import (connect_h2, encode_frame,
+                                            read_frame, request_headers)
+from tornado_http2.test.util import AsyncHTTP2TestCase
+
+
+class MessageFramingTest(unittest.TestCase):
+    def test_round_trip(self):
+        data = b''.join(encode_message(m) for m in [b'one', b'', b'x' * 1000])
+        decoder = MessageDecoder()
+        messages = []
+        # Messages are split across chunks arbitrarily.
+        for i in range(0, len(data), 7):
+            messages.extend(decoder.feed(data[i:i + 7]))
+        decoder.finish()
+        self.assertEqual(messages, [b'one', b'', b'x' * 1000])
+
+    def test_wire_format(self):
+        self.assertEqual(encode_message(b'abc'), b'\x00\x00\x00\x00\x03abc')
+        self.assertEqual(MessageDecoder().feed(b'\x00\x00\x00\x00\x02hi'),
+                         [b'hi'])
+
+    def test_compressed(self):
+        data = encode_message(b'a' * 100, compress=zlib.compress)
+        self.assertEqual(data[:1], b'\x01')
+        with self.assertRaises(MessageError):
+            MessageDecoder().feed(data)
+        decoder = MessageDecoder(decompress=zlib.decompress)
+        self.assertEqual(decoder.feed(data), [b'a' * 100])
+
+    def test_errors(self):
+        with self.assertRaises(MessageError):
+            MessageDecoder(max_message_size=10).feed(encode_message(b'a' * 11))
+        with self.assertRaises(MessageError):
+            MessageDecoder().feed(b'\x02\x00\x00\x00\x00')
+        decoder = MessageDecoder()
+        decoder.feed(encode_message(b'abc')[:-1])
+        with self.assertRaises(MessageError):
+            decoder.finish()
+
+
+class EchoDelegate(HTTPMessageDelegate):
+    def __init__(self, request_conn):
+        self.request_conn = request_conn
+        self.decoder = MessageDecoder()
+        self.trailers = None
+
+    def headers_received(self, start_line, headers):
+        self.request_conn.write_headers(
+            ResponseStartLine('HTTP/2.0', 200, 'OK'),
+            HTTPHeaders({'Content-Type': 'application/grpc'}))
+
+    def data_received(self, chunk):
+        for message in self.decoder.feed(chunk):
+            self.request_conn.write(encode_message(message.upper()))
+
+    def trailers_received(self, trailers):
+        self.trailers = trailers
+
+    def finish(self):
+        self.decoder.finish()
+        trailers = HTTPHeaders({'grpc-status': '0'})
+        if self.trailers is not None:
+            trailers['x-client-trailer'] = self.trailers['x-client-trailer']
+        self.request_conn.set_trailers(trailers)
+        self.request_conn.finish()
+
+
+class EchoService(HTTPServerConnectionDelegate):
+    def start_request(self, server_conn, request_conn):
+        return EchoDelegate(request_conn)
+
+
+class StreamingRPCTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        return EchoService()
+
+    @gen.coroutine
+    def read_frame(self, stream):
+        """Reads the next HEADERS or DATA frame on stream 1, decoding
+        header blocks.
+        """
+        while True:
+            frame = yield read_frame(stream)
+            if frame.stream_id != 1 or frame.type not in (
+                    constants.FrameType.HEADERS, constants.FrameType.DATA):
+                continue
+            if frame.type == constants.FrameType.HEADERS:
+                self.header_blocks.append(sorted(
+                    (k, v) for k, v, mode in
+                    self.decoder.decode(bytearray(frame.data))))
+            raise gen.Return(frame)
+
+    @gen_test
+    def test_full_duplex(self):
+        stream = yield connect_h2(self.get_http_port())
+        encoder = HpackEncoder(4096)
+        self.decoder = HpackDecoder(4096)
+        self.header_blocks = []
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS, constants.FrameFlag.END_HEADERS, 1,
+            encoder.encode(request_headers(
+                b'POST', b'/echo.Echo/Echo',
+                (b'content-type', b'application/grpc',
+                 constants.HeaderIndexMode.YES),
+                (b'te', b'trailers', constants.HeaderIndexMode.YES)))))
+        for message in [b'one', b'two']:
+            # Each reply arrives before the request is finished.
+            stream.write(encode_frame(constants.FrameType.DATA, 0, 1,
+                                      encode_message(message)))
+            frame = yield self.read_frame(stream)
+            if frame.type == constants.FrameType.HEADERS:
+                frame = yield self.read_frame(stream)
+            self.assertEqual(frame.type, constants.FrameType.DATA)
+            self.assertEqual(MessageDecoder().feed(frame.data),
+                             [message.upper()])
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS,
+            constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM,
+            1, encoder.encode([(b'x-client-trailer', b'yes',
+                                constants.HeaderIndexMode.YES)])))
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.HEADERS)
+        self.assertTrue(frame.flags & constants.FrameFlag.END_STREAM)
+        self.assertEqual(self.header_blocks, [
+            [(b':status', b'200'), (b'content-type', b'application/grpc')],
+            [(b'grpc-status', b'0'), (b'x-client-trailer', b'yes')],
+        ])
+        stream.close()
@@ -0,0 +1,92 @@
+import copy
+import unittest
+
+from tornado.httputil import HTTPHeaders
+
+from tornado_http2.headers import ConstantHeaderCache, LazyHTTPHeaders
+from tornado_http2.hpack import encode_static_header
+
+
+class LazyHTTPHeadersTest(unittest.TestCase):
+    def make_headers(self):
+        headers = LazyHTTPHeaders()
+        headers.add_raw(b'content-type', b'text/html')
+        headers.add_raw(b'cookie', b'a=1')
+        headers.add_raw(b'x-custom', b'value')
+        headers.add_raw(b'cookie', b'b=2')
+        return headers
+
+    def test_lookup(self):
+        headers = self.make_headers()
+        self.assertEqual(headers['Content-Type'], 'text/html')
+        self.assertEqual(headers.get('x-CUSTOM'), 'value')
+        self.assertEqual(headers['Cookie'], 'a=1,b=2')
+        self.assertEqual(headers.get_list('cookie'), ['a=1', 'b=2'])
+        self.assertIn('Cookie', headers)
+        self.assertNotIn('Accept', headers)
+        self.assertIsNone(headers.get('Accept'))
+        self.assertEqual(headers.get_list('Accept'), [])
+        self.assertEqual(len(headers), 3)
+        with self.assertRaises(KeyError):
+            headers['Accept']
+        # Lookups don't build the full mapping.
+        self.assertIsNotNone(headers._raw)
+
+    def test_native_strings(self):
+        headers = self.make_headers()
+        self.assertIsInstance(headers['content-type'], str)
+        self.assertIsInstance(list(headers.keys())[0], str)
+
+    def test_iteration(self):
+        headers = self.make_headers()
+        self.assertEqual(sorted(headers.keys()),
+                         ['Content-Type', 'Cookie', 'X-Custom'])
+        self.assertEqual(sorted(headers.get_all()), [
+            ('Content-Type', 'text/html'),
+            ('Cookie', 'a=1'),
+            ('Cookie', 'b=2'),
+            ('X-Custom', 'value'),
+        ])
+
+    def test_modification(self):
+        headers = self.make_headers()
+        headers.add('Cookie', 'c=3')
+        headers['X-Custom'] = 'other'
+        del headers['Content-Type']
+        self.assertEqual(headers.get_list('cookie'), ['a=1', 'b=2', 'c=3'])
+        self.assertEqual(headers['x-custom'], 'other')
+        self.assertNotIn('Content-Type', headers)
+        self.assertEqual(len(headers), 2)
+
+    def test_copy(self):
+        headers = self.make_headers()
+        for copied in [headers.copy(), copy.copy(headers),
+                       HTTPHeaders(headers)]:
+            self.assertEqual(copied.get_list('Cookie'), ['a=1', 'b=2'])
+            self.assertEqual(copied, headers)
+
+
+class ConstantHeaderCacheTest(unittest.TestCase):
+    def test_register(self):
+        cache = ConstantHeaderCache()
+        cache.register({'content-type': 'application/json'})
+        headers = HTTPHeaders()
+        headers.add('x-frame-options', 'DENY')
+        cache.register(headers)
+        cache.register([(b'Server', b'test')])
+        self.assertEqual(len(cache), 3)
+        # Names are looked up as normalized by HTTPHeaders.
+        self.assertEqual(cache.get('Content-Type', 'application/json'),
+                         encode_static_header(b'content-type',
+                                              b'application/json'))
+        self.assertIsNotNone(cache.get('X-Frame-Options', 'DENY'))
+        self.assertIsNotNone(cache.get('Server', 'test'))
+        self.assertIsNone(cache.get('Content-Type', 'text/html'))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid(self):
+        cache = ConstantHeaderCache()
+        for name in ['Connection', 'Host', ':status', 'transfer-encoding']:
+            with self.assertRaises(ValueError):
+                cache.register({name: 'x'})
@@ -1,8 +1,10 @@
 import binascii
 import unittest
 
+from tornado_http2 import gen_tables, hpack_tables
 from tornado_http2.constants import HeaderIndexMode
-from tornado_http2.hpack import HpackDecoder, HpackEncoder
+from tornado_http2.hpack import (HeaderListTooLarge, HpackDecoder, HpackEncoder,
+                                 encode_static_header)
 
 test_data = [
     # Test cases from
@@ -188,6 +190,26 @@ class HpackDecoderTest(unittest.TestCase):
                     print('error in test case %s, request %d' % (name, i))
                     raise
 
+    def test_max_header_list_size(self):
+        encoder = HpackEncoder(4096)
+        decoder = HpackDecoder(4096)
+        big = (b'x-big', b'a' * 1000, HeaderIndexMode.YES)
+        # Repeating an indexed header makes a small block that decodes
+        # to large headers.
+        block = encoder.encode(
+            [big] * 50 + [(b'x-literal', b'b' * 100, HeaderIndexMode.NO),
+                          (b'x-indexed', b'c', HeaderIndexMode.YES)])
+        self.assertLess(len(block), 1200)
+        with self.assertRaises(HeaderListTooLarge):
+            decoder.decode(bytearray(block), 10000)
+        # The dynamic table is still in sync with the encoder.
+        self.assertEqual(list(decoder._dynamic_table),
+                         [(b'x-indexed', b'c'), (b'x-big', b'a' * 1000)])
+        headers = [big, (b'x-indexed', b'c', HeaderIndexMode.YES)]
+        self.assertEqual(
+            decoder.decode(bytearray(encoder.encode(headers)), 10000),
+            headers)
+
 
 class HpackEncoderTest(unittest.TestCase):
     def test_hpack_encoder(self):
@@ -201,3 +223,42 @@ class HpackEncoderTest(unittest.TestCase):
                 except Exception:
                     print('error in test case %s, request %d' % (name, i))
                     raise
+
+
+    def test_encode_static_header(self):
+        # A static table pair is a one-byte index.
+        self.assertEqual(encode_static_header(b':status', b'200'), b'\x88')
+        fields = [(b'Content-Type', b'application/json'),
+                  (b'x-custom', b'value'),
+                  (b'x-token', b'\x00\xff\x00\xff')]
+        encoded = b''.join(encode_static_header(k, v) for k, v in fields)
+        # Pre-encoded fields can follow a regular encoder's output.
+        encoder = HpackEncoder(4096)
+        block = encoder.encode([(b'x-indexed', b'a', HeaderIndexMode.YES)])
+        decoder = HpackDecoder(4096)
+        self.assertEqual(decoder.decode(bytearray(block + encoded)), [
+            (b'x-indexed', b'a', HeaderIndexMode.YES),
+            (b'content-type', b'application/json', HeaderIndexMode.NO),
+            (b'x-custom', b'value', HeaderIndexMode.NO),
+            (b'x-token', b'\x00\xff\x00\xff', HeaderIndexMode.NO),
+        ])
+        # Only the regular field was added to the dynamic table.
+        self.assertEqual(list(decoder._dynamic_table), [(b'x-indexed', b'a')])
+        # Huffman coding is used when it is shorter.
+        self.assertLess(len(encode_static_header(b'x-custom', b'a' * 100)),
+                        100)
+
+
+class HpackTablesTest(unittest.TestCase):
+    def test_tables_up_to_date(self):
+        # If this fails, run python -m tornado_http2.gen_tables
+        self.assertEqual(list(hpack_tables.STATIC_TABLE),
+                         gen_tables.parse_static_table())
+        self.assertEqual(list(hpack_tables.HUFFMAN_CODES),
+                         gen_tables.parse_huffman_data())
+        decode_table = gen_tables.build_huffman_decode_table(
+            gen_tables.parse_huffman_data())
+        self.assertEqual(list(hpack_tables.HUFFMAN_DECODE_TABLE),
+                         decode_table)
+        self.assertEqual(list(hpack_tables.HUFFMAN_DECODE_STATES),
+                         gen_tables.build_huffman_decode_states(decode_table))
@@ -0,0 +1,109 @@
+import os
+import socket
+
+from tornado import gen
+from tornado.httpclient import AsyncHTTPClient
+from tornado.testing import AsyncTestCase, bind_unused_port, gen_test
+from tornado.web import Application, RequestHandler
+
+from tornado_http2.prefork import WorkerPool, _SLOT
+from tornado_http2.server import CleartextHTTP2Server
+
+
+class HelloHandler(RequestHandler):
+    def get(self):
+        self.write('Hello %s' % self.request.version)
+
+
+class WorkerPoolTest(AsyncTestCase):
+    # Exercises a single worker in-process, with the other worker's
+    # slot in the shared table filled in by hand.
+    def setUp(self):
+        super(WorkerPoolTest, self).setUp()
+        sock, self.port = bind_unused_port()
+        self.pool = WorkerPool([sock], num_workers=2)
+        self.pool._init_worker(0)
+        self.server = CleartextHTTP2Server(
+            Application([('/hello', HelloHandler)]))
+        self.pool.add_server(self.server)
+        self.client = AsyncHTTPClient(io_loop=self.io_loop, force_instance=True)
+
+    def tearDown(self):
+        self.pool.stop()
+        self.server.close_all_connections()
+        self.client.close()
+        for sock in self.pool.sockets:
+            sock.close()
+        super(WorkerPoolTest, self).tearDown()
+
+    def set_other_worker(self, active):
+        _SLOT.pack_into(self.pool._table, _SLOT.size, 12345, active,
+                        active, active, 0)
+
+    @gen_test
+    def test_serve(self):
+        self.set_other_worker(0)
+        resp = yield self.client.fetch('http://127.0.0.1:%d/hello' % self.port)
+        self.assertEqual(resp.body, b'Hello HTTP/2.0')
+        stats = self.pool.stats()
+        self.assertEqual([s.worker_id for s in stats], [0, 1])
+        self.assertEqual(stats[0].pid, os.getpid())
+        self.assertEqual(stats[0].accepted, 1)
+        self.assertEqual(self.pool.total_stats().accepted, 1)
+
+    @gen_test
+    def test_counts(self):
+        self.set_other_worker(5)
+        self.pool._sync_callback.stop()
+        resp = yield self.client.fetch('http://127.0.0.1:%d/hello' % self.port)
+        self.assertEqual(resp.body, b'Hello HTTP/2.0')
+        self.pool._sync()
+        self.assertEqual(self.pool.stats()[0].active, 1)
+        self.assertEqual(self.pool.stats()[0].http2_active, 1)
+
+        # Closed connections are counted without waiting for a sync.
+        sock = socket.create_connection(('127.0.0.1', self.port))
+        yield gen.sleep(0.05)
+        self.assertEqual(self.pool.stats()[0].active, 2)
+        sock.close()
+        yield gen.sleep(0.05)
+        self.assertEqual(self.pool.stats()[0].active, 1)
+
+    def test_rebalance(self):
+        self.set_other_worker(0)
+        self.pool._active = 1
+        self.pool._rebalance()
+        self.assertFalse(self.pool._accepting)
+        self.assertTrue(self.pool.stats()[0].paused)
+        self.assertEqual(self.pool.total_stats().paused, 1)
+
+        self.set_other_worker(1)
+        self.pool._rebalance()
+        self.assertTrue(self.pool._accepting)
+        self.assertFalse(self.pool.stats()[0].paused)
+
+    def test_dead_worker_ignored(self):
+        self.pool._clear_slot(1)
+        self.pool._active = 5
+        self.pool._rebalance()
+        self.assertTrue(self.pool._accepting)
+        self.assertEqual(len(self.pool.stats()), 1)
+
+    @gen_test
+    def test_burst(self):
+        self.set_other_worker(0)
+        socks = [socket.create_connection(('127.0.0.1', self.port))
+                 for i in range(5)]
+        try:
+            yield gen.sleep(0.05)
+            # Only one connection is taken; the rest of the burst is
+            # left in the backlog for the other worker.
+            self.assertEqual(self.pool.stats()[0].accepted, 1)
+            self.assertTrue(self.pool.stats()[0].paused)
+
+            self.set_other_worker(5)
+            yield gen.sleep(self.pool.sync_interval * 2)
+            self.assertEqual(self.pool.stats()[0].accepted, 5)
+        finally:
+            for sock in socks:
+                sock.close()
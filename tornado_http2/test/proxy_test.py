@@ -0,0 +1,153 @@
+from tornado.escape import json_decode
+from tornado import gen
+from tornado.httpserver import HTTPServer
+from tornado.log import gen_log
+from tornado.testing import ExpectLog, bind_unused_port, gen_test
+from tornado.web import Application, RequestHandler, stream_request_body
+
+from tornado_http2 import constants
+from tornado_http2.hpack import HpackEncoder
+from tornado_http2.proxy import ReverseProxy, Upstream
+from tornado_http2.server import CleartextHTTP2Server
+from tornado_http2.test.server_test import (connect_h2, encode_frame,
+                                            read_frame, request_headers)
+from tornado_http2.test.util import AsyncHTTP2TestCase
+
+
+class HeadersHandler(RequestHandler):
+    def get(self):
+        self.set_header('Keep-Alive', 'timeout=5')
+        self.set_header('X-Backend', 'yes')
+        self.write({
+            'host': self.request.headers.get('Host'),
+            'x-forwarded-for': self.request.headers.get('X-Forwarded-For'),
+            'x-forwarded-proto':
+                self.request.headers.get('X-Forwarded-Proto'),
+            'proxy-authorization':
+                self.request.headers.get('Proxy-Authorization'),
+        })
+
+
+@stream_request_body
+class EchoHandler(RequestHandler):
+    def prepare(self):
+        self.chunks = []
+
+    def data_received(self, chunk):
+        self.chunks.append(chunk)
+
+    def put(self):
+        self.write(b''.join(self.chunks))
+
+
+class BigHandler(RequestHandler):
+    def initialize(self, test):
+        self.test = test
+
+    @gen.coroutine
+    def get(self):
+        chunk = b'x' * 16384
+        for i in range(64):
+            self.write(chunk)
+            yield self.flush()
+            self.test.backend_sent += len(chunk)
+
+
+class ProxyTestMixin(object):
+    http2 = True
+
+    def setUp(self):
+        super(ProxyTestMixin, self).setUp()
+        self.backend_sent = 0
+        sock, port = bind_unused_port()
+        backend_app = Application([
+            ('/headers', HeadersHandler),
+            ('/echo', EchoHandler),
+            ('/big', BigHandler, dict(test=self)),
+        ])
+        if self.http2:
+            self.backend = CleartextHTTP2Server(backend_app)
+        else:
+            self.backend = HTTPServer(backend_app)
+        self.backend.add_socket(sock)
+        self.upstream.port = port
+
+    def tearDown(self):
+        self.backend.stop()
+        self.io_loop.run_sync(self.upstream.close)
+        super(ProxyTestMixin, self).tearDown()
+
+    def get_app(self):
+        # The backend's port is filled in by setUp.
+        self.upstream = Upstream('127.0.0.1', None, http2=self.http2)
+        return ReverseProxy(self.upstream)
+
+    @gen_test
+    def test_headers(self):
+        response = yield self.http_client.fetch(
+            self.get_url('/headers'),
+            headers={'X-Forwarded-For': '10.1.1.1',
+                     'Proxy-Authorization': 'secret'})
+        self.assertEqual(response.headers['X-Backend'], 'yes')
+        self.assertNotIn('Keep-Alive', response.headers)
+        self.assertEqual(json_decode(response.body), {
+            'host': '127.0.0.1:%d' % self.get_http_port(),
+            'x-forwarded-for': '10.1.1.1, 127.0.0.1',
+            'x-forwarded-proto': 'http',
+            'proxy-authorization': None,
+        })
+
+    @gen_test
+    def test_body(self):
+        body = b''.join(b'%d,' % i for i in range(50000))
+        responses = yield [
+            self.http_client.fetch(self.get_url('/echo'), method='PUT',
+                                   body=body)
+            for i in range(3)]
+        for response in responses:
+            self.assertEqual(response.body, body)
+
+    @gen_test
+    def test_connection_reuse(self):
+        for i in range(3):
+            yield self.http_client.fetch(self.get_url('/headers'))
+        if self.http2:
+            self.assertEqual(len(self.upstream.connections), 1)
+        else:
+            self.assertEqual(len(self.upstream._idle), 1)
+
+    @gen_test
+    def test_backend_down(self):
+        self.backend.stop()
+        yield self.upstream.close()
+        with ExpectLog(gen_log, 'Error connecting to backend'):
+            response = yield self.http_client.fetch(
+                self.get_url('/headers'), raise_error=False)
+        self.assertEqual(response.code, 502)
+
+
+class HTTP2UpstreamTest(ProxyTestMixin, AsyncHTTP2TestCase):
+    @gen_test
+    def test_backpressure(self):
+        # A client that never opens its flow control window only gets
+        # the first 64KB, and the backend is held back accordingly
+        # instead of the proxy buffering its whole 1MB response.
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS,
+            constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM,
+            1, HpackEncoder(4096).encode(request_headers(b'GET', b'/big'))))
+        received = 0
+        while received < constants.Setting.INITIAL_WINDOW_SIZE.default:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.DATA:
+                received += len(frame.data)
+        yield gen.sleep(0.1)
+        self.assertEqual(received,
+                         constants.Setting.INITIAL_WINDOW_SIZE.default)
+        self.assertLess(self.backend_sent, 256 * 1024)
+        stream.close()
+
+
+class HTTP1UpstreamTest(ProxyTestMixin, AsyncHTTP2TestCase):
+    http2 = False
@@ -5,9 +5,21 @@ import tornado.testing
 import unittest
 
 TEST_MODULES = [
+    'tornado_http2.test.cache_test',
+    'tornado_http2.test.client_test',
+    'tornado_http2.test.compression_test',
+    'tornado_http2.test.connection_test',
     'tornado_http2.test.encoding_test',
+    'tornado_http2.test.grpc_test',
+    'tornado_http2.test.headers_test',
     'tornado_http2.test.hpack_test',
+    'tornado_http2.test.prefork_test',
+    'tornado_http2.test.proxy_test',
     'tornado_http2.test.server_test',
+    'tornado_http2.test.timers_test',
+    'tornado_http2.test.trace_test',
+    'tornado_http2.test.web_test',
+    'tornado_http2.test.websocket_test',
 ]
 
 
@@ -1,13 +1,76 @@
+import base64
 import os.path
+import socket
 import ssl
+import struct
 
+from tornado.concurrent import Future
 from tornado import gen
 from tornado.httpclient import AsyncHTTPClient
-from tornado.web import RequestHandler, Application
+from tornado.httputil import HTTPHeaders
+from tornado.iostream import IOStream, StreamClosedError
+from tornado.testing import gen_test
+from tornado.web import RequestHandler, Application, stream_request_body
 
+from tornado_http2 import constants
+from tornado_http2.connection import flood_limits_exceeded
+from tornado_http2.frames import Frame
+from tornado_http2.headers import constant_headers
+from tornado_http2.hpack import HpackDecoder, HpackEncoder
 from tornado_http2.test.util import AsyncHTTP2TestCase
 
 
+@gen.coroutine
+def read_frame(stream):
+    header = yield stream.read_bytes(9)
+    data_len, typ, flags, stream_id = struct.unpack('>iBBi',
+                                                    b'\0' + header)
+    data = yield stream.read_bytes(data_len)
+    raise gen.Return(Frame(constants.FrameType(typ), flags, stream_id,
+                           data))
+
+
+def encode_frame(typ, flags, stream_id, data):
+    data = bytes(data)
+    return struct.pack('>iBBi', len(data), typ.value, flags,
+                       stream_id)[1:] + data
+
+
+@gen.coroutine
+def connect_h2(port):
+    """Opens a connection with prior knowledge of HTTP/2."""
+    stream = IOStream(socket.socket())
+    yield stream.connect(('127.0.0.1', port))
+    stream.write(constants.CLIENT_PREFACE)
+    stream.write(encode_frame(constants.FrameType.SETTINGS, 0, 0, b''))
+    raise gen.Return(stream)
+
+
+def request_headers(method, path, *extra):
+    mode = constants.HeaderIndexMode.NO
+    return [
+        (b':method', method, mode),
+        (b':scheme', b'http', mode),
+        (b':authority', b'127.0.0.1', mode),
+        (b':path', path, mode),
+    ] + list(extra)
+
+
+@gen.coroutine
+def read_stream_frames(stream, stream_id):
+    """Reads frames until END_STREAM on ``stream_id``, returning that
+    stream's frames.
+    """
+    frames = []
+    while True:
+        frame = yield read_frame(stream)
+        if frame.stream_id == stream_id:
+            frames.append(frame)
+            if frame.flags & constants.FrameFlag.END_STREAM:
+                break
+    raise gen.Return(frames)
+
+
 class HelloHandler(RequestHandler):
     def get(self):
         self.write('Hello %s' % self.request.version)
@@ -22,9 +85,29 @@ class ServerTest(AsyncHTTP2TestCase):
                     self.write(b'a' * 1024)
                     yield self.flush()
 
+        class FlushHandler(RequestHandler):
+            def get(self):
+                # Writes complete immediately while the flow control
+                # window has room.
+                self.write('a')
+                first = self.flush()
+                self.write('b')
+                second = self.flush()
+                self.write(str([first.done(), second.done()]))
+
+        class UnyieldedFlushHandler(RequestHandler):
+            def get(self):
+                # Once the window is exhausted, writes are queued and
+                # must still be sent in order.
+                for i in range(200):
+                    self.write(('%04d' % i).encode() * 256)
+                    self.flush()
+
         return Application([
             ('/hello', HelloHandler),
             ('/large', LargeResponseHandler),
+            ('/flush', FlushHandler),
+            ('/unyielded_flush', UnyieldedFlushHandler),
         ])
 
     def test_hello(self):
@@ -39,6 +122,663 @@ class ServerTest(AsyncHTTP2TestCase):
         resp.rethrow()
         self.assertEqual(len(resp.body), 200 * 1024)
 
+    def test_synchronous_flush(self):
+        resp = self.fetch('/flush')
+        resp.rethrow()
+        self.assertEqual(resp.body, b'ab[True, True]')
+
+    def test_write_order(self):
+        resp = self.fetch('/unyielded_flush')
+        resp.rethrow()
+        self.assertEqual(resp.body, b''.join(
+            ('%04d' % i).encode() * 256 for i in range(200)))
+
+
+class PrefaceDetectionTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        return Application([
+            ('/hello', HelloHandler),
+        ])
+
+    @gen.coroutine
+    def connect(self):
+        stream = IOStream(socket.socket())
+        yield stream.connect(('127.0.0.1', self.get_http_port()))
+        raise gen.Return(stream)
+
+    @gen_test
+    def test_short_http1_request(self):
+        # An HTTP/1 request shorter than the client preface.
+        stream = yield self.connect()
+        stream.write(b'GET /hello HTTP/1.0\r\n\r\n')
+        data = yield stream.read_until_close()
+        self.assertTrue(data.startswith(b'HTTP/1.1 200'), data)
+        self.assertTrue(data.endswith(b'Hello HTTP/1.0'), data)
+
+    @gen_test
+    def test_split_http1_request(self):
+        # The first packet matches the start of the preface.
+        stream = yield self.connect()
+        stream.write(b'P')
+        yield gen.sleep(0.05)
+        stream.write(b'OST /hello HTTP/1.0\r\nContent-Length: 0\r\n\r\n')
+        data = yield stream.read_until_close()
+        self.assertTrue(data.startswith(b'HTTP/1.1 405'), data)
+
+    @gen_test
+    def test_split_preface(self):
+        stream = yield self.connect()
+        stream.write(constants.CLIENT_PREFACE[:10])
+        yield gen.sleep(0.05)
+        stream.write(constants.CLIENT_PREFACE[10:])
+        # The server responds with a SETTINGS frame.
+        header = yield stream.read_bytes(9)
+        self.assertEqual(header[3:4], b'\x04')
+        stream.close()
+
+    @gen_test
+    def test_partial_preface_closed(self):
+        stream = yield self.connect()
+        stream.write(b'PRI * HT')
+        yield gen.sleep(0.05)
+        stream.socket.shutdown(socket.SHUT_WR)
+        # Once the preface stops growing, the server reads the
+        # connection and sees it closed.
+        data = yield stream.read_until_close()
+        self.assertEqual(data, b'')
+
+
+class UpgradeTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        class EchoHandler(RequestHandler):
+            def post(self):
+                self.write(self.request.body)
+
+        return Application([
+            ('/hello', HelloHandler),
+            ('/echo', EchoHandler),
+        ])
+
+    def settings_header(self, *settings):
+        payload = b''.join(struct.pack('>HI', setting.code, value)
+                           for setting, value in settings)
+        return base64.urlsafe_b64encode(payload).rstrip(b'=')
+
+    @gen.coroutine
+    def upgrade(self, request):
+        stream = IOStream(socket.socket())
+        yield stream.connect(('127.0.0.1', self.get_http_port()))
+        stream.write(request)
+        header = yield stream.read_until(b'\r\n\r\n')
+        raise gen.Return((stream, header))
+
+    @gen_test
+    def test_settings_applied(self):
+        # The response is written without waiting for the client
+        # preface, using the window size from HTTP2-Settings.
+        stream, header = yield self.upgrade(
+            b'GET /hello HTTP/1.1\r\n'
+            b'Connection: Upgrade, HTTP2-Settings\r\n'
+            b'Upgrade: h2c\r\n'
+            b'HTTP2-Settings: ' + self.settings_header(
+                (constants.Setting.INITIAL_WINDOW_SIZE, 5)) + b'\r\n'
+            b'\r\n')
+        self.assertTrue(header.startswith(b'HTTP/1.1 101 '), header)
+        frame = yield read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.SETTINGS)
+        frame = yield read_frame(stream)
+        self.assertEqual((frame.type, frame.stream_id),
+                         (constants.FrameType.HEADERS, 1))
+        headers = HpackDecoder(4096).decode(bytearray(frame.data))
+        self.assertEqual(headers[0][:2], (b':status', b'200'))
+        frame = yield read_frame(stream)
+        self.assertEqual(frame, Frame(constants.FrameType.DATA, 0, 1,
+                                      b'Hello'))
+        stream.close()
+
+    @gen_test
+    def test_request_body(self):
+        body = b'a' * 1000
+        stream, header = yield self.upgrade(
+            b'POST /echo HTTP/1.1\r\n'
+            b'Connection: Upgrade, HTTP2-Settings\r\n'
+            b'Upgrade: h2c\r\n'
+            b'HTTP2-Settings: \r\n'
+            b'Content-Length: 1000\r\n'
+            b'\r\n' + body)
+        self.assertTrue(header.startswith(b'HTTP/1.1 101 '), header)
+        stream.write(constants.CLIENT_PREFACE)
+        stream.write(b'\0\0\0\x04\0\0\0\0\0')  # empty SETTINGS
+        response = b''
+        while True:
+            frame = yield read_frame(stream)
+            if frame.stream_id == 1 and frame.type == constants.FrameType.DATA:
+                response += frame.data
+                if frame.flags & constants.FrameFlag.END_STREAM:
+                    break
+        self.assertEqual(response, body)
+        stream.close()
+
+    @gen_test
+    def test_missing_settings(self):
+        # RFC 7540 section 3.2.1: don't upgrade without HTTP2-Settings.
+        stream, header = yield self.upgrade(
+            b'GET /hello HTTP/1.1\r\n'
+            b'Connection: Upgrade\r\n'
+            b'Upgrade: h2c\r\n'
+            b'\r\n')
+        self.assertTrue(header.startswith(b'HTTP/1.1 200 '), header)
+        body = yield stream.read_bytes(len(b'Hello HTTP/1.1'))
+        self.assertEqual(body, b'Hello HTTP/1.1')
+        stream.close()
+
+
+class ResponseFramesTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        class NoContentHandler(RequestHandler):
+            def get(self):
+                self.set_status(204)
+
+        class LargeHandler(RequestHandler):
+            def get(self):
+                self.write(b'a' * 20000)
+
+        class TrailersHandler(RequestHandler):
+            def get(self):
+                self.request.connection.set_trailers(
+                    HTTPHeaders({'X-Checksum': 'abc'}))
+                self.write('body')
+
+        return Application([
+            ('/hello', HelloHandler),
+            ('/no_content', NoContentHandler),
+            ('/large', LargeHandler),
+            ('/trailers', TrailersHandler),
+        ])
+
+    @gen.coroutine
+    def request(self, method, path):
+        """Sends a request with prior knowledge and returns the frames
+        of the response stream.
+        """
+        stream = yield connect_h2(self.get_http_port())
+        header_block = HpackEncoder(4096).encode(
+            request_headers(method, path))
+        stream.write(encode_frame(constants.FrameType.HEADERS,
+                                  constants.FrameFlag.END_HEADERS |
+                                  constants.FrameFlag.END_STREAM,
+                                  1, header_block))
+        frames = yield read_stream_frames(stream, 1)
+        stream.close()
+        raise gen.Return(frames)
+
+    def frame_summary(self, frames):
+        return [(f.type, bool(f.flags & constants.FrameFlag.END_STREAM),
+                 len(f.data) if f.type == constants.FrameType.DATA else None)
+                for f in frames]
+
+    @gen_test
+    def test_small_response(self):
+        # Small responses are written as HEADERS and a single DATA
+        # frame carrying END_STREAM, without an empty trailing frame.
+        frames = yield self.request(b'GET', b'/hello')
+        self.assertEqual(self.frame_summary(frames), [
+            (constants.FrameType.HEADERS, False, None),
+            (constants.FrameType.DATA, True, len(b'Hello HTTP/2.0')),
+        ])
+        self.assertEqual(frames[1].data, b'Hello HTTP/2.0')
+
+    @gen_test
+    def test_head(self):
+        frames = yield self.request(b'HEAD', b'/hello')
+        self.assertEqual(self.frame_summary(frames), [
+            (constants.FrameType.HEADERS, True, None),
+        ])
+
+    @gen_test
+    def test_no_content(self):
+        frames = yield self.request(b'GET', b'/no_content')
+        self.assertEqual(self.frame_summary(frames), [
+            (constants.FrameType.HEADERS, True, None),
+        ])
+
+    @gen_test
+    def test_larger_than_frame(self):
+        # Bodies that don't fit in one frame use the regular path.
+        frames = yield self.request(b'GET', b'/large')
+        self.assertEqual(frames[0].type, constants.FrameType.HEADERS)
+        self.assertEqual(sum(len(f.data) for f in frames[1:]), 20000)
+        self.assertTrue(frames[-1].flags & constants.FrameFlag.END_STREAM)
+
+    @gen_test
+    def test_trailers(self):
+        frames = yield self.request(b'GET', b'/trailers')
+        self.assertEqual(self.frame_summary(frames), [
+            (constants.FrameType.HEADERS, False, None),
+            (constants.FrameType.DATA, False, 4),
+            (constants.FrameType.HEADERS, True, None),
+        ])
+        decoder = HpackDecoder(4096)
+        decoder.decode(bytearray(frames[0].data))
+        self.assertEqual(decoder.decode(bytearray(frames[2].data)),
+                         [(b'x-checksum', b'abc', constants.HeaderIndexMode.YES)])
+
+
+class ConstantHeadersTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        class HeadersHandler(RequestHandler):
+            def get(self):
+                self.set_header('X-Frame-Options', 'DENY')
+                self.set_header('X-Request', self.get_argument('id'))
+                self.add_header('Vary', 'Accept-Encoding')
+                self.add_header('Vary', 'Origin')
+                self.write('ok')
+
+        return Application([('/headers', HeadersHandler)])
+
+    def setUp(self):
+        super(ConstantHeadersTest, self).setUp()
+        constant_headers.register([('X-Frame-Options', 'DENY'),
+                                   ('Vary', 'Origin')])
+
+    def tearDown(self):
+        constant_headers.clear()
+        super(ConstantHeadersTest, self).tearDown()
+
+    @gen_test
+    def test_constant_headers(self):
+        stream = yield connect_h2(self.get_http_port())
+        decoder = HpackDecoder(4096)
+        for stream_id, request_id in [(1, b'1'), (3, b'2')]:
+            stream.write(encode_frame(
+                constants.FrameType.HEADERS,
+                constants.FrameFlag.END_HEADERS |
+                constants.FrameFlag.END_STREAM,
+                stream_id, HpackEncoder(4096).encode(request_headers(
+                    b'GET', b'/headers?id=' + request_id))))
+            frames = yield read_stream_frames(stream, stream_id)
+            headers = decoder.decode(bytearray(frames[0].data))
+            fields = [(k, v) for k, v, mode in headers]
+            self.assertIn((b'x-frame-options', b'DENY'), fields)
+            self.assertIn((b'x-request', request_id), fields)
+            self.assertEqual([v for k, v in fields if k == b'vary'],
+                             [b'Accept-Encoding', b'Origin'])
+            # Registered headers are never added to the dynamic table.
+            self.assertNotIn((b'x-frame-options', b'DENY'),
+                             list(decoder._dynamic_table))
+        stream.close()
+
+
+class HeaderLimitTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        return Application([
+            ('/hello', HelloHandler),
+        ])
+
+    def get_httpserver_options(self):
+        return dict(max_header_size=10000)
+
+    @gen_test
+    def test_settings(self):
+        stream = yield connect_h2(self.get_http_port())
+        frame = yield read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.SETTINGS)
+        settings = dict(struct.unpack('>HI', frame.data[i:i + 6])
+                        for i in range(0, len(frame.data), 6))
+        self.assertEqual(
+            settings[constants.Setting.MAX_HEADER_LIST_SIZE.code], 10000)
+        stream.close()
+
+    @gen_test
+    def test_header_list_too_large(self):
+        # A small header block that decodes to a large header list
+        # through dynamic table references.
+        stream = yield connect_h2(self.get_http_port())
+        encoder = HpackEncoder(4096)
+        decoder = HpackDecoder(4096)
+        big = (b'x-big', b'a' * 1000, constants.HeaderIndexMode.YES)
+        block = encoder.encode(request_headers(b'GET', b'/hello',
+                                               *([big] * 20)))
+        self.assertLess(len(block), 2000)
+        stream.write(encode_frame(constants.FrameType.HEADERS,
+                                  constants.FrameFlag.END_HEADERS |
+                                  constants.FrameFlag.END_STREAM,
+                                  1, block))
+        frames = yield read_stream_frames(stream, 1)
+        headers = decoder.decode(bytearray(frames[0].data))
+        self.assertEqual(headers[0][:2], (b':status', b'431'))
+
+        # The connection is still usable, with HPACK state intact.
+        block = encoder.encode(request_headers(b'GET', b'/hello', big))
+        stream.write(encode_frame(constants.FrameType.HEADERS,
+                                  constants.FrameFlag.END_HEADERS |
+                                  constants.FrameFlag.END_STREAM,
+                                  3, block))
+        frames = yield read_stream_frames(stream, 3)
+        headers = decoder.decode(bytearray(frames[0].data))
+        self.assertEqual(headers[0][:2], (b':status', b'200'))
+        self.assertEqual(frames[-1].data, b'Hello HTTP/2.0')
+        stream.close()
+
+    @gen_test
+    def test_header_block_too_large(self):
+        stream = yield connect_h2(self.get_http_port())
+        block = bytes(HpackEncoder(4096).encode(request_headers(
+            b'GET', b'/hello',
+            (b'x-big', b'a' * 12000, constants.HeaderIndexMode.NO))))
+        stream.write(encode_frame(constants.FrameType.HEADERS, 0, 1,
+                                  block[:8000]))
+        stream.write(encode_frame(constants.FrameType.CONTINUATION,
+                                  constants.FrameFlag.END_HEADERS, 1,
+                                  block[8000:]))
+        while True:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.GOAWAY:
+                break
+        last_stream_id, code = struct.unpack('>ii', frame.data[:8])
+        self.assertEqual(code, constants.ErrorCode.ENHANCE_YOUR_CALM.code)
+        stream.close()
+
+
+class FloodTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        class EchoHandler(RequestHandler):
+            def post(self):
+                self.write(self.request.body)
+
+        return Application([
+            ('/hello', HelloHandler),
+            ('/echo', EchoHandler),
+        ])
+
+    def get_httpserver_options(self):
+        return dict(flood_limits=dict(rst_stream=3, ping=3, settings=3,
+                                      empty_data=3),
+                    max_continuation_frames=2)
+
+    @gen.coroutine
+    def assert_goaway(self, stream, limit):
+        before = flood_limits_exceeded[limit]
+        while True:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.GOAWAY:
+                break
+        last_stream_id, code = struct.unpack('>ii', frame.data[:8])
+        self.assertEqual(code, constants.ErrorCode.ENHANCE_YOUR_CALM.code)
+        self.assertIn(limit.encode(), frame.data[8:])
+        self.assertEqual(flood_limits_exceeded[limit], before + 1)
+        stream.close()
+
+    def headers(self, stream_id, flags, method=b'GET', path=b'/hello'):
+        return encode_frame(constants.FrameType.HEADERS,
+                            constants.FrameFlag.END_HEADERS | flags,
+                            stream_id, HpackEncoder(4096).encode(
+                                request_headers(method, path)))
+
+    @gen_test
+    def test_within_limits(self):
+        stream = yield connect_h2(self.get_http_port())
+        for i in range(3):
+            stream.write(encode_frame(constants.FrameType.PING, 0, 0,
+                                      b'12345678'))
+        stream.write(self.headers(1, constants.FrameFlag.END_STREAM))
+        frames = yield read_stream_frames(stream, 1)
+        self.assertEqual(frames[-1].data, b'Hello HTTP/2.0')
+        stream.close()
+
+    @gen_test
+    def test_ping(self):
+        stream = yield connect_h2(self.get_http_port())
+        for i in range(4):
+            stream.write(encode_frame(constants.FrameType.PING, 0, 0,
+                                      b'12345678'))
+        yield self.assert_goaway(stream, 'ping')
+
+    @gen_test
+    def test_settings(self):
+        stream = yield connect_h2(self.get_http_port())
+        # connect_h2 sent the first SETTINGS.
+        for i in range(3):
+            stream.write(encode_frame(constants.FrameType.SETTINGS, 0, 0,
+                                      b''))
+        yield self.assert_goaway(stream, 'settings')
+
+    @gen_test
+    def test_rapid_reset(self):
+        stream = yield connect_h2(self.get_http_port())
+        for stream_id in (1, 3, 5, 7):
+            stream.write(self.headers(stream_id, 0, b'POST', b'/echo'))
+            stream.write(encode_frame(constants.FrameType.RST_STREAM, 0,
+                                      stream_id, b'\0\0\0\x08'))
+        yield self.assert_goaway(stream, 'rst_stream')
+
+    @gen_test
+    def test_empty_data(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(1, 0, b'POST', b'/echo'))
+        for i in range(4):
+            stream.write(encode_frame(constants.FrameType.DATA, 0, 1, b''))
+        yield self.assert_goaway(stream, 'empty_data')
+
+    @gen_test
+    def test_continuation(self):
+        stream = yield connect_h2(self.get_http_port())
+        block = bytes(HpackEncoder(4096).encode(
+            request_headers(b'GET', b'/hello')))
+        stream.write(encode_frame(constants.FrameType.HEADERS,
+                                  constants.FrameFlag.END_STREAM, 1,
+                                  block[:1]))
+        for i in range(3):
+            stream.write(encode_frame(constants.FrameType.CONTINUATION, 0, 1,
+                                      b''))
+        yield self.assert_goaway(stream, 'continuation')
+
+
+class StreamLimitsTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        class EchoHandler(RequestHandler):
+            def post(self):
+                self.write(self.request.body)
+
+        @stream_request_body
+        class LargeUploadHandler(RequestHandler):
+            def prepare(self):
+                self.request.connection.set_max_body_size(10000)
+                self.size = 0
+
+            def data_received(self, chunk):
+                self.size += len(chunk)
+
+            def post(self):
+                self.write(str(self.size))
+
+        class SlowHandler(RequestHandler):
+            @gen.coroutine
+            def get(self):
+                yield gen.sleep(1)
+
+        return Application([
+            ('/echo', EchoHandler),
+            ('/large_upload', LargeUploadHandler),
+            ('/slow', SlowHandler),
+        ])
+
+    def get_httpserver_options(self):
+        return dict(idle_connection_timeout=0.1, body_timeout=0.1,
+                    max_body_size=100, stream_timeout=0.5)
+
+    def headers(self, flags, path=b'/echo', method=b'POST', *extra):
+        return encode_frame(constants.FrameType.HEADERS, flags, 1,
+                            HpackEncoder(4096).encode(
+                                request_headers(method, path, *extra)))
+
+    @gen.coroutine
+    def assert_reset(self, stream, max_time):
+        start = self.io_loop.time()
+        while True:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.RST_STREAM:
+                break
+        self.assertEqual(frame.stream_id, 1)
+        self.assertEqual(struct.unpack('>I', frame.data)[0],
+                         constants.ErrorCode.CANCEL.code)
+        self.assertLess(self.io_loop.time() - start, max_time)
+        stream.close()
+
+    @gen_test
+    def test_body_timeout(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(constants.FrameFlag.END_HEADERS))
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1, b'abc'))
+        yield self.assert_reset(stream, 0.4)
+
+    @gen_test
+    def test_header_timeout(self):
+        stream = yield connect_h2(self.get_http_port())
+        # No CONTINUATION follows.
+        stream.write(self.headers(0))
+        yield self.assert_reset(stream, 0.4)
+
+    @gen_test
+    def test_stream_timeout(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(constants.FrameFlag.END_HEADERS |
+                                  constants.FrameFlag.END_STREAM,
+                                  b'/slow', b'GET'))
+        yield self.assert_reset(stream, 0.8)
+
+    @gen_test
+    def test_content_length_too_large(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(
+            constants.FrameFlag.END_HEADERS, b'/echo', b'POST',
+            (b'content-length', b'1000', constants.HeaderIndexMode.NO)))
+        yield self.assert_reset(stream, 0.1)
+
+    @gen_test
+    def test_body_too_large(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(constants.FrameFlag.END_HEADERS))
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1,
+                                  b'a' * 200))
+        yield self.assert_reset(stream, 0.1)
+
+    @gen_test
+    def test_frames_after_reset(self):
+        stream = yield connect_h2(self.get_http_port())
+        encoder = HpackEncoder(4096)
+        stream.write(encode_frame(constants.FrameType.HEADERS,
+                                  constants.FrameFlag.END_HEADERS, 1,
+                                  encoder.encode(request_headers(b'POST',
+                                                                 b'/echo'))))
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1,
+                                  b'a' * 200))
+        while True:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.RST_STREAM:
+                break
+        # Frames sent before the client saw the RST_STREAM are ignored.
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1, b'b' * 10))
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS,
+            constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM,
+            1, encoder.encode([(b'x-trailer', b'1',
+                                constants.HeaderIndexMode.YES)])))
+        # The connection (and its HPACK state) is still usable.
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS,
+            constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM,
+            3, encoder.encode(request_headers(b'POST', b'/echo'))))
+        while True:
+            frame = yield read_frame(stream)
+            self.assertNotIn(frame.type, (constants.FrameType.GOAWAY,
+                                          constants.FrameType.RST_STREAM))
+            if (frame.stream_id == 3 and
+                    frame.flags & constants.FrameFlag.END_STREAM):
+                break
+        stream.close()
+
+    @gen_test
+    def test_set_max_body_size(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(self.headers(constants.FrameFlag.END_HEADERS,
+                                  b'/large_upload'))
+        stream.write(encode_frame(constants.FrameType.DATA,
+                                  constants.FrameFlag.END_STREAM, 1,
+                                  b'a' * 1000))
+        frames = yield read_stream_frames(stream, 1)
+        self.assertEqual(frames[-1].data, b'1000')
+        stream.close()
+
+    def test_small_body(self):
+        resp = self.fetch('/echo', method='POST', body='hello')
+        self.assertEqual(resp.body, b'hello')
+
+
+class CancellationTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        test = self
+        self.write_failed = Future()
+        self.handler_closed = Future()
+
+        class BigHandler(RequestHandler):
+            @gen.coroutine
+            def get(self):
+                self.write(b'a' * 100000)
+                try:
+                    yield self.flush()
+                except StreamClosedError:
+                    test.write_failed.set_result(None)
+
+            def on_connection_close(self):
+                test.handler_closed.set_result(None)
+
+        return Application([
+            ('/big', BigHandler),
+            ('/hello', HelloHandler),
+        ])
+
+    @gen_test
+    def test_rst_stream(self):
+        stream = yield connect_h2(self.get_http_port())
+        encoder = HpackEncoder(4096)
+        flags = constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM
+        stream.write(encode_frame(constants.FrameType.HEADERS, flags, 1,
+                                  encoder.encode(request_headers(b'GET',
+                                                                 b'/big'))))
+        window = constants.Setting.INITIAL_WINDOW_SIZE.default
+        received = 0
+        while received < window:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.DATA:
+                received += len(frame.data)
+        # The rest of the response now waits for the connection's
+        # window, and gives up when the stream is reset.
+        stream.write(encode_frame(constants.FrameType.WINDOW_UPDATE, 0, 1,
+                                  struct.pack('>I', window)))
+        stream.write(encode_frame(constants.FrameType.RST_STREAM, 0, 1,
+                                  struct.pack(
+                                      '>I', constants.ErrorCode.CANCEL.code)))
+        yield self.write_failed
+        yield self.handler_closed
+
+        # The connection's credit goes to other streams.
+        stream.write(encode_frame(constants.FrameType.WINDOW_UPDATE, 0, 0,
+                                  struct.pack('>I', window)))
+        stream.write(encode_frame(constants.FrameType.HEADERS, flags, 3,
+                                  encoder.encode(request_headers(b'GET',
+                                                                 b'/hello'))))
+        body = b''
+        while True:
+            frame = yield read_frame(stream)
+            self.assertNotEqual(frame.stream_id, 1)
+            if frame.stream_id == 3 and frame.type == constants.FrameType.DATA:
+                body += frame.data
+                if frame.flags & constants.FrameFlag.END_STREAM:
+                    break
+        self.assertEqual(body, b'Hello HTTP/2.0')
+        stream.close()
+
 
 class HTTPSTest(AsyncHTTP2TestCase):
     def get_app(self):
@@ -0,0 +1,48 @@
+from tornado import gen
+from tornado.testing import AsyncTestCase, gen_test
+
+from tornado_http2.timers import TimerWheel
+
+
+class TimerWheelTest(AsyncTestCase):
+    def setUp(self):
+        super(TimerWheelTest, self).setUp()
+        self.wheel = TimerWheel(resolution=0.01, slots=8)
+        self.fired = []
+
+    def call_later(self, delay, name):
+        return self.wheel.call_later(delay, lambda: self.fired.append(name))
+
+    @gen_test
+    def test_order(self):
+        start = self.io_loop.time()
+        self.call_later(0.05, 'b')
+        self.call_later(0.02, 'a')
+        self.call_later(0, 'now')
+        yield gen.sleep(0.1)
+        self.assertEqual(self.fired, ['now', 'a', 'b'])
+        self.assertLess(self.io_loop.time() - start, 0.2)
+
+    @gen_test
+    def test_remove(self):
+        timer = self.call_later(0.02, 'removed')
+        self.call_later(0.03, 'kept')
+        self.wheel.remove(timer)
+        self.wheel.remove(timer)
+        yield gen.sleep(0.06)
+        self.assertEqual(self.fired, ['kept'])
+        # Nothing is scheduled once the wheel is empty.
+        self.assertIsNone(self.wheel._timeout)
+
+    @gen_test
+    def test_multiple_rotations(self):
+        # The wheel covers 0.08 seconds.
+        self.call_later(0.15, 'late')
+        self.call_later(0.05, 'early')
+        yield gen.sleep(0.1)
+        self.assertEqual(self.fired, ['early'])
+        yield gen.sleep(0.1)
+        self.assertEqual(self.fired, ['early', 'late'])
+
+    def test_current(self):
+        self.assertIs(TimerWheel.current(), TimerWheel.current())
@@ -0,0 +1,128 @@
+import io
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from tornado.testing import gen_test
+from tornado.web import Application, RequestHandler
+
+from tornado_http2 import constants
+from tornado_http2.connection import Connection
+from tornado_http2.test.server_test import connect_h2, encode_frame, read_frame
+from tornado_http2.test.util import AsyncHTTP2TestCase
+from tornado_http2.trace import (FrameTrace, RECEIVED, SENT, client_frames,
+                                 load, parse_frame, replay)
+
+
+class FrameTraceTest(unittest.TestCase):
+    def frame(self, stream_id, data):
+        encoded = encode_frame(constants.FrameType.DATA, 0, stream_id, data)
+        return encoded[:9], encoded[9:]
+
+    def test_ring_buffer(self):
+        trace = FrameTrace(3)
+        for i in range(5):
+            trace.record(RECEIVED, *self.frame(1, b'%d' % i))
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(trace.dropped, 2)
+        self.assertEqual([parse_frame(r.data).data for r in trace.records()],
+                         [b'2', b'3', b'4'])
+
+    def test_dump_load(self):
+        trace = FrameTrace(10, is_client=True)
+        trace.record(SENT, *self.frame(1, b'request'))
+        trace.record(RECEIVED, *self.frame(1, b''))
+        trace.record(RECEIVED, *self.frame(3, b'x' * 1000))
+        f = io.BytesIO()
+        trace.dump(f)
+        f.seek(0)
+        is_client, records = load(f)
+        self.assertTrue(is_client)
+        self.assertEqual(records, trace.records())
+        self.assertEqual([parse_frame(r.data) for r in records], [
+            (constants.FrameType.DATA, 0, 1, b'request'),
+            (constants.FrameType.DATA, 0, 1, b''),
+            (constants.FrameType.DATA, 0, 3, b'x' * 1000),
+        ])
+        self.assertEqual(client_frames(is_client, records), records[:1])
+
+    def test_load_invalid(self):
+        with self.assertRaises(ValueError):
+            load(io.BytesIO(b'not a trace'))
+        trace = FrameTrace(10)
+        trace.record(RECEIVED, *self.frame(1, b'data'))
+        f = io.BytesIO()
+        trace.dump(f)
+        with self.assertRaises(ValueError):
+            load(io.BytesIO(f.getvalue()[:-1]))
+
+
+class TraceServerTest(AsyncHTTP2TestCase):
+    def setUp(self):
+        self.trace_dir = tempfile.mkdtemp()
+        self.requests = []
+        super(TraceServerTest, self).setUp()
+
+    def tearDown(self):
+        super(TraceServerTest, self).tearDown()
+        shutil.rmtree(self.trace_dir)
+
+    def get_app(self):
+        test = self
+
+        class RecordHandler(RequestHandler):
+            def post(self):
+                test.requests.append(self.request.body)
+                self.write(self.request.body)
+
+        return Application([('/record', RecordHandler)])
+
+    def get_httpserver_options(self):
+        return dict(trace_frames=100, trace_dir=self.trace_dir)
+
+    def server_connection(self):
+        conns = [c for c in self.http_server._connections
+                 if isinstance(c, Connection)]
+        self.assertEqual(len(conns), 1)
+        return conns[0]
+
+    @gen_test
+    def test_replay(self):
+        for body in [b'first', b'second']:
+            response = yield self.http_client.fetch(
+                self.get_url('/record'), method='POST', body=body)
+            self.assertEqual(response.body, body)
+        trace = self.server_connection().trace
+        self.assertEqual(trace.dropped, 0)
+        path = os.path.join(self.trace_dir, 'replay.bin')
+        self.assertEqual(self.server_connection().dump_trace(path), path)
+        with open(path, 'rb') as f:
+            records = client_frames(*load(f))
+        self.assertEqual(records[0].direction, RECEIVED)
+        elapsed = yield replay(records, '127.0.0.1', self.get_http_port())
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertEqual(self.requests,
+                         [b'first', b'second', b'first', b'second'])
+
+    @gen_test
+    def test_dump_on_error(self):
+        stream = yield connect_h2(self.get_http_port())
+        # DATA frames are not allowed on stream 0.
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 0, b'bad'))
+        while True:
+            frame = yield read_frame(stream)
+            if frame.type == constants.FrameType.GOAWAY:
+                break
+        stream.close()
+        code, = struct.unpack('>i', frame.data[4:8])
+        self.assertEqual(code, constants.ErrorCode.PROTOCOL_ERROR.code)
+        names = os.listdir(self.trace_dir)
+        self.assertEqual(len(names), 1)
+        with open(os.path.join(self.trace_dir, names[0]), 'rb') as f:
+            is_client, records = load(f)
+        self.assertFalse(is_client)
+        self.assertEqual(records[-1].direction, RECEIVED)
+        self.assertEqual(parse_frame(records[-1].data),
+                         (constants.FrameType.DATA, 0, 0, b'bad'))
@@ -0,0 +1,265 @@
+import gc
+import gzip
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+
+from tornado import gen
+from tornado.log import access_log, app_log
+from tornado.web import Application, RequestHandler
+
+from tornado_http2.client import ForceHTTP2Client
+from tornado_http2.test.util import AsyncHTTP2TestCase
+from tornado_http2.web import (SpooledBodyHandler, StaticFileHandler,
+                               log_request, request_timings)
+
+# Larger than both the initial flow control window and MAX_FRAME_SIZE.
+_CONTENT = b''.join(b'%07d\n' % i for i in range(40000))
+
+
+class StaticFileTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.file_ranges = []
+        file_ranges = self.file_ranges
+        static_path = self.static_path
+
+        class RecordingHandler(StaticFileHandler):
+            def on_finish(self):
+                file_ranges.append(getattr(self, '_file_range', None))
+
+        class WriteFileHandler(RequestHandler):
+            def get(self):
+                self.set_header('Content-Length', 10000)
+                self.flush()
+                f = open(os.path.join(static_path, 'data.txt'), 'rb')
+                future = self.request.connection.write_file(f, 100, 10000)
+                future.add_done_callback(lambda future: f.close())
+                return future
+
+        return Application([
+            ('/static/(.*)', RecordingHandler, dict(path=self.static_path)),
+            ('/write_file', WriteFileHandler),
+        ])
+
+    def setUp(self):
+        self.static_path = tempfile.mkdtemp()
+        with open(os.path.join(self.static_path, 'data.txt'), 'wb') as f:
+            f.write(_CONTENT)
+        open(os.path.join(self.static_path, 'empty.txt'), 'wb').close()
+        super(StaticFileTest, self).setUp()
+
+    def tearDown(self):
+        super(StaticFileTest, self).tearDown()
+        shutil.rmtree(self.static_path)
+
+    def test_file(self):
+        resp = self.fetch('/static/data.txt')
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.body, _CONTENT)
+        self.assertEqual(self.file_ranges[0][1:], (None, None))
+
+    def test_range(self):
+        resp = self.fetch('/static/data.txt',
+                          headers={'Range': 'bytes=70000-99999'})
+        self.assertEqual(resp.code, 206)
+        self.assertEqual(resp.body, _CONTENT[70000:100000])
+        resp = self.fetch('/static/data.txt', headers={'Range': 'bytes=-5'})
+        self.assertEqual(resp.body, _CONTENT[-5:])
+        self.assertEqual(self.file_ranges[1][1:], (len(_CONTENT) - 5, None))
+
+    def test_head(self):
+        resp = self.fetch('/static/data.txt', method='HEAD')
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.headers['Content-Length'], str(len(_CONTENT)))
+        self.assertEqual(resp.body, b'')
+
+    def test_empty(self):
+        resp = self.fetch('/static/empty.txt')
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.body, b'')
+
+    def test_not_modified(self):
+        resp = self.fetch('/static/data.txt')
+        resp = self.fetch('/static/data.txt',
+                          headers={'If-None-Match': resp.headers['Etag']})
+        self.assertEqual(resp.code, 304)
+
+    def test_write_file(self):
+        resp = self.fetch('/write_file')
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.body, _CONTENT[100:10100])
+
+
+class CompressResponseTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.file_ranges = []
+        file_ranges = self.file_ranges
+
+        class RecordingHandler(StaticFileHandler):
+            def on_finish(self):
+                file_ranges.append(self._file_range)
+
+        return Application([
+            ('/static/(.*)', RecordingHandler, dict(path=self.static_path)),
+        ], compress_response=True)
+
+    def setUp(self):
+        self.static_path = tempfile.mkdtemp()
+        for name in ['data.txt', 'data.bin']:
+            with open(os.path.join(self.static_path, name), 'wb') as f:
+                f.write(_CONTENT)
+        super(CompressResponseTest, self).setUp()
+
+    def tearDown(self):
+        super(CompressResponseTest, self).tearDown()
+        shutil.rmtree(self.static_path)
+
+    def test_gzipped(self):
+        resp = self.fetch('/static/data.txt', decompress_response=False,
+                          headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(resp.body)).read(),
+                         _CONTENT)
+        resp = self.fetch('/static/data.txt')
+        self.assertEqual(resp.body, _CONTENT)
+        self.assertEqual(self.file_ranges, [None, None])
+
+    def test_not_gzipped(self):
+        # The transform leaves these alone, so write_file can be used.
+        resp = self.fetch('/static/data.txt', decompress_response=False)
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertEqual(resp.body, _CONTENT)
+        resp = self.fetch('/static/data.bin', decompress_response=False,
+                          headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', resp.headers)
+        self.assertEqual(resp.body, _CONTENT)
+        self.assertEqual([r[1:] for r in self.file_ranges],
+                         [(None, None), (None, None)])
+
+
+class SpooledBodyTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.spooled = []
+        spooled = self.spooled
+
+        class UploadHandler(SpooledBodyHandler):
+            spool_threshold = 100000
+            max_body_size = 1000000
+
+            def post(self):
+                spooled.append(not isinstance(self.body_file, io.BytesIO))
+                self.write(hashlib.sha1(self.body_file.read()).hexdigest())
+
+        return Application([('/upload', UploadHandler)])
+
+    def producer(self, body):
+        @gen.coroutine
+        def body_producer(write):
+            for i in range(0, len(body), 16384):
+                yield write(body[i:i + 16384])
+        return body_producer
+
+    def check(self, resp, body):
+        self.assertEqual(resp.code, 200)
+        self.assertEqual(resp.body, hashlib.sha1(body).hexdigest().encode())
+
+    def test_small(self):
+        self.check(self.fetch('/upload', method='POST', body=_CONTENT[:5000]),
+                   _CONTENT[:5000])
+        self.check(self.fetch('/upload', method='POST',
+                              body_producer=self.producer(_CONTENT[:5000])),
+                   _CONTENT[:5000])
+        self.assertEqual(self.spooled, [False, False])
+
+    def test_spooled(self):
+        # Declared large by its Content-Length.
+        self.check(self.fetch('/upload', method='POST', body=_CONTENT),
+                   _CONTENT)
+        # Only found to be large while receiving it.
+        self.check(self.fetch('/upload', method='POST',
+                              body_producer=self.producer(_CONTENT)),
+                   _CONTENT)
+        self.assertEqual(self.spooled, [True, True])
+
+    def test_too_large(self):
+        body = _CONTENT * 4
+        resp = self.fetch('/upload', method='POST', body=body)
+        self.assertEqual(resp.code, 413)
+        errors = _ListHandler()
+        errors.setLevel(logging.ERROR)
+        app_log.addHandler(errors)
+        client = ForceHTTP2Client(io_loop=self.io_loop, force_instance=True)
+        try:
+            client.fetch(self.get_url('/upload'), self.stop, method='POST',
+                         body_producer=self.producer(body))
+            self.assertEqual(self.wait().code, 599)
+            # Unretrieved Future exceptions are logged when they are
+            # collected, after the connection is closed.
+            client.close()
+            self.io_loop.add_timeout(self.io_loop.time() + 0.1, self.stop)
+            self.wait()
+            gc.collect()
+        finally:
+            app_log.removeHandler(errors)
+        self.assertEqual(errors.messages, [])
+        self.assertEqual(self.spooled, [])
+        # The connection is still usable.
+        self.check(self.fetch('/upload', method='POST', body=b'ok'), b'ok')
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TimingsTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.timings = []
+        timings = self.timings
+
+        class SlowHandler(RequestHandler):
+            @gen.coroutine
+            def post(self):
+                yield gen.sleep(0.05)
+                self.write(b'a' * 100000)
+
+            def on_finish(self):
+                timings.append(request_timings(self.request))
+
+        return Application([('/slow', SlowHandler)],
+                           log_function=log_request)
+
+    def test_timings(self):
+        handler = _ListHandler()
+        access_log.addHandler(handler)
+        level = access_log.level
+        access_log.setLevel(logging.INFO)
+        try:
+            resp = self.fetch('/slow', method='POST', body=b'body')
+        finally:
+            access_log.setLevel(level)
+            access_log.removeHandler(handler)
+        self.assertEqual(len(resp.body), 100000)
+        timings = self.timings[0]
+        events = [timings.created, timings.headers_received,
+                  timings.headers_decoded, timings.body_received,
+                  timings.headers_sent, timings.first_data_sent,
+                  timings.last_data_sent]
+        self.assertNotIn(None, events)
+        self.assertEqual(events, sorted(events))
+        durations = dict(timings.durations())
+        self.assertGreaterEqual(durations['respond'], 0.05)
+        self.assertEqual(sorted(durations), [
+            'body', 'decode', 'flow_control_wait', 'output_buffer_wait',
+            'respond', 'send'])
+        self.assertEqual(len(handler.messages), 1)
+        self.assertIn('POST /slow', handler.messages[0])
+        self.assertIn(' respond=', handler.messages[0])
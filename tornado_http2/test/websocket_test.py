@@ -0,0 +1,133 @@
+import os
+import struct
+
+from tornado import gen
+from tornado.concurrent import Future
+from tornado.testing import gen_test
+from tornado.web import Application
+from tornado.websocket import WebSocketHandler
+
+from tornado_http2 import constants
+from tornado_http2.hpack import HpackDecoder, HpackEncoder
+from tornado_http2.test.server_test import (connect_h2, encode_frame,
+                                            read_frame, request_headers)
+from tornado_http2.test.util import AsyncHTTP2TestCase
+
+
+class EchoHandler(WebSocketHandler):
+    def initialize(self, close_future):
+        self.close_future = close_future
+
+    def on_message(self, message):
+        self.write_message(message)
+
+    def on_close(self):
+        self.close_future.set_result(None)
+
+
+def websocket_frame(opcode, payload):
+    """Returns a masked, final client frame (``payload`` < 126 bytes)."""
+    mask = bytearray(os.urandom(4))
+    masked = bytearray(payload)
+    for i in range(len(masked)):
+        masked[i] ^= mask[i % 4]
+    return struct.pack('BB', 0x80 | opcode, 0x80 | len(payload)) + \
+        bytes(mask) + bytes(masked)
+
+
+class WebSocketTest(AsyncHTTP2TestCase):
+    def get_app(self):
+        self.close_future = Future()
+        return Application([
+            ('/ws', EchoHandler, dict(close_future=self.close_future)),
+        ])
+
+    def get_httpserver_options(self):
+        return dict(enable_connect_protocol=True)
+
+    @gen.coroutine
+    def connect(self, *extra):
+        stream = yield connect_h2(self.get_http_port())
+        self.decoder = HpackDecoder(4096)
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS, constants.FrameFlag.END_HEADERS, 1,
+            HpackEncoder(4096).encode(request_headers(
+                b'CONNECT', b'/ws', *extra))))
+        raise gen.Return(stream)
+
+    @gen.coroutine
+    def read_frame(self, stream):
+        """Reads the next frame on stream 1, skipping WINDOW_UPDATEs."""
+        while True:
+            frame = yield read_frame(stream)
+            if (frame.type == constants.FrameType.SETTINGS and
+                    not frame.flags & constants.FrameFlag.ACK):
+                self.settings = frame.data
+            if (frame.stream_id == 1 and
+                    frame.type != constants.FrameType.WINDOW_UPDATE):
+                raise gen.Return(frame)
+
+    def websocket_headers(self):
+        mode = constants.HeaderIndexMode.NO
+        return [(b':protocol', b'websocket', mode),
+                (b'sec-websocket-version', b'13', mode)]
+
+    @gen_test
+    def test_echo(self):
+        stream = yield self.connect(*self.websocket_headers())
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.HEADERS)
+        self.assertFalse(frame.flags & constants.FrameFlag.END_STREAM)
+        headers = dict((k, v) for k, v, mode in
+                       self.decoder.decode(bytearray(frame.data)))
+        self.assertEqual(headers[b':status'], b'200')
+        self.assertNotIn(b'sec-websocket-accept', headers)
+        self.assertIn(struct.pack('>HI', 0x8, 1), self.settings)
+
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1,
+                                  websocket_frame(0x1, b'hello')))
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.DATA)
+        self.assertEqual(frame.data, b'\x81\x05hello')
+
+        stream.write(encode_frame(constants.FrameType.DATA, 0, 1,
+                                  websocket_frame(0x8, b'\x03\xe8')))
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.DATA)
+        self.assertEqual(bytearray(frame.data)[0], 0x88)
+        yield self.close_future
+        stream.write(encode_frame(constants.FrameType.DATA,
+                                  constants.FrameFlag.END_STREAM, 1, b''))
+        frame = yield self.read_frame(stream)
+        self.assertTrue(frame.flags & constants.FrameFlag.END_STREAM)
+        stream.close()
+
+    @gen_test
+    def test_requires_connect(self):
+        stream = yield connect_h2(self.get_http_port())
+        stream.write(encode_frame(
+            constants.FrameType.HEADERS,
+            constants.FrameFlag.END_HEADERS | constants.FrameFlag.END_STREAM,
+            1, HpackEncoder(4096).encode(request_headers(
+                b'GET', b'/ws', *self.websocket_headers()))))
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.RST_STREAM)
+        self.assertEqual(struct.unpack('>I', frame.data)[0],
+                         constants.ErrorCode.PROTOCOL_ERROR.code)
+        stream.close()
+
+
+class DisabledTest(WebSocketTest):
+    def get_httpserver_options(self):
+        return {}
+
+    @gen_test
+    def test_echo(self):
+        # Without the setting, :protocol is an unknown pseudo-header.
+        stream = yield self.connect(*self.websocket_headers())
+        frame = yield self.read_frame(stream)
+        self.assertEqual(frame.type, constants.FrameType.RST_STREAM)
+        self.assertEqual(struct.unpack('>I', frame.data)[0],
+                         constants.ErrorCode.PROTOCOL_ERROR.code)
+        self.assertNotIn(struct.pack('>HI', 0x8, 1), self.settings)
+        stream.close()
@@ -0,0 +1,91 @@
+import math
+import weakref
+
+from tornado.ioloop import IOLoop
+
+
+class _Timer(object):
+    __slots__ = ('tick', 'callback', 'slot')
+
+    def __init__(self, tick, callback, slot):
+        self.tick = tick
+        self.callback = callback
+        self.slot = slot
+
+
+class TimerWheel(object):
+    """A hashed timer wheel for many timeouts that are usually cancelled.
+
+    Adding and removing a timer are O(1) set operations, and the wheel
+    needs only one `.IOLoop` timeout, which is scheduled only while
+    timers are pending. Timers fire up to ``resolution`` seconds late.
+
+    Use `current` to share one wheel among everything on an `.IOLoop`.
+    """
+    _instances = weakref.WeakKeyDictionary()
+
+    def __init__(self, resolution=0.1, slots=1024):
+        self.io_loop = IOLoop.current()
+        self.resolution = resolution
+        self._slots = [set() for i in range(slots)]
+        self._count = 0
+        # The next tick to process, and the IOLoop timeout for it.
+        self._tick = None
+        self._timeout = None
+
+    @classmethod
+    def current(cls):
+        """Returns the wheel for the current `.IOLoop`, creating it if needed."""
+        io_loop = IOLoop.current()
+        wheel = cls._instances.get(io_loop)
+        if wheel is None:
+            wheel = cls._instances[io_loop] = cls()
+        return wheel
+
+    def call_later(self, delay, callback):
+        """Runs ``callback`` after ``delay`` seconds.
+
+        Returns a handle that may be passed to `remove`.
+        """
+        now = self.io_loop.time()
+        if self._tick is None:
+            self._tick = int(now / self.resolution)
+        # Timers due before the next tick to be processed go in its slot.
+        tick = max(int(math.ceil((now + delay) / self.resolution)),
+                   self._tick)
+        slot = self._slots[tick % len(self._slots)]
+        timer = _Timer(tick, callback, slot)
+        slot.add(timer)
+        self._count += 1
+        if self._timeout is None:
+            self._schedule()
+        return timer
+
+    def remove(self, timer):
+        """Cancels a timer returned by `call_later`, if it hasn't run."""
+        if timer.slot is not None:
+            timer.slot.discard(timer)
+            timer.slot = None
+            self._count -= 1
+
+    def _schedule(self):
+        self._timeout = self.io_loop.call_at(self._tick * self.resolution,
+                                             self._run)
+
+    def _run(self):
+        self._timeout = None
+        now = self.io_loop.time()
+        while self._tick * self.resolution <= now:
+            slot = self._slots[self._tick % len(self._slots)]
+            # Other timers in the slot are due in later rotations.
+            expired = [t for t in slot if t.tick <= self._tick]
+            for timer in expired:
+                slot.discard(timer)
+                timer.slot = None
+                self._count -= 1
+                self.io_loop.add_callback(timer.callback)
+            self._tick += 1
+        if self._count:
+            self._schedule()
+        else:
+            self._tick = None
@@ -0,0 +1,236 @@
+"""Recording and replaying the frames of an HTTP/2 connection.
+
+A `FrameTrace` keeps the most recent frames sent and received on a
+`.Connection` (see the ``trace_frames`` parameter) as raw bytes. It can
+be written to a file with `FrameTrace.dump` and read back with `load`.
+
+The trace file format is a header (``MAGIC``, then one byte of flags)
+followed by one record per frame: the time it was sent or received (a
+big-endian double), a direction byte (`RECEIVED` or `SENT`), and the
+frame exactly as it appeared on the wire.
+
+This module can also be run as a script to print a trace, or to replay
+the client side of one against a server::
+
+    python -m tornado_http2.trace show trace.h2
+    python -m tornado_http2.trace replay trace.h2 localhost:8443 --ssl
+"""
+import argparse
+import collections
+import struct
+import sys
+import time
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado.tcpclient import TCPClient
+
+from . import constants
+from .frames import Frame
+
+MAGIC = b'H2TRACE1'
+
+RECEIVED = 0
+SENT = 1
+
+# Header flag: the trace was recorded by a client.
+_FLAG_CLIENT = 1
+
+_RECORD = struct.Struct('>dB')
+_FRAME_HEADER = struct.Struct('>iBBi')
+
+TraceRecord = collections.namedtuple(
+    'TraceRecord', ['time', 'direction', 'data'])
+
+
+class FrameTrace(object):
+    """A ring buffer of the last ``max_frames`` frames of a connection.
+
+    Recording a frame only appends its (already encoded) header and
+    payload to a `collections.deque`, so tracing can be left on in
+    production. Note that payloads are kept, so memory use grows with
+    ``max_frames`` times the frame size.
+
+    Replaying a trace needs the connection's first frames (to rebuild
+    its HPACK state), which are gone once ``dropped`` is nonzero.
+    """
+    def __init__(self, max_frames, is_client=False):
+        self.is_client = is_client
+        self.max_frames = max_frames
+        # The number of frames that fell off the start of the buffer.
+        self.dropped = 0
+        self._frames = collections.deque(maxlen=max_frames)
+
+    def record(self, direction, header, payload):
+        """Records a frame, given its 9-byte header and its payload."""
+        if len(self._frames) == self.max_frames:
+            self.dropped += 1
+        self._frames.append((time.time(), direction, header, payload))
+
+    def __len__(self):
+        return len(self._frames)
+
+    def records(self):
+        """Returns the recorded frames as a list of `TraceRecord`."""
+        return [TraceRecord(t, direction, bytes(header) + bytes(payload))
+                for t, direction, header, payload in self._frames]
+
+    def dump(self, file):
+        """Writes the trace to ``file`` (open in binary mode)."""
+        flags = _FLAG_CLIENT if self.is_client else 0
+        file.write(MAGIC + struct.pack('>B', flags))
+        for t, direction, header, payload in list(self._frames):
+            file.write(_RECORD.pack(t, direction))
+            file.write(header)
+            file.write(payload)
+
+
+def load(file):
+    """Reads a trace written by `FrameTrace.dump`.
+
+    Returns ``(is_client, records)``, where ``records`` is a list of
+    `TraceRecord`.
+    """
+    header = file.read(len(MAGIC) + 1)
+    if header[:len(MAGIC)] != MAGIC:
+        raise ValueError("not an HTTP/2 frame trace")
+    flags, = struct.unpack('>B', header[len(MAGIC):])
+    records = []
+    while True:
+        record = file.read(_RECORD.size)
+        if not record:
+            break
+        frame_header = file.read(9)
+        if len(record) < _RECORD.size or len(frame_header) < 9:
+            raise ValueError("truncated trace")
+        t, direction = _RECORD.unpack(record)
+        length = _FRAME_HEADER.unpack(b'\0' + frame_header)[0]
+        payload = file.read(length)
+        if len(payload) < length:
+            raise ValueError("truncated trace")
+        records.append(TraceRecord(t, direction, frame_header + payload))
+    return bool(flags & _FLAG_CLIENT), records
+
+
+def parse_frame(data):
+    """Returns the `.Frame` encoded in ``data``."""
+    length, typ, flags, stream_id = _FRAME_HEADER.unpack(b'\0' + data[:9])
+    try:
+        typ = constants.FrameType(typ)
+    except ValueError:
+        pass
+    return Frame(typ, flags, stream_id & 0x7fffffff, data[9:9 + length])
+
+
+def client_frames(is_client, records):
+    """Returns the records of frames sent by the client."""
+    direction = SENT if is_client else RECEIVED
+    return [r for r in records if r.direction == direction]
+
+
+@gen.coroutine
+def replay(records, host, port, ssl_options=None, realtime=False):
+    """Sends the frames in ``records`` (see `client_frames`) to a server.
+
+    The client preface is sent first. Frames are sent in order, as
+    fast as possible or, if ``realtime`` is true, with the delays
+    between them that were recorded. Everything the server sends is
+    read and discarded.
+
+    Once all frames are sent, a PING is sent and its ACK awaited, so
+    the server has processed them all. Returns the elapsed time.
+    """
+    stream = yield TCPClient().connect(host, port, ssl_options=ssl_options)
+    stream.set_nodelay(True)
+    ping_data = b'h2replay'
+    acked = _read_until_ping_ack(stream, ping_data)
+    start = IOLoop.current().time()
+    try:
+        stream.write(constants.CLIENT_PREFACE)
+        for i, record in enumerate(records):
+            if realtime and i > 0:
+                delay = record.time - records[i - 1].time
+                if delay > 0:
+                    yield gen.sleep(delay)
+            yield stream.write(record.data)
+        yield stream.write(struct.pack('>iBBi', 8, constants.FrameType.PING.value,
+                                       0, 0)[1:] + ping_data)
+        yield acked
+        raise gen.Return(IOLoop.current().time() - start)
+    finally:
+        stream.close()
+
+
+@gen.coroutine
+def _read_until_ping_ack(stream, ping_data):
+    while True:
+        header = yield stream.read_bytes(9)
+        length, typ, flags, stream_id = _FRAME_HEADER.unpack(b'\0' + header)
+        data = yield stream.read_bytes(length)
+        if (typ == constants.FrameType.PING.value and
+                flags & constants.FrameFlag.ACK and data == ping_data):
+            return
+        if typ == constants.FrameType.GOAWAY.value:
+            raise StreamClosedError()
+
+
+def _show(args):
+    with open(args.trace, 'rb') as f:
+        is_client, records = load(f)
+    start = records[0].time if records else 0
+    for record in records:
+        if record.direction == RECEIVED:
+            direction = 'recv'
+        else:
+            direction = 'send'
+        print('%10.6f %s %r' % (record.time - start, direction,
+                                parse_frame(record.data)))
+
+
+def _replay(args):
+    with open(args.trace, 'rb') as f:
+        records = client_frames(*load(f))
+    host, _, port = args.address.rpartition(':')
+    ssl_options = None
+    if args.ssl:
+        import ssl
+        ssl_options = ssl.create_default_context()
+        ssl_options.check_hostname = False
+        ssl_options.verify_mode = ssl.CERT_NONE
+        ssl_options.set_alpn_protocols([constants.HTTP2_TLS])
+
+    @gen.coroutine
+    def run():
+        for i in range(args.repeat):
+            elapsed = yield replay(records, host or 'localhost', int(port),
+                                   ssl_options=ssl_options,
+                                   realtime=args.realtime)
+            print('replayed %d frames in %.6fs' % (len(records), elapsed))
+    IOLoop.current().run_sync(run)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tornado_http2.trace')
+    subparsers = parser.add_subparsers(dest='command')
+    show_parser = subparsers.add_parser(
+        'show', help='print the frames in a trace')
+    show_parser.add_argument('trace')
+    show_parser.set_defaults(func=_show)
+    replay_parser = subparsers.add_parser(
+        'replay', help="send a trace's client frames to a server")
+    replay_parser.add_argument('trace')
+    replay_parser.add_argument('address', help='host:port')
+    replay_parser.add_argument('--ssl', action='store_true')
+    replay_parser.add_argument('--realtime', action='store_true',
+                               help='keep the recorded delays between frames')
+    replay_parser.add_argument('--repeat', type=int, default=1)
+    replay_parser.set_defaults(func=_replay)
+    args = parser.parse_args(argv)
+    if getattr(args, 'func', None) is None:
+        parser.error('a command is required')
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
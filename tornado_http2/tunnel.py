@@ -0,0 +1,141 @@
+import struct
+
+from tornado.concurrent import Future
+from tornado.ioloop import IOLoop
+from tornado.iostream import StreamClosedError
+from tornado import stack_context
+
+from . import constants
+from .frames import Frame
+
+
+class TunnelStream(object):
+    """The byte stream of an extended CONNECT tunnel (RFC 8441).
+
+    Once a `.Stream` has accepted an extended CONNECT request,
+    ``detach()`` returns one of these. It implements the parts of the
+    `.IOStream` interface used by `tornado.websocket` (``read_bytes``,
+    ``write``, ``close`` and close callbacks), carried by the stream's
+    DATA frames. Received data is only acknowledged with WINDOW_UPDATE
+    frames as it is read, so a slow reader slows down the peer rather
+    than buffering without limit.
+
+    Closing it ends the HTTP/2 stream; the tunnel closes when the peer
+    ends or resets the stream, or the connection is lost.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self.io_loop = IOLoop.current()
+        self.error = None
+        self._buffer = bytearray()
+        self._eof = False
+        self._closed = False
+        self._close_callback = None
+        self._read_bytes = None
+        self._read_partial = False
+        self._read_future = None
+        self._read_callback = None
+
+    def read_bytes(self, num_bytes, callback=None, partial=False):
+        """Reads ``num_bytes`` bytes (or, with ``partial``, at least one
+        and at most ``num_bytes``), as `.IOStream.read_bytes`.
+        """
+        assert self._read_bytes is None, "Already reading"
+        if self._closed:
+            raise StreamClosedError()
+        future = None
+        if callback is None:
+            future = self._read_future = Future()
+        else:
+            self._read_callback = stack_context.wrap(callback)
+        self._read_bytes = num_bytes
+        self._read_partial = partial
+        self._try_read()
+        return future
+
+    def write(self, data, callback=None):
+        if self._closed:
+            raise StreamClosedError()
+        future = self._stream.write(data)
+        if callback is not None:
+            callback = stack_context.wrap(callback)
+            future.add_done_callback(lambda f: callback())
+        return future
+
+    def set_close_callback(self, callback):
+        self._close_callback = stack_context.wrap(callback)
+
+    def set_nodelay(self, value):
+        # The connection already uses TCP_NODELAY.
+        pass
+
+    def closed(self):
+        return self._closed
+
+    def close(self, exc_info=False):
+        """Closes the tunnel, ending the HTTP/2 stream."""
+        if self._closed:
+            return
+        self._stream._end_tunnel()
+        self._on_closed()
+
+    def _data_received(self, data):
+        if self._closed:
+            # Nobody will read it, but it still counts against the
+            # flow control windows.
+            self._stream._send_window_update(len(data))
+            return
+        self._buffer += data
+        self._try_read()
+
+    def _eof_received(self):
+        self._eof = True
+        self._try_read()
+
+    def _on_stream_closed(self):
+        """Called when the HTTP/2 stream is gone (reset, or the
+        connection lost).
+        """
+        self._on_closed()
+
+    def _try_read(self):
+        if self._read_bytes is None:
+            if self._eof and not self._buffer:
+                self.close()
+            return
+        if self._read_partial and self._buffer:
+            size = min(self._read_bytes, len(self._buffer))
+        elif len(self._buffer) >= self._read_bytes:
+            size = self._read_bytes
+        else:
+            if self._eof:
+                self.close()
+            return
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        if size:
+            self._stream._send_window_update(size)
+        future, callback = self._read_future, self._read_callback
+        self._read_bytes = self._read_future = self._read_callback = None
+        if future is not None:
+            future.set_result(data)
+        else:
+            self.io_loop.add_callback(callback, data)
+
+    def _on_closed(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._buffer and not self._stream.conn.stream.closed():
+            # Return the unread data's credit to the connection.
+            self._stream.conn._write_frame(Frame(
+                constants.FrameType.WINDOW_UPDATE, 0, 0,
+                struct.pack('>I', len(self._buffer))))
+            self._buffer = bytearray()
+        future = self._read_future
+        self._read_bytes = self._read_future = self._read_callback = None
+        if future is not None:
+            future.set_exception(StreamClosedError())
+        if self._close_callback is not None:
+            callback, self._close_callback = self._close_callback, None
+            self.io_loop.add_callback(callback)
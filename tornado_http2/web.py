@@ -0,0 +1,239 @@
+import functools
+import io
+import tempfile
+
+from tornado import gen
+from tornado.iostream import StreamClosedError
+from tornado.log import access_log
+from tornado import web
+
+
+def request_timings(request):
+    """Returns the `.StreamTimings` of an `.HTTPServerRequest`, or
+    None if it was not served over HTTP/2.
+    """
+    return getattr(request.connection, 'timings', None)
+
+
+def log_request(handler):
+    """Logs a request like `.Application.log_request`, followed by the
+    `.StreamTimings.durations` of HTTP/2 requests.
+
+    Use it with ``Application(log_function=log_request)``. An HTTP/2
+    request is logged as, for example::
+
+        200 GET / (::1) 12.30ms decode=0.05ms body=0.01ms respond=11.90ms
+            send=0.20ms flow_control_wait=0.00ms output_buffer_wait=0.00ms
+    """
+    if handler.get_status() < 400:
+        log_method = access_log.info
+    elif handler.get_status() < 500:
+        log_method = access_log.warning
+    else:
+        log_method = access_log.error
+    request_time = 1000.0 * handler.request.request_time()
+    timings = request_timings(handler.request)
+    if timings is None:
+        log_method("%d %s %.2fms", handler.get_status(),
+                   handler._request_summary(), request_time)
+        return
+    log_method("%d %s %.2fms %s", handler.get_status(),
+               handler._request_summary(), request_time,
+               ' '.join('%s=%.2fms' % (name, 1000.0 * seconds)
+                        for name, seconds in timings.durations()))
+
+
+class StaticFileHandler(web.StaticFileHandler):
+    """A `tornado.web.StaticFileHandler` that sends files over HTTP/2
+    with `.Stream.write_file`, without reading them into memory.
+
+    With a ``precompressed_cache`` (a
+    `tornado_http2.compression.PrecompressedCache`), compressible files
+    are sent gzipped to clients that accept it. Each version of a file
+    is compressed once, in the background, and served uncompressed
+    until its compressed copy is ready. Range requests are always
+    served uncompressed.
+
+    Requests over HTTP/1, subclasses that override ``get_content``, and
+    responses that an output transform (such as the one installed by
+    ``compress_response``) would rewrite are served as usual.
+    """
+    # The compressed copy of the file being sent, if any.
+    _gzip_content = None
+
+    def initialize(self, path, default_filename=None,
+                   precompressed_cache=None):
+        super(StaticFileHandler, self).initialize(path, default_filename)
+        self.precompressed_cache = precompressed_cache
+
+    @gen.coroutine
+    def get(self, path, include_body=True):
+        if (type(self).get_content.__func__ is not
+                web.StaticFileHandler.get_content.__func__):
+            yield super(StaticFileHandler, self).get(path, include_body)
+            return
+        # Let the base class handle validation, headers and ranges, but
+        # choose the content it sends: the compressed copy, or over
+        # HTTP/2 the range of the file to send with write_file. (The
+        # instance attribute hides the classmethod for this request.)
+        self._file_range = None
+        self.get_content = self._get_content
+        yield super(StaticFileHandler, self).get(path, include_body)
+        if self._file_range is None:
+            return
+        abspath, start, end = self._file_range
+        start = start or 0
+        if end is None:
+            end = self.get_content_size()
+        try:
+            yield self.flush()
+            with open(abspath, 'rb') as f:
+                yield self.request.connection.write_file(f, start,
+                                                         end - start)
+        except StreamClosedError:
+            return
+
+    def _get_content(self, abspath, start=None, end=None):
+        if self._gzip_content is not None:
+            return [self._gzip_content]
+        if (getattr(self.request.connection, 'write_file', None) is None or
+                self._body_transformed()):
+            return type(self).get_content(abspath, start, end)
+        self._file_range = (abspath, start, end)
+        return []
+
+    def _body_transformed(self):
+        # write_file sends the file as it is, so it can't be used when
+        # an output transform (such as compress_response's) would
+        # rewrite the body.
+        for transform in self._transforms or ():
+            if not isinstance(transform, web.GZipContentEncoding):
+                return True
+            if ('gzip' in self.request.headers.get('Accept-Encoding', '') and
+                    'Content-Encoding' not in self._headers and
+                    _compressible_type(self._headers.get('Content-Type'))):
+                return True
+        return False
+
+    def set_headers(self):
+        cache = self.precompressed_cache
+        if cache is not None and self._compressible():
+            self.add_header('Vary', 'Accept-Encoding')
+            if ('Range' not in self.request.headers and
+                    'gzip' in self.request.headers.get('Accept-Encoding',
+                                                       '')):
+                self._gzip_content = self._get_compressed(cache)
+                if self._gzip_content is not None:
+                    self.set_header('Content-Encoding', 'gzip')
+        super(StaticFileHandler, self).set_headers()
+
+    def _compressible(self):
+        return (_compressible_type(self.get_content_type()) and
+                super(StaticFileHandler, self).get_content_size() >=
+                web.GZipContentEncoding.MIN_LENGTH)
+
+    def _get_compressed(self, cache):
+        key = self._get_cached_version(self.absolute_path)
+        if not key:
+            return None
+        content = cache.get(key)
+        if content is None:
+            cache.add(key, functools.partial(_read_file, self.absolute_path))
+            # Done already if the cache has no executor.
+            content = cache.get(key)
+        return content
+
+    def compute_etag(self):
+        etag = super(StaticFileHandler, self).compute_etag()
+        if etag is not None and self._gzip_content is not None:
+            # Each representation needs its own strong validator.
+            etag = etag[:-1] + '-gzip"'
+        return etag
+
+    def get_content_size(self):
+        if self._gzip_content is not None:
+            return len(self._gzip_content)
+        return super(StaticFileHandler, self).get_content_size()
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _compressible_type(content_type):
+    if content_type is None:
+        return False
+    content_type = content_type.split(';')[0]
+    return (content_type.startswith('text/') or
+            content_type in web.GZipContentEncoding.CONTENT_TYPES)
+
+
+@web.stream_request_body
+class SpooledBodyHandler(web.RequestHandler):
+    """A `tornado.web.RequestHandler` that collects the request body
+    in ``self.body_file`` instead of ``self.request.body``.
+
+    Bodies up to ``spool_threshold`` bytes are kept in memory; larger
+    ones (or those declared larger by their Content-Length) are
+    written to a temporary file in ``spool_dir`` as they arrive, so
+    concurrent uploads don't hold their bodies in memory. Each chunk is
+    stored before it is acknowledged, so over HTTP/2 the client is
+    paced by the stream's flow control window.
+
+    ``max_body_size``, if set, overrides the server's limit for this
+    handler: a larger declared Content-Length is refused with a 413
+    response, and a body that turns out to be larger resets the
+    stream (or closes an HTTP/1 connection).
+
+    ``body_file`` is positioned at the start of the body when the
+    handler's method is called, and closed when the request finishes.
+    Subclasses that override ``prepare`` must call this one.
+    """
+    spool_threshold = 64 * 1024
+    max_body_size = None
+    spool_dir = None
+
+    body_file = None
+
+    def prepare(self):
+        if self.max_body_size is not None:
+            self.request.connection.set_max_body_size(self.max_body_size)
+        content_length = self.request.headers.get('Content-Length')
+        size = int(content_length) if content_length else 0
+        if self.max_body_size is not None and size > self.max_body_size:
+            raise web.HTTPError(413)
+        self.body_size = 0
+        if size > self.spool_threshold:
+            self.body_file = tempfile.TemporaryFile(dir=self.spool_dir)
+        else:
+            self.body_file = io.BytesIO()
+        # Runs before the handler's method, which waits for the body.
+        self.request.body.add_done_callback(self._rewind)
+
+    def data_received(self, chunk):
+        if self._finished or self.body_file is None:
+            return
+        self.body_size += len(chunk)
+        if (self.body_size > self.spool_threshold and
+                isinstance(self.body_file, io.BytesIO)):
+            memory_file = self.body_file
+            self.body_file = tempfile.TemporaryFile(dir=self.spool_dir)
+            self.body_file.write(memory_file.getvalue())
+        self.body_file.write(chunk)
+
+    def on_finish(self):
+        self._close_body_file()
+
+    def on_connection_close(self):
+        super(SpooledBodyHandler, self).on_connection_close()
+        self._close_body_file()
+
+    def _rewind(self, future):
+        if self.body_file is not None:
+            self.body_file.seek(0)
+
+    def _close_body_file(self):
+        if self.body_file is not None:
+            self.body_file.close()
+            self.body_file = None